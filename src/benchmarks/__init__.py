@@ -0,0 +1,32 @@
+"""
+Performance benchmarks for the turning point pipeline hot paths.
+
+Run `python run_benchmarks.py --help` (from `src`) for all options.
+"""
+
+from .cases import iterate_cases
+from .datasets import BenchmarkDataset
+from .report import (
+    Comparison,
+    compare_results,
+    format_report,
+    get_environment,
+    has_regression,
+    load_results,
+    save_results,
+)
+from .timing import Timing, time_fn
+
+__all__ = [
+    "BenchmarkDataset",
+    "Comparison",
+    "Timing",
+    "compare_results",
+    "format_report",
+    "get_environment",
+    "has_regression",
+    "iterate_cases",
+    "load_results",
+    "save_results",
+    "time_fn",
+]
@@ -0,0 +1,138 @@
+from dataclasses import replace
+from functools import partial
+from typing import Callable, Iterator
+
+import numpy.random as nprandom
+
+import turning_point.metric_stats as ms
+from synthetic_tournaments.optimal_schedule import algorithm as alg
+from tournament_simulations.data_structures import Matches, PointsPerMatch
+from turning_point.match_coefficient import MatchTurningPoint
+from turning_point.metric_stats.expanding_metric_stats import ENGINE_MAP
+from turning_point.metrics import METRIC_MAP, NormalizedHHI, Variances
+from turning_point.normal_coefficient import TurningPoint
+
+from .datasets import BenchmarkDataset
+
+WINNER_TO_POINTS = {"h": (3, 0), "d": (1, 1), "a": (0, 3)}
+
+# season lengths (multiples of the dataset's number of double round-robins)
+SCALING_FACTORS = (1, 2, 4)
+
+Case = tuple[str, Callable[[], object]]
+
+
+def _seeded(fn: Callable[[], object], seed: int) -> Callable[[], object]:
+    """
+    Every run simulates the same tournaments (same amount of work).
+    """
+
+    def _run() -> object:
+        nprandom.seed(seed)
+        return fn()
+
+    return _run
+
+
+def _iterate_metric_cases(
+    ppm: PointsPerMatch,
+    num_iteration_simulation: tuple[int, int],
+    seed: int,
+) -> Iterator[Case]:
+    for name, metric_type in METRIC_MAP.items():
+        fn = partial(metric_type.from_points_per_match, ppm, num_iteration_simulation)
+        yield f"metric/{name}", _seeded(fn, seed)
+
+
+def _iterate_expanding_cases(
+    matches: Matches,
+    num_iteration_simulation: tuple[int, int],
+    seed: int,
+) -> Iterator[Case]:
+    for engine in ENGINE_MAP:
+        fn = partial(
+            ms.ExpandingMetricStats.from_matches,
+            matches,
+            num_iteration_simulation,
+            winner_to_points=WINNER_TO_POINTS,
+            metric_type=Variances,
+            engine=engine,
+        )
+        yield f"expanding_metric_stats/{engine}", _seeded(fn, seed)
+
+
+def _iterate_scaling_cases(
+    dataset: BenchmarkDataset,
+    num_iteration_simulation: tuple[int, int],
+) -> Iterator[Case]:
+    # normalized metric: bounds are also updated at every date
+    for factor in SCALING_FACTORS:
+        number_of_drr = dataset.number_of_drr * factor
+        matches = replace(dataset, number_of_drr=number_of_drr).create_matches()
+
+        fn = partial(
+            ms.ExpandingMetricStats.from_matches,
+            matches,
+            num_iteration_simulation,
+            winner_to_points=WINNER_TO_POINTS,
+            metric_type=NormalizedHHI,
+            engine="incremental",
+        )
+        name = f"incremental_scaling/nhhi/drr={number_of_drr}"
+        yield name, _seeded(fn, dataset.seed)
+
+
+def _iterate_turning_point_cases(matches: Matches, seed: int) -> Iterator[Case]:
+    # only the turning point is timed, so stats are calculated once (cheap engine)
+    nprandom.seed(seed)
+    expanding_stats = ms.ExpandingMetricStats.from_matches(
+        matches, (1, 100), winner_to_points=WINNER_TO_POINTS, engine="incremental"
+    )
+    turning_point = TurningPoint.from_expanding_var_stats(expanding_stats)
+
+    yield "turning_point", partial(
+        TurningPoint.from_expanding_var_stats, expanding_stats
+    )
+    yield "match_turning_point", partial(
+        MatchTurningPoint.from_matches_and_turning_point, matches, turning_point
+    )
+
+
+def _iterate_optimal_schedule_cases(dataset: BenchmarkDataset) -> Iterator[Case]:
+    yield "optimal_schedule/graph", partial(
+        alg.generate_optimal_graph_schedule, dataset.strengths
+    )
+    yield "optimal_schedule/recursive", partial(
+        alg.generate_recursive_optimal_schedule, dataset.num_teams
+    )
+
+
+def iterate_cases(
+    dataset: BenchmarkDataset,
+    num_iteration_simulation: tuple[int, int] = (1, 100),
+) -> Iterator[Case]:
+    """
+    Yields (name, benchmark) for every hot path.
+
+    Setup (creating matches, stats, ...) is done before yielding,
+    so only the returned callable should be timed.
+
+        metric/{name}: simulating and calculating each metric in METRIC_MAP.
+        expanding_metric_stats/{engine}: ExpandingMetricStats.from_matches.
+        incremental_scaling/nhhi/drr={k}: incremental engine for seasons
+            1, 2 and 4 times longer (times should grow linearly).
+        turning_point: TurningPoint.from_expanding_var_stats.
+        match_turning_point: MatchTurningPoint.from_matches_and_turning_point.
+        optimal_schedule/{algorithm}: optimal schedule generators.
+    """
+    matches = dataset.create_matches()
+    ppm = PointsPerMatch.from_home_away_winner(
+        home_away_winner=matches.home_away_winner("winner"),
+        result_to_points=WINNER_TO_POINTS,
+    )
+
+    yield from _iterate_metric_cases(ppm, num_iteration_simulation, dataset.seed)
+    yield from _iterate_expanding_cases(matches, num_iteration_simulation, dataset.seed)
+    yield from _iterate_scaling_cases(dataset, num_iteration_simulation)
+    yield from _iterate_turning_point_cases(matches, dataset.seed)
+    yield from _iterate_optimal_schedule_cases(dataset)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass
+
+import numpy.random as nprandom
+import pandas as pd
+
+from synthetic_tournaments import Scheduler
+from synthetic_tournaments.bradley_terry import simulate_bradley_terry_tourney
+from synthetic_tournaments.permutation import scheduling as sch
+from tournament_simulations.data_structures import Matches
+from tournament_simulations.permutations import MatchesPermutations
+
+
+@dataclass(frozen=True)
+class BenchmarkDataset:
+    """
+    Synthetic tournaments used by every benchmark.
+
+        num_teams: int
+            Number of teams in each tournament.
+            Strengths are 1, 2, ..., num_teams (Bradley-Terry).
+
+        number_of_drr: int
+            Number of double round-robins (rounds = 2 * (num_teams - 1) * drr).
+
+        num_permutations: int
+            Number of random permutations of the simulated tournament.
+            The dataset has num_permutations + 1 tournaments.
+
+        seed: int
+            Seed used to simulate and permute the tournament.
+    """
+
+    num_teams: int = 20
+    number_of_drr: int = 1
+    num_permutations: int = 10
+    seed: int = 0
+
+    @property
+    def strengths(self) -> list[float]:
+        return [float(strength) for strength in range(1, self.num_teams + 1)]
+
+    def to_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+    def create_matches(self) -> Matches:
+        random.seed(self.seed)
+        nprandom.seed(self.seed)
+
+        matches = simulate_bradley_terry_tourney(
+            self.strengths, "benchmark", self.number_of_drr
+        )
+        if self.num_permutations <= 0:
+            return matches
+
+        scheduler_factory = Scheduler(matches, sch.circle_method.create_double_rr)
+        scheduler = scheduler_factory.get_current_year_scheduler()
+
+        permutations_creator = MatchesPermutations(matches, scheduler)
+        permuted = permutations_creator.create_n_permutations(self.num_permutations)
+
+        return Matches(pd.concat([matches.df, permuted.df]))
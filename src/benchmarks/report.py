@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import platform
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+import pandas as pd
+
+from .timing import Timing
+
+Status = Literal["regression", "improvement", "unchanged", "new", "missing"]
+
+
+def get_environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def save_results(
+    filepath: Path,
+    results: dict[str, Timing],
+    metadata: dict[str, Any],
+) -> None:
+    """
+    Save results as json:
+        {
+            "metadata": {...},  # dataset parameters, environment, ...
+            "results": {name: {"min": ..., "median": ..., "mean": ..., "repeat": ...}}
+        }
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    content = {
+        "metadata": metadata,
+        "results": {name: timing.to_dict() for name, timing in results.items()},
+    }
+    with open(filepath, "w") as file:
+        json.dump(content, file, indent=4)
+
+
+def load_results(filepath: Path) -> tuple[dict[str, Timing], dict[str, Any]]:
+    """
+    Load results saved with `save_results`.
+
+    ----
+    Returns:
+        tuple[dict[str, Timing], dict[str, Any]]
+            Results and metadata.
+    """
+    with open(filepath, "r") as file:
+        content = json.load(file)
+
+    results = {
+        name: Timing.from_dict(timing) for name, timing in content["results"].items()
+    }
+    return results, content.get("metadata", {})
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """
+    Comparison of a benchmark against its baseline (median times).
+
+        ratio: float | None
+            current / baseline. None if one of them does not exist.
+    """
+
+    name: str
+    current: float | None
+    baseline: float | None
+    ratio: float | None
+    status: Status
+
+
+def compare_results(
+    current: dict[str, Timing],
+    baseline: dict[str, Timing],
+    threshold: float = 0.2,
+) -> list[Comparison]:
+    """
+    Compare median times.
+
+    ----
+    Parameters:
+        threshold: float = 0.2
+            Relative tolerance. A benchmark is a regression if it is more than
+            `threshold` slower than the baseline (ratio > 1 + threshold) and
+            an improvement if ratio < 1 / (1 + threshold).
+    """
+    comparisons = []
+
+    for name in sorted(current.keys() | baseline.keys()):
+        if name not in baseline:
+            comparison = Comparison(name, current[name].median, None, None, "new")
+        elif name not in current:
+            comparison = Comparison(name, None, baseline[name].median, None, "missing")
+        else:
+            current_time, baseline_time = current[name].median, baseline[name].median
+            ratio = current_time / baseline_time if baseline_time > 0 else np.inf
+
+            status: Status = "unchanged"
+            if ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold):
+                status = "improvement"
+
+            comparison = Comparison(name, current_time, baseline_time, ratio, status)
+
+        comparisons.append(comparison)
+
+    return comparisons
+
+
+def has_regression(comparisons: list[Comparison]) -> bool:
+    return any(comparison.status == "regression" for comparison in comparisons)
+
+
+def _format_seconds(value: float | None) -> str:
+    return "-" if value is None else f"{value:.4f}s"
+
+
+def format_report(comparisons: list[Comparison]) -> str:
+    """
+    Human-readable table (one benchmark per line).
+    """
+    header = f"{'benchmark':<40} {'baseline':>10} {'current':>10} {'ratio':>7}  status"
+    lines = [header, "-" * len(header)]
+
+    for comparison in comparisons:
+        ratio = "-" if comparison.ratio is None else f"{comparison.ratio:.2f}x"
+        lines.append(
+            f"{comparison.name:<40} "
+            f"{_format_seconds(comparison.baseline):>10} "
+            f"{_format_seconds(comparison.current):>10} "
+            f"{ratio:>7}  {comparison.status}"
+        )
+
+    return "\n".join(lines)
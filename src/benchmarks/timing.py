@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Timing:
+    """
+    Wall-clock times (seconds) of a benchmark.
+
+        min: float
+            Fastest run (least affected by noise).
+
+        median: float
+            Median run (used to compare against the baseline).
+
+        mean: float
+            Mean run.
+
+        repeat: int
+            Number of runs.
+    """
+
+    min: float
+    median: float
+    mean: float
+    repeat: int
+
+    def to_dict(self) -> dict[str, float]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, timing: dict[str, float]) -> Timing:
+        return cls(**timing)
+
+    @classmethod
+    def from_durations(cls, durations: list[float]) -> Timing:
+        return cls(
+            min=min(durations),
+            median=statistics.median(durations),
+            mean=statistics.fmean(durations),
+            repeat=len(durations),
+        )
+
+
+def time_fn(fn: Callable[[], object], repeat: int = 5, warmup: int = 1) -> Timing:
+    """
+    Time `fn()` `repeat` times (after `warmup` untimed runs).
+    """
+    for _ in range(warmup):
+        fn()
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+
+    return Timing.from_durations(durations)
@@ -8,5 +8,6 @@ all dataset preparation modules.
 
 from . import dataset_paths as path
 from . import parameter_parser as parser
+from . import storage
 
-__all__ = ["path", "parser"]
+__all__ = ["path", "parser", "storage"]
@@ -1,12 +1,10 @@
-import random
 from functools import partial
 from pathlib import Path
-from typing import Callable, Iterable
+from typing import Callable, Iterator
 
-import numpy.random as nprandom
 import pandas as pd
 
-from logs import log, turning_logger
+from logs import turning_logger
 from synthetic_tournaments import Scheduler
 from synthetic_tournaments.bradley_terry import simulate_bradley_terry_tourney
 from synthetic_tournaments.optimal_schedule import algorithm as opt_alg
@@ -16,95 +14,114 @@ from synthetic_tournaments.permutation import scheduling as sch
 from tournament_simulations.data_structures import Matches
 from tournament_simulations.permutations import MatchesPermutations
 
+from .. import storage as st
 from .. import types
-from . import utils
+from . import parallel, utils
+from .cache import StageCache
 
 
-def _permute_matches(
-    matches: Matches,
-    permutation_fn: Callable,
-    permutation_ids: Iterable[str],
-) -> Matches:
+def _create_permutations_creator(
+    matches: Matches, permutation_fn: Callable
+) -> MatchesPermutations:
     scheduler_factory = Scheduler(matches, permutation_fn)
     scheduler = scheduler_factory.get_current_year_scheduler()
 
-    permutations_creator = MatchesPermutations(matches, scheduler)
-    return permutations_creator.create_n_permutations(permutation_ids)
+    return MatchesPermutations(matches, scheduler)
 
 
-def _generate_permutations_one_result(
-    label: str,
-    strengths: list[float],
-    number_of_drr: int,
+def _get_permutation_fn_per_id(
     n_random_permutations: int,
-) -> Matches:
-    matches = simulate_bradley_terry_tourney(strengths, label, number_of_drr)
-
-    random_kwargs = {
-        "permutation_fn": sch.circle_method.create_double_rr,
-        "permutation_ids": map(str, range(n_random_permutations)),
-    }
-
-    graph_kwargs = {
-        "permutation_fn": partial(
-            opt_sch.good_vs_bad_last.create_double_rr,
-            second_portion="flipped",
-            optimal_fn=opt_alg.generate_optimal_graph_schedule,
-        ),
-        "permutation_ids": ["graph_optimal"],
-    }
-
-    recursive_kwargs = {
-        "permutation_fn": partial(
-            opt_sch.good_vs_bad_last.create_double_rr,
-            second_portion="flipped",
-            optimal_fn=opt_alg.generate_recursive_optimal_schedule,
-        ),
-        "permutation_ids": ["recusive_optimal"],
-    }
-
-    all_kwargs = [random_kwargs, graph_kwargs, recursive_kwargs]
-    to_concat = (_permute_matches(matches, **kwargs).df for kwargs in all_kwargs)
-    return Matches(pd.concat(to_concat))
-
-
-@log(turning_logger.info)
+) -> Iterator[tuple[str, Callable]]:
+    """
+    Random, graph optimal and recursive optimal permutation ids
+    (and the function used to create each one of them).
+    """
+    for perm_id in map(str, range(n_random_permutations)):
+        yield perm_id, sch.circle_method.create_double_rr
+
+    yield "graph_optimal", partial(
+        opt_sch.good_vs_bad_last.create_double_rr,
+        second_portion="flipped",
+        optimal_fn=opt_alg.generate_optimal_graph_schedule,
+    )
+
+    yield "recusive_optimal", partial(
+        opt_sch.good_vs_bad_last.create_double_rr,
+        second_portion="flipped",
+        optimal_fn=opt_alg.generate_recursive_optimal_schedule,
+    )
+
+
 def _create_bt_permutations(
     label: str,
     strengths: list[float],
     n_different_results: int,
     n_permutations_per_result: int,
     number_of_drr: int,
-) -> Matches:
-
-    kwargs = {
-        "strengths": strengths,
-        "number_of_drr": number_of_drr,
-        "n_random_permutations": n_permutations_per_result,
-    }
-    diff_permutations = (
-        _generate_permutations_one_result(f"{label}@result_{i}", **kwargs)
+) -> Iterator[Matches]:
+    """
+    Yields one permutation id at a time (with its permutation of every
+    result), so the matches of each permutation are contiguous in the file.
+
+    All results are simulated first; only their real matches are kept in
+    memory while permutations are created.
+    """
+    results = [
+        simulate_bradley_terry_tourney(strengths, f"{label}@result_{i}", number_of_drr)
         for i in range(n_different_results)
-    )
-    return Matches(pd.concat(matches.df for matches in diff_permutations))
+    ]
+
+    current_fn = None
+    creators: list[MatchesPermutations] = []
+
+    for perm_id, permutation_fn in _get_permutation_fn_per_id(
+        n_permutations_per_result
+    ):
+        # random permutations share the same schedulers
+        if permutation_fn is not current_fn:
+            current_fn = permutation_fn
+            creators = [
+                _create_permutations_creator(matches, permutation_fn)
+                for matches in results
+            ]
+
+        to_concat = (
+            creator.create_n_permutations([perm_id]).df for creator in creators
+        )
+        yield Matches(pd.concat(to_concat))
 
 
 def create_and_save_bradltey_terry_matches(
     config: types.BradleyTerryConfig,
     save_directory: Path,
+    storage: st.StorageFormat = "csv",
+    use_cache: bool = False,
 ) -> None:
+    """
+    Each filename is seeded separately, so its matches do not depend on
+    which other filenames are created (or skipped because they are cached).
+
+    Each permutation (of every result) is saved as soon as it is created.
+    """
     bt_cfg = config["matches"]
     if not bt_cfg["should_create_it"]:
         return
 
-    random.seed(bt_cfg["seed"])
-    nprandom.seed(bt_cfg["seed"])
+    for filename in utils.parse_value_or_iterable(config["sports"]):
+        parameters = bt_cfg["parameters"][filename]
 
-    filenames = utils.parse_value_or_iterable(config["sports"])
+        cache = None
+        if use_cache:
+            cache_config = {"seed": bt_cfg["seed"], "parameters": parameters}
+            cache = StageCache(save_directory, cache_config, storage)
 
-    filename_to_matches = {
-        filename: _create_bt_permutations("BT", **bt_cfg["parameters"][filename])
-        for filename in filenames
-    }
+            if cache.is_fresh(filename):
+                turning_logger.info(f"Cached: {save_directory / filename}")
+                continue
 
-    utils.save_filename_to_df(filename_to_matches, save_directory)
+        # blocks are created (and saved) right after seeding
+        parallel.seed_all(parallel.job_seed(bt_cfg["seed"], filename))
+        filename_to_blocks = {filename: _create_bt_permutations("BT", **parameters)}
+        utils.save_filename_to_blocks(
+            filename_to_blocks, save_directory, storage, cache
+        )
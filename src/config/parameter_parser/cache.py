@@ -0,0 +1,158 @@
+import hashlib
+import importlib.util
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from .. import storage as st
+
+CACHE_DIRNAME = ".cache"
+
+# Every package whose code can change a stage's output.
+CODE_PACKAGES = (
+    "config",
+    "synthetic_tournaments",
+    "tournament_simulations",
+    "turning_point",
+)
+
+
+@lru_cache(maxsize=None)
+def _hash_file(filepath: Path, size: int, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _file_digest(filepath: Path) -> str:
+    """
+    Hash of the contents of `filepath`.
+
+    Each file is only read again if its size or modification time changed.
+    """
+    filepath = Path(filepath).resolve()
+    stat = filepath.stat()
+    return _hash_file(filepath, stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=None)
+def code_version(packages: tuple[str, ...] = CODE_PACKAGES) -> str:
+    """
+    Hash of the source code (every .py file) of `packages`.
+
+    Packages that are not installed are ignored.
+    """
+    digest = hashlib.sha256()
+
+    for package in packages:
+        spec = importlib.util.find_spec(package)
+        if spec is None or spec.submodule_search_locations is None:
+            continue
+
+        for location in spec.submodule_search_locations:
+            root = Path(location)
+            for filepath in sorted(root.rglob("*.py")):
+                relative_path = filepath.relative_to(root).as_posix()
+                digest.update(f"{package}/{relative_path}".encode())
+                digest.update(_file_digest(filepath).encode())
+
+    return digest.hexdigest()
+
+
+def compute_key(filename: str, config: Any, *input_paths: Path) -> str:
+    """
+    Content-addressed key of a single stage output.
+
+    ----
+    Parameters:
+        filename: str
+            Output filename (only the stem, no suffix).
+
+        config: Any
+            Stage configuration block (must be json serializable).
+
+        input_paths: Path
+            Files read to create the output. Their contents are hashed,
+            so renaming or touching them does not invalidate the cache.
+    """
+    digest = hashlib.sha256()
+    digest.update(code_version().encode())
+    digest.update(filename.encode())
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+
+    for filepath in input_paths:
+        digest.update(_file_digest(filepath).encode())
+
+    return digest.hexdigest()
+
+
+@dataclass
+class StageCache:
+    """
+    Skip outputs whose inputs have not changed.
+
+    A manifest with the key of each output is saved to
+    "{save_dir}/.cache/{filename}.json". An output is fresh if its file exists
+    and the manifest has the same key (same code, config and input contents).
+
+        save_dir: Path
+            Where the outputs of the stage are saved to.
+
+        config: Any
+            Stage configuration block (seed, parameters, ...).
+
+        storage: StorageFormat = "csv"
+            Outputs in another format are not considered fresh.
+    """
+
+    save_dir: Path
+    config: Any
+    storage: st.StorageFormat = "csv"
+
+    _pending_keys: dict[str, str] = field(default_factory=dict, repr=False)
+
+    def _manifest_path(self, filename: str) -> Path:
+        return self.save_dir / CACHE_DIRNAME / f"{filename}.json"
+
+    def _read_key(self, filename: str) -> str | None:
+        manifest_path = self._manifest_path(filename)
+        if not manifest_path.exists():
+            return None
+
+        with open(manifest_path, "r") as manifest:
+            return json.load(manifest).get("key")
+
+    def is_fresh(self, filename: str, *input_paths: Path) -> bool:
+        """
+        Whether the saved output can be reused.
+
+        If not, the key is kept until `commit(filename)` is called
+        (after the output is saved).
+        """
+        key = compute_key(filename, self.config, *input_paths)
+
+        output_path = st.get_filepath(self.save_dir, filename, self.storage)
+        if output_path.exists() and self._read_key(filename) == key:
+            return True
+
+        self._pending_keys[filename] = key
+        return False
+
+    def commit(self, filename: str) -> None:
+        """
+        Save the manifest of an output that was just saved.
+        """
+        key = self._pending_keys.pop(filename, None)
+        if key is None:
+            return
+
+        manifest_path = self._manifest_path(filename)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(manifest_path, "w") as manifest:
+            json.dump({"key": key}, manifest)
@@ -1,7 +1,8 @@
-import random
+import tempfile
+from collections import defaultdict
 from pathlib import Path
+from typing import Iterable, Iterator, Mapping, TypeVar
 
-import numpy.random as nprandom
 import pandas as pd
 
 import turning_point.metric_stats as ms
@@ -10,59 +11,494 @@ from logs import log, turning_logger
 from tournament_simulations.data_structures import Matches, PointsPerMatch
 from turning_point.metrics import METRIC_MAP
 
+from .. import storage as st
 from .. import types
-from . import utils
+from . import parallel, utils
+from .cache import StageCache
 
+T = TypeVar("T")
 
-def _get_metric_stats(
-    matches: Matches, quantile: float, metric: str, **kwargs
-) -> ms.ExpandingMetricStats:
+# (metric, quantile)
+MetricQuantile = tuple[str, float]
+
+# (all (metric, quantile) calculated together, filename, permutation identifier)
+MetricStatsKey = tuple[tuple[MetricQuantile, ...], str, str]
+
+# (point system, metric, quantile); point system is None without "point_systems"
+StatsKey = tuple[str | None, str, float]
+
+# (point system, metric, quantile) -> cache of its stats directory
+MetricStatsCaches = dict[StatsKey, StageCache]
+
+# Rows read from disk at a time (matches of a permutation are always complete)
+CHUNK_SIZE = 100_000
+
+
+def _unique(values: Iterable[T]) -> list[T]:
+    return list(dict.fromkeys(values))
+
+
+def _get_probabilities_per_id(
+    matches: Matches, var_parameters: types.TurningPointParameters
+) -> pd.Series | None:
+    """
+    Point pair probabilities of every id in `matches` (all permutations at
+    once). None with `point_systems` (outcome probabilities are used instead).
     """
-    This function works both for real matches and permutation matches.
+    if var_parameters.get("point_systems"):
+        return None
 
-    For permutation matches it calculates stats for each permutation
-    separately to reduce memory usage.
+    winner_to_points = {
+        k: tuple(v) for k, v in var_parameters["winner_to_points"].items()
+    }
+    point_pairs = sorted(set(winner_to_points.values()))
+
+    ppm = PointsPerMatch.from_home_away_winner(
+        home_away_winner=matches.home_away_winner(var_parameters["winner_type"]),
+        result_to_points=winner_to_points,
+    )
+    return ppm.probabilities_per_id(point_pairs)
+
+
+def _get_random_permutation_probabilities(
+    matches: Matches,
+    var_parameters: types.TurningPointParameters,
+    base_to_probabilities: dict[str, object],
+) -> pd.Series | None:
+    """
+    Same as `_get_probabilities_per_id` for a random permutation (numeric
+    permutation identifier), but calculated only once per base tournament.
+
+    Random permutations only change when each match is played (home, away
+    and result are kept), so every permutation of a tournament has the same
+    probabilities. They are calculated for tournaments that are not in
+    `base_to_probabilities` yet and saved there.
     """
+    if var_parameters.get("point_systems"):
+        return None
+
+    base_ids = pc.TournamentIdentifiers.from_index(matches.df).parsed["base id"]
+    base_ids = base_ids.astype(str)
+
+    is_missing = ~base_ids.isin(base_to_probabilities).to_numpy()
+    if is_missing.any():
+        missing_ids = base_ids.index[is_missing]
+        is_row_missing = matches.df.index.get_level_values("id").isin(missing_ids)
+
+        missing_matches = Matches(matches.df[is_row_missing])
+        probabilities = _get_probabilities_per_id(missing_matches, var_parameters)
+
+        for id_, base_id in base_ids[is_missing].items():
+            base_to_probabilities[base_id] = probabilities.loc[id_]
+
+    return pd.Series(
+        [base_to_probabilities[base_id] for base_id in base_ids],
+        index=base_ids.index,
+        name="probabilities",
+        dtype=object,
+    )
+
+
+@log(turning_logger.debug)
+def _get_permutation_metric_stats(
+    matches_df: pd.DataFrame,
+    metric_quantiles: list[MetricQuantile],
+    seed: int,
+    id_to_probabilities: pd.Series | None = None,
+    **kwargs,
+) -> dict[StatsKey, pd.DataFrame]:
+    """
+    Calculate stats for a single permutation (or real matches).
+
+    `id_to_probabilities` may be given if it was already calculated (e.g.
+    shared by the random permutations of a tournament); otherwise it is
+    calculated from `matches_df`.
+
+    All metrics and quantiles are calculated from the same simulations.
+    With early stopping (`error_tolerance`), simulations stop independently
+    for each (metric, quantile), so they are calculated separately (with
+    the same seed).
+
+    With `point_systems`, match outcomes are simulated only once and every
+    point system is calculated from them (see `_get_point_systems_stats`).
+
+    Each call seeds its own random generators, so it can safely be run
+    in another process.
+    """
+    if kwargs.get("point_systems"):
+        return _get_point_systems_stats(matches_df, metric_quantiles, seed, **kwargs)
+
     winner_to_points = {k: tuple(v) for k, v in kwargs["winner_to_points"].items()}
-    point_pairs = sorted(set(winner_to_points.values()))
 
-    all_var_stats: list[pd.DataFrame] = []
-    permutation_ids = pc.get_permutation_identifiers(matches.df)
+    filtered_matches = Matches(matches_df)
 
-    for perm_id in permutation_ids:
-        turning_logger.info(f"Starting i-th permutation: {perm_id}")
+    if id_to_probabilities is None:
+        id_to_probabilities = _get_probabilities_per_id(filtered_matches, kwargs)
 
-        filtered_matches = Matches(pc.get_data_with_identifier(matches.df, perm_id))
+    common_kwargs = {
+        "num_iteration_simulation": kwargs["num_iteration_simulation"],
+        "winner_type": kwargs["winner_type"],
+        "winner_to_points": winner_to_points,
+        "id_to_probabilities": id_to_probabilities,
+        "engine": kwargs.get("engine", "window"),
+        "streaming": kwargs.get("streaming", False),
+    }
 
-        # TODO: Remove this redundant calculation?
-        filtered_ppm = PointsPerMatch.from_home_away_winner(
-            home_away_winner=filtered_matches.home_away_winner(kwargs["winner_type"]),
-            result_to_points=winner_to_points,
-        )
-        var_stats = ms.ExpandingMetricStats.from_matches(
-            filtered_matches,
-            num_iteration_simulation=kwargs["num_iteration_simulation"],
-            winner_type=kwargs["winner_type"],
-            winner_to_points=winner_to_points,
-            id_to_probabilities=filtered_ppm.probabilities_per_id(point_pairs),
-            quantile=quantile,
-            metric_type=METRIC_MAP[metric],
+    error_tolerance = kwargs.get("error_tolerance")
+    if error_tolerance is not None:
+        key_to_df: dict[StatsKey, pd.DataFrame] = {}
+
+        for metric, quantile in metric_quantiles:
+            parallel.seed_all(seed)
+            var_stats = ms.ExpandingMetricStats.from_matches(
+                filtered_matches,
+                quantile=quantile,
+                metric_type=METRIC_MAP[metric],
+                error_tolerance=error_tolerance,
+                **common_kwargs,
+            )
+            key_to_df[(None, metric, quantile)] = var_stats.df
+
+        return key_to_df
+
+    metrics = _unique(metric for metric, _ in metric_quantiles)
+    quantiles = _unique(quantile for _, quantile in metric_quantiles)
+
+    parallel.seed_all(seed)
+    metric_to_stats = ms.ExpandingMetricStats.from_matches_per_metric(
+        filtered_matches,
+        quantile=quantiles,
+        metric_types={metric: METRIC_MAP[metric] for metric in metrics},
+        **common_kwargs,
+    )
+
+    # same layout as calculating each (metric, quantile) separately
+    return {
+        (None, metric, quantile): metric_to_stats[metric].select_quantile(quantile).df
+        for metric, quantile in metric_quantiles
+    }
+
+
+def _get_point_systems_stats(
+    matches_df: pd.DataFrame,
+    metric_quantiles: list[MetricQuantile],
+    seed: int,
+    **kwargs,
+) -> dict[StatsKey, pd.DataFrame]:
+    """
+    Same as `_get_permutation_metric_stats` for every point system in
+    `kwargs["point_systems"]`.
+
+    Match outcomes are simulated only once (incremental engine) and converted
+    to the points of each point system, instead of simulating each point
+    system separately.
+    """
+    if kwargs.get("error_tolerance") is not None or kwargs.get("streaming", False):
+        raise ValueError(
+            "'point_systems' cannot be used with 'error_tolerance' or 'streaming'."
         )
 
-        all_var_stats.append(var_stats.df)
+    point_systems = {
+        system: {k: tuple(v) for k, v in winner_to_points.items()}
+        for system, winner_to_points in kwargs["point_systems"].items()
+    }
+    metrics = _unique(metric for metric, _ in metric_quantiles)
+    quantiles = _unique(quantile for _, quantile in metric_quantiles)
+
+    parallel.seed_all(seed)
+    system_to_stats = ms.ExpandingMetricStats.from_matches_per_point_system(
+        Matches(matches_df),
+        num_iteration_simulation=kwargs["num_iteration_simulation"],
+        point_systems=point_systems,
+        winner_type=kwargs["winner_type"],
+        quantile=quantiles,
+        metric_types={metric: METRIC_MAP[metric] for metric in metrics},
+    )
+
+    return {
+        (system, metric, quantile): metric_to_stats[metric].select_quantile(quantile).df
+        for system, metric_to_stats in system_to_stats.items()
+        for metric, quantile in metric_quantiles
+    }
+
+
+def _get_permutation_layout(
+    filepath: Path, chunk_size: int = CHUNK_SIZE
+) -> tuple[dict[str, int], bool]:
+    """
+    Number of entries of each permutation in `filepath` (in the order they
+    first appear) and whether the entries of each permutation are contiguous.
+
+    Only the "id" column is read, `chunk_size` rows at a time.
+    """
+    permutation_sizes: dict[str, int] = {}
+    is_contiguous = True
+    last_perm_id = None
 
-    return ms.ExpandingMetricStats(pd.concat(all_var_stats).sort_index())
+    for chunk in st.iter_df_chunks(filepath, chunk_size, columns=["id"]):
+        for perm_id, size in pc.get_permutation_runs(chunk.set_index("id")):
+            if perm_id != last_perm_id and perm_id in permutation_sizes:
+                is_contiguous = False
 
+            permutation_sizes[perm_id] = permutation_sizes.get(perm_id, 0) + size
+            last_perm_id = perm_id
 
-@log(turning_logger.info)
-def _calculate_metric_stats(
+    return permutation_sizes, is_contiguous
+
+
+def _group_permutations(
+    permutation_sizes: Mapping[str, int], max_size: int
+) -> Iterator[dict[str, int]]:
+    """
+    Consecutive permutations with at most `max_size` entries in total
+    (a larger permutation is in a group of its own).
+    """
+    group: dict[str, int] = {}
+    group_size = 0
+
+    for perm_id, size in permutation_sizes.items():
+        if group and group_size + size > max_size:
+            yield group
+            group, group_size = {}, 0
+
+        group[perm_id] = size
+        group_size += size
+
+    if group:
+        yield group
+
+
+def _spill_permutation_groups(
     filepath: Path,
+    permutation_sizes: Mapping[str, int],
+    save_dir: Path,
+    chunk_size: int = CHUNK_SIZE,
+) -> list[Path]:
+    """
+    Read `filepath` once, `chunk_size` rows at a time, and append the entries
+    of each group of permutations (see `_group_permutations`) to its own file
+    in `save_dir`, so every permutation is contiguous in one of them.
+
+    Files are in the same format as `filepath` and in the same order as
+    the groups.
+    """
+    groups = list(_group_permutations(permutation_sizes, chunk_size))
+    perm_to_group = {perm_id: i for i, group in enumerate(groups) for perm_id in group}
+
+    group_paths = [save_dir / f"group_{i}{filepath.suffix}" for i in range(len(groups))]
+    appenders = [st.DfAppender(group_path) for group_path in group_paths]
+
+    try:
+        for chunk in st.iter_df_chunks(filepath, chunk_size):
+            for perm_id, df in pc.partition_by_permutation(chunk.set_index("id")):
+                appenders[perm_to_group[perm_id]].append(df)
+    finally:
+        for appender in appenders:
+            appender.close()
+
+    return group_paths
+
+
+def _read_permutation_blocks(
+    filepath: Path, chunk_size: int = CHUNK_SIZE
+) -> Iterator[tuple[str, Matches]]:
+    """
+    Matches of each permutation in `filepath` (or all of them if there are
+    no permutations), read from disk `chunk_size` rows at a time.
+
+    If the entries of each permutation are contiguous, the file is read only
+    once and at most one permutation is in memory.
+
+    Otherwise, the file is still read only once, but permutations are first
+    split into temporary files with at most `chunk_size` entries each (or a
+    single larger permutation), which are then read one at a time.
+    """
+    permutation_sizes, is_contiguous = _get_permutation_layout(filepath, chunk_size)
+
+    if is_contiguous:
+        chunks = st.iter_df_chunks(filepath, chunk_size)
+        chunks = (chunk.set_index("id") for chunk in chunks)
+
+        for perm_id, df in pc.partition_chunks_by_permutation(
+            chunks, permutation_sizes
+        ):
+            yield perm_id, Matches(df.reset_index())
+        return
+
+    turning_logger.info(f"Permutations are not contiguous: {filepath}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        group_paths = _spill_permutation_groups(
+            filepath, permutation_sizes, Path(tmp_dir), chunk_size
+        )
+
+        for group_path in group_paths:
+            group_df = st.read_df(group_path).set_index("id")
+            group_path.unlink()
+
+            for perm_id, df in pc.partition_by_permutation(group_df):
+                yield perm_id, Matches(df.reset_index())
+
+
+def _iterate_metric_stats_jobs(
+    sports: types.Sports,
+    read_directory: Path,
+    metrics: list[str],
+    quantiles: list[float],
+    seeds: list[int],
     var_parameters: types.TurningPointParameters,
-    quantile: float,
-    metric: str,
-) -> ms.ExpandingMetricStats:
-    matches = Matches(pd.read_csv(filepath))
-    return _get_metric_stats(matches, quantile, metric, **var_parameters)
+    storage: st.StorageFormat = "csv",
+    caches: MetricStatsCaches | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[tuple[MetricStatsKey, tuple]]:
+    """
+    Yields one job for each (seed, filename, permutation).
+
+    All metrics and quantiles with the same seed are calculated together,
+    from a single set of simulations.
+
+    For permuted matches, stats are calculated for each permutation
+    separately to reduce memory usage. Permutations are read from disk one
+    at a time (see `_read_permutation_blocks`), so jobs are in the same
+    order as permutations in the file.
+
+    Point pair probabilities of random permutations are calculated only once
+    per tournament (see `_get_random_permutation_probabilities`).
+
+    If `caches` is given, (metric, quantile, filename) whose stats are fresh
+    (for every point system) are skipped.
+    """
+    point_systems = utils.parse_point_systems(var_parameters)
+
+    for filename in utils.parse_value_or_iterable(sports):
+        filepath = st.find_filepath(read_directory, filename, storage)
+
+        if filepath is None:
+            turning_logger.warning(f"No file: {read_directory / filename}")
+            continue
+
+        seed_to_metric_quantiles: dict[int, list[MetricQuantile]]
+        seed_to_metric_quantiles = defaultdict(list)
+
+        for metric in metrics:
+            for seed, quantile in zip(seeds, quantiles):
+                if caches is None:
+                    seed_to_metric_quantiles[seed].append((metric, quantile))
+                    continue
+
+                # every system must be checked, so stale ones keep their key
+                is_fresh = [
+                    caches[(system, metric, quantile)].is_fresh(filename, filepath)
+                    for system in point_systems
+                ]
+                if not all(is_fresh):
+                    seed_to_metric_quantiles[seed].append((metric, quantile))
+
+        if not seed_to_metric_quantiles:
+            turning_logger.info(f"Cached: {filename} (all metrics and quantiles)")
+            continue
+
+        base_to_probabilities: dict[str, object] = {}
+
+        for perm_id, matches in _read_permutation_blocks(filepath, chunk_size):
+            # others (real matches, optimal schedules) are calculated by the jobs
+            id_to_probabilities = None
+            if perm_id.isdigit():
+                id_to_probabilities = _get_random_permutation_probabilities(
+                    matches, var_parameters, base_to_probabilities
+                )
+
+            for seed, metric_quantiles in seed_to_metric_quantiles.items():
+                key = (tuple(metric_quantiles), filename, perm_id)
+
+                perm_seed = parallel.job_seed(seed, filename, perm_id)
+                args = (
+                    matches.df,
+                    metric_quantiles,
+                    perm_seed,
+                    id_to_probabilities,
+                    var_parameters,
+                )
+                yield key, args
+
+
+def _run_job(
+    matches_df: pd.DataFrame,
+    metric_quantiles: list[MetricQuantile],
+    seed: int,
+    id_to_probabilities: pd.Series | None,
+    var_parameters: types.TurningPointParameters,
+) -> dict[StatsKey, pd.DataFrame]:
+    return _get_permutation_metric_stats(
+        matches_df, metric_quantiles, seed, id_to_probabilities, **var_parameters
+    )
+
+
+def _close_appenders(
+    appenders: dict[StatsKey, st.DfAppender],
+    filename: str,
+    caches: MetricStatsCaches | None = None,
+) -> None:
+    for stats_key, appender in appenders.items():
+        appender.close()
+
+        if caches is not None:
+            caches[stats_key].commit(filename)
+
+    appenders.clear()
+
+
+def _run_and_save_metric_stats_jobs(
+    fn_kwargs: dict,
+    save_directory: Path,
+    num_workers: int,
+) -> None:
+    """
+    Stats of each job are appended to
+    "{save_directory}/[{point system}/]{quantile}/{metric}/{filename}"
+    as soon as the job finishes, so only one permutation per
+    (point system, metric, quantile) is in memory at a time.
+
+    Files are only replaced (and cached) after all jobs of the filename.
+    If a job fails, stats that were already calculated remain in
+    "{filename}.partial" files.
+    """
+    storage = fn_kwargs["storage"]
+    caches = fn_kwargs["caches"]
+
+    appenders: dict[StatsKey, st.DfAppender] = {}
+    current_filename = None
+
+    jobs = _iterate_metric_stats_jobs(**fn_kwargs)
+    try:
+        for key, stats_key_to_df in parallel.run_jobs(_run_job, jobs, num_workers):
+            turning_logger.info(f"Finished job: {key}")
+
+            _, filename, _ = key
+            if filename != current_filename:
+                _close_appenders(appenders, current_filename, caches)
+                current_filename = filename
+
+            for stats_key, stats in stats_key_to_df.items():
+                if stats_key not in appenders:
+                    system, metric, quantile = stats_key
+                    save_dir = utils.get_stats_directory(
+                        save_directory, system, quantile, metric
+                    )
+                    save_dir.mkdir(parents=True, exist_ok=True)
+
+                    filepath = st.get_filepath(save_dir, filename, storage)
+                    appenders[stats_key] = st.DfAppender(filepath)
+
+                var_stats = ms.ExpandingMetricStats(stats.sort_index())
+                appenders[stats_key].append(var_stats.df)
+
+    except BaseException:
+        for appender in appenders.values():
+            appender.abort()
+        raise
+
+    _close_appenders(appenders, current_filename, caches)
 
 
 def _extend_seeds_as_quantiles(
@@ -84,34 +520,63 @@ def calculate_and_save_metric_stats(
     config: types.RealConfig | types.PermutedConfig,
     read_directory: Path,
     save_directory: Path,
+    num_workers: int = 1,
+    storage: st.StorageFormat = "csv",
+    use_cache: bool = False,
+    chunk_size: int = CHUNK_SIZE,
 ) -> None:
+    """
+    Calculate and save stats for every (metric, quantile, sport).
+
+    Metrics and quantiles that have the same seed share a single simulation
+    pass (each (metric, quantile) is still saved in its own directory).
+
+    If parameters have "point_systems", all point systems also share it and
+    stats are saved in "{save_directory}/{point_system}/{quantile}/{metric}".
+
+    Jobs (one per permutation) are independent and have their own seed,
+    so running them in parallel (num_workers > 1) generates the same results
+    as running them serially. For the same reason, stats that are cached
+    (`use_cache`) can be reused without changing the other ones.
+
+    Matches are read `chunk_size` rows at a time and the stats of each
+    permutation are appended to their file as soon as they are calculated,
+    so memory does not grow with the number of permutations.
+    """
     var_config = config["turning_point"]
 
     if not var_config["should_calculate_it"]:
         return
 
+    quantiles = utils.parse_value_or_iterable(var_config["quantile"])
+    seeds = _extend_seeds_as_quantiles(
+        quantiles, utils.parse_value_or_iterable(var_config["seed"])
+    )
     metrics = utils.parse_value_or_iterable(var_config["metric"])
+    point_systems = utils.parse_point_systems(var_config["parameters"])
 
-    quantiles = utils.parse_value_or_iterable(var_config["quantile"])
-    seeds = utils.parse_value_or_iterable(var_config["seed"])
-    seeds = _extend_seeds_as_quantiles(quantiles, seeds)
-
-    for metric in metrics:
-        for seed, quantile in zip(seeds, quantiles):
-            random.seed(seed)
-            nprandom.seed(seed)
-
-            fn_kwargs = {
-                "var_parameters": config["turning_point"]["parameters"],
-                "quantile": quantile,
-                "metric": metric,
-            }
-            filename_to_var_stats = utils.run_for_all_filenames(
-                _calculate_metric_stats,
-                config["sports"],
-                read_directory,
-                **fn_kwargs,
+    caches: MetricStatsCaches | None = None
+    if use_cache:
+        caches = {
+            (system, metric, quantile): StageCache(
+                utils.get_stats_directory(save_directory, system, quantile, metric),
+                {"seed": seed, "parameters": var_config["parameters"]},
+                storage,
             )
+            for system in point_systems
+            for metric in metrics
+            for seed, quantile in zip(seeds, quantiles)
+        }
 
-            save_dir = save_directory / str(quantile) / metric
-            utils.save_filename_to_df(filename_to_var_stats, save_dir)
+    fn_kwargs = {
+        "sports": config["sports"],
+        "read_directory": read_directory,
+        "metrics": metrics,
+        "quantiles": quantiles,
+        "seeds": seeds,
+        "var_parameters": var_config["parameters"],
+        "storage": storage,
+        "caches": caches,
+        "chunk_size": chunk_size,
+    }
+    _run_and_save_metric_stats_jobs(fn_kwargs, save_directory, num_workers)
@@ -1,12 +1,7 @@
-import random
 from functools import partial
 from pathlib import Path
 from typing import Callable, Iterator, Sequence
 
-import numpy.random as nprandom
-import pandas as pd
-
-from logs import log, turning_logger
 from synthetic_tournaments import Scheduler
 from synthetic_tournaments.optimal_schedule import algorithm as alg
 from synthetic_tournaments.optimal_schedule import scheduling as sch
@@ -14,8 +9,10 @@ from tournament_simulations.data_structures import Matches
 from tournament_simulations.permutations import MatchesPermutations
 from tournament_simulations.schedules import Round
 
+from .. import storage as st
 from .. import types
-from . import utils
+from . import parallel, utils
+from .cache import StageCache
 
 SimpleSchedulingFn = Callable[
     [
@@ -83,12 +80,13 @@ def _flat_iter_scheduling_fns_parameter(
                 yield id_, fn
 
 
-def _concat_optimal_schedules_for_all_types(
+def _iterate_optimal_schedules_for_all_types(
     matches: Matches,
     desired_types: types.OptimalMatchesTypeParameter,
-) -> Matches:
-    all_tournaments: list[pd.DataFrame] = []
-
+) -> Iterator[Matches]:
+    """
+    Yields the matches of one (type, scheduler) at a time.
+    """
     for type_id, scheduling_fn in _flat_iter_scheduling_fns_parameter(desired_types):
         scheduler_factory = Scheduler(matches, scheduling_fn)
         schedulers = {
@@ -102,39 +100,50 @@ def _concat_optimal_schedules_for_all_types(
             permutations_creator = MatchesPermutations(filtered_matches, scheduler)
 
             id_ = f"{type_id}-{scheduler_type}"
-            permuted_df = permutations_creator.create_n_permutations([id_]).df
-            all_tournaments.append(permuted_df)
-
-    return Matches(pd.concat(all_tournaments))
+            yield permutations_creator.create_n_permutations([id_])
 
 
-@log(turning_logger.info)
 def _create_synthetic_matches(
     filepath: Path,
     desired_types: types.OptimalMatchesTypeParameter,
-) -> Matches:
-    matches = Matches(pd.read_csv(filepath))
-    return _concat_optimal_schedules_for_all_types(matches, desired_types)
+    seed: int,
+) -> Iterator[Matches]:
+    parallel.seed_all(parallel.job_seed(seed, filepath.stem))
+    matches = Matches(st.read_df(filepath))
+    yield from _iterate_optimal_schedules_for_all_types(matches, desired_types)
 
 
 def create_and_save_optimal_matches(
     config: types.OptimalConfig,
     read_directory: Path,
     save_directory: Path,
+    storage: st.StorageFormat = "csv",
+    use_cache: bool = False,
 ) -> None:
+    """
+    Each sport is seeded separately, so its schedules do not depend on
+    which other sports are created (or skipped because they are cached).
+
+    Schedules of each type are saved as soon as they are created.
+    """
     optimal_cfg = config["matches"]
     if not optimal_cfg["should_create_it"]:
         return
 
-    random.seed(optimal_cfg["seed"])
-    nprandom.seed(optimal_cfg["seed"])
+    cache_config = {k: optimal_cfg[k] for k in ("seed", "parameters")}
+    cache = StageCache(save_directory, cache_config, storage) if use_cache else None
 
-    fn_kwargs = {"desired_types": optimal_cfg["parameters"]["types"]}
-    filename_to_matches = utils.run_for_all_filenames(
+    fn_kwargs = {
+        "desired_types": optimal_cfg["parameters"]["types"],
+        "seed": optimal_cfg["seed"],
+    }
+    filename_to_blocks = utils.run_for_all_filenames(
         _create_synthetic_matches,
         config["sports"],
         read_directory,
+        storage=storage,
+        cache=cache,
         **fn_kwargs,
     )
 
-    utils.save_filename_to_df(filename_to_matches, save_directory)
+    utils.save_filename_to_blocks(filename_to_blocks, save_directory, storage, cache)
@@ -0,0 +1,69 @@
+import random
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Hashable, Iterable, Iterator, TypeVar
+
+import numpy.random as nprandom
+
+Key = TypeVar("Key", bound=Hashable)
+Output = TypeVar("Output")
+
+
+def job_seed(seed: int, *job_key: Hashable) -> int:
+    """
+    Deterministic seed for a single job.
+
+    It only depends on `seed` and `job_key` (not on the order jobs are run),
+    so serial and parallel executions generate the exact same results.
+    """
+    key = "/".join(str(value) for value in job_key)
+    sequence = nprandom.SeedSequence([seed, zlib.crc32(key.encode())])
+    return int(sequence.generate_state(1)[0])
+
+
+def seed_all(seed: int) -> None:
+    random.seed(seed)
+    nprandom.seed(seed)
+
+
+def run_jobs(
+    fn: Callable[..., Output],
+    jobs: Iterable[tuple[Key, tuple]],
+    num_workers: int = 1,
+) -> Iterator[tuple[Key, Output]]:
+    """
+    Run `fn(*args)` for each job and yield (key, result) in the same order
+    as `jobs`.
+
+    ----
+    Parameters:
+        fn: Callable[..., Output]
+            Must be defined at module level (picklable) if num_workers > 1.
+
+        jobs: Iterable[tuple[Key, tuple]]
+            Pairs (key, args). It is consumed lazily: at most 2 * num_workers
+            jobs are submitted (and kept in memory) at the same time.
+
+        num_workers: int = 1
+            Number of processes. If 1 (or less), jobs run serially in the
+            current process.
+    """
+    if num_workers <= 1:
+        for key, args in jobs:
+            yield key, fn(*args)
+        return
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        pending: deque[tuple[Key, Future]] = deque()
+
+        for key, args in jobs:
+            pending.append((key, executor.submit(fn, *args)))
+
+            if len(pending) >= 2 * num_workers:
+                done_key, future = pending.popleft()
+                yield done_key, future.result()
+
+        while pending:
+            done_key, future = pending.popleft()
+            yield done_key, future.result()
@@ -1,53 +1,72 @@
-import random
 from pathlib import Path
+from typing import Iterator
 
-import numpy.random as nprandom
-import pandas as pd
-
-from logs import log, turning_logger
 from synthetic_tournaments import Scheduler
 from synthetic_tournaments.permutation import scheduling as sch
 from tournament_simulations.data_structures import Matches
 from tournament_simulations.permutations import MatchesPermutations
 
+from .. import storage as st
 from .. import types
-from . import utils
+from . import parallel, utils
+from .cache import StageCache
 
 
-@log(turning_logger.info)
 def _create_synthetic_matches(
     filepath: Path,
     permuted_parameters: types.PermutedMatchesParameters,
-) -> Matches:
-    matches = Matches(pd.read_csv(filepath))
+    seed: int,
+) -> Iterator[Matches]:
+    """
+    Yields the matches of one permutation ("0", "1", ...) at a time.
+
+    Each permutation is seeded separately, so it does not depend on
+    `num_permutations` (e.g. the first 100 are the same with 1000).
+    """
+    parallel.seed_all(parallel.job_seed(seed, filepath.stem))
+    matches = Matches(st.read_df(filepath))
 
     scheduler_factory = Scheduler(matches, sch.circle_method.create_double_rr)
     scheduler = scheduler_factory.get_current_year_scheduler()
-
-    num_permutations = permuted_parameters["num_permutations"]
     permutations_creator = MatchesPermutations(matches, scheduler)
-    return permutations_creator.create_n_permutations(num_permutations)
+
+    for perm_id in map(str, range(permuted_parameters["num_permutations"])):
+        parallel.seed_all(parallel.job_seed(seed, filepath.stem, perm_id))
+        yield permutations_creator.create_n_permutations([perm_id])
 
 
 def create_and_save_permuted_matches(
     config: types.PermutedConfig,
     read_directory: Path,
     save_directory: Path,
+    storage: st.StorageFormat = "csv",
+    use_cache: bool = False,
 ) -> None:
+    """
+    Each sport is seeded separately, so its permutations do not depend on
+    which other sports are created (or skipped because they are cached).
+
+    Permutations are saved as soon as they are created (one at a time).
+    """
     permuted_config = config["matches"]
 
     if not permuted_config["should_create_it"]:
         return
 
-    random.seed(permuted_config["seed"])
-    nprandom.seed(permuted_config["seed"])
+    cache_config = {k: permuted_config[k] for k in ("seed", "parameters")}
+    cache = StageCache(save_directory, cache_config, storage) if use_cache else None
 
-    fn_kwargs = {"permuted_parameters": permuted_config["parameters"]}
-    filename_to_matches = utils.run_for_all_filenames(
+    fn_kwargs = {
+        "permuted_parameters": permuted_config["parameters"],
+        "seed": permuted_config["seed"],
+    }
+    filename_to_blocks = utils.run_for_all_filenames(
         _create_synthetic_matches,
         config["sports"],
         read_directory,
+        storage=storage,
+        cache=cache,
         **fn_kwargs,
     )
 
-    utils.save_filename_to_df(filename_to_matches, save_directory)
+    utils.save_filename_to_blocks(filename_to_blocks, save_directory, storage, cache)
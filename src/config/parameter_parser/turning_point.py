@@ -1,18 +1,19 @@
+from itertools import product
 from pathlib import Path
 
-import pandas as pd
-
 import turning_point.metric_stats as ms
 import turning_point.normal_coefficient as nc
 from logs import log, turning_logger
 
+from .. import storage as st
 from .. import types
 from . import utils
+from .cache import StageCache
 
 
 @log(turning_logger.info)
 def _calculate_turning_point(filepath: Path) -> nc.TurningPoint:
-    var_stats = ms.ExpandingMetricStats(pd.read_csv(filepath))
+    var_stats = ms.ExpandingMetricStats(st.read_df(filepath))
     return nc.TurningPoint.from_expanding_var_stats(var_stats)
 
 
@@ -20,6 +21,8 @@ def calculate_and_save_turning_points(
     config: types.RealConfig | types.PermutedConfig,
     read_directory: Path,
     save_directory: Path,
+    storage: st.StorageFormat = "csv",
+    use_cache: bool = False,
 ) -> None:
     tp_config = config["turning_point"]
 
@@ -28,15 +31,21 @@ def calculate_and_save_turning_points(
 
     quantiles = utils.parse_value_or_iterable(tp_config["quantile"])
     metrics = utils.parse_value_or_iterable(tp_config["metric"])
+    point_systems = utils.parse_point_systems(tp_config["parameters"])
+
+    for system, quantile, metric in product(point_systems, quantiles, metrics):
+        read_dir = utils.get_stats_directory(read_directory, system, quantile, metric)
+        save_dir = utils.get_stats_directory(save_directory, system, quantile, metric)
+
+        cache_config = {"quantile": quantile, "metric": metric}
+        cache = StageCache(save_dir, cache_config, storage) if use_cache else None
+
+        filename_to_tp = utils.run_for_all_filenames(
+            _calculate_turning_point,
+            config["sports"],
+            read_dir,
+            storage=storage,
+            cache=cache,
+        )
 
-    for quantile in quantiles:
-        for metric in metrics:
-            read_dir = read_directory / str(quantile) / metric
-            filename_to_tp = utils.run_for_all_filenames(
-                _calculate_turning_point,
-                config["sports"],
-                read_dir,
-            )
-
-            save_dir = save_directory / str(quantile) / metric
-            utils.save_filename_to_df(filename_to_tp, save_dir)
+        utils.save_filename_to_df(filename_to_tp, save_dir, storage, cache)
@@ -1,9 +1,13 @@
 from pathlib import Path
-from typing import Callable, Iterable, Protocol, TypeVar
+from typing import Callable, Iterable, Mapping, Protocol, TypeVar
 
 import pandas as pd
 
-from logs import turning_logger
+from logs import log_iterations, turning_logger
+
+from .. import storage as st
+from .. import types
+from .cache import StageCache
 
 T = TypeVar("T")
 
@@ -30,6 +34,37 @@ def parse_value_or_iterable(parameter: T | Iterable[T]) -> list[T]:
     return list(parameter)
 
 
+def parse_point_systems(parameters: types.TurningPointParameters) -> list[str | None]:
+    """
+    ----
+    Returns:
+        list[str | None]
+            Names of the point systems in `parameters["point_systems"]`
+            or [None] if there are none (only `winner_to_points`).
+    """
+    point_systems = parameters.get("point_systems")
+
+    if not point_systems:
+        return [None]
+
+    return list(point_systems)
+
+
+def get_stats_directory(
+    directory: Path, point_system: str | None, quantile: float, metric: str
+) -> Path:
+    """
+    Directory of metric stats (and turning points) of a
+    (point system, quantile, metric):
+        "{directory}/{quantile}/{metric}" or
+        "{directory}/{point_system}/{quantile}/{metric}"
+    """
+    if point_system is not None:
+        directory = directory / point_system
+
+    return directory / str(quantile) / metric
+
+
 FnInput, FnOutput = TypeVar("FnInput"), TypeVar("FnOutput")
 Fn = Callable[[Path, FnInput], FnOutput]
 
@@ -42,6 +77,8 @@ def run_for_all_filenames(
     filenames: str | list[str],
     read_directory: Path,
     *fn_args,
+    storage: st.StorageFormat = "csv",
+    cache: StageCache | None = None,
     **fn_kwargs,
 ) -> DecoratedFn:
     """
@@ -64,6 +101,14 @@ def run_for_all_filenames(
 
         read_directory: Path
             Where filenames should be read from.
+
+        storage: StorageFormat = "csv"
+            Preferred file format. Files in other formats are used if
+            there is no file in the preferred one.
+
+        cache: StageCache | None = None
+            If given, filenames whose output is fresh are skipped
+            (they are not in the returned dict).
     ----
     Returns:
         dict[str, FnOutput]
@@ -73,10 +118,14 @@ def run_for_all_filenames(
 
     for filename in parse_value_or_iterable(filenames):
 
-        filepath = read_directory / f"{filename}.csv"
+        filepath = st.find_filepath(read_directory, filename, storage)
 
-        if not filepath.exists():
-            turning_logger.warning(f"No file: {filepath}")
+        if filepath is None:
+            turning_logger.warning(f"No file: {read_directory / filename}")
+            continue
+
+        if cache is not None and cache.is_fresh(filename, filepath):
+            turning_logger.info(f"Cached: {cache.save_dir / filename}")
             continue
 
         filename_to_result[filename] = fn(filepath, *fn_args, **fn_kwargs)
@@ -91,6 +140,8 @@ class DfContainer(Protocol):
 def save_filename_to_df(
     filename_to_df_container: dict[str, DfContainer],
     save_dir: Path,
+    storage: st.StorageFormat = "csv",
+    cache: StageCache | None = None,
 ) -> None:
     """
     Saves all dataframes.
@@ -104,8 +155,63 @@ def save_filename_to_df(
 
         save_dir: Path
             Where to save the dataframe to.
+
+        storage: StorageFormat = "csv"
+            File format: "csv", "parquet" or "feather".
+
+        cache: StageCache | None = None
+            If given, its manifest is updated after each dataframe is saved.
     """
     save_dir.mkdir(parents=True, exist_ok=True)
 
     for filename, container in filename_to_df_container.items():
-        container.df.to_csv(save_dir / f"{filename}.csv")
+        st.write_df(container.df, st.get_filepath(save_dir, filename, storage))
+
+        if cache is not None:
+            cache.commit(filename)
+
+
+def save_filename_to_blocks(
+    filename_to_blocks: Mapping[str, Iterable[DfContainer]],
+    save_dir: Path,
+    storage: st.StorageFormat = "csv",
+    cache: StageCache | None = None,
+) -> None:
+    """
+    Same as `save_filename_to_df` (with all blocks of a filename concatenated),
+    but each block is appended to the file as soon as it is created.
+
+    Blocks are consumed lazily (e.g. generators from `run_for_all_filenames`),
+    so only one block is in memory at a time. If an error interrupts a
+    filename, its finished blocks remain in "{filename}.partial" and the
+    cache is not updated.
+
+    ---
+    Parameters:
+        filename_to_blocks: Mapping[
+            str,                   #: filename (only the stem, no suffix necessary)
+            Iterable[DfContainer]  #: blocks (`.df` must be the dataframe)
+        ]
+
+        save_dir: Path
+            Where to save the dataframes to.
+
+        storage: StorageFormat = "csv"
+            File format: "csv", "parquet" or "feather".
+
+        cache: StageCache | None = None
+            If given, its manifest is updated after each file is complete.
+    """
+    save_dir.mkdir(parents=True, exist_ok=True)
+
+    for filename, blocks in filename_to_blocks.items():
+        filepath = st.get_filepath(save_dir, filename, storage)
+
+        with st.DfAppender(filepath) as appender:
+            for container in log_iterations(blocks, turning_logger.debug):
+                appender.append(container.df)
+
+        turning_logger.info(f"Saved: {filepath}")
+
+        if cache is not None:
+            cache.commit(filename)
@@ -0,0 +1,315 @@
+"""
+Storage backends for every dataset (matches, stats and turning points).
+
+    csv: human-readable, default.
+    parquet / feather: columnar binary formats (require pyarrow).
+        Categorical "id" and integer "date number"/"final date" are preserved,
+        and reading supports column projection and predicate pushdown.
+
+Large files can be read in chunks (`iter_df_chunks`) and written one block
+at a time (`DfAppender`).
+"""
+
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+from typing import Iterator, Literal, Mapping, Sequence
+
+import pandas as pd
+
+StorageFormat = Literal["csv", "parquet", "feather"]
+
+FORMAT_TO_SUFFIX: dict[StorageFormat, str] = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+
+SUFFIX_TO_FORMAT: dict[str, StorageFormat] = {
+    suffix: storage for storage, suffix in FORMAT_TO_SUFFIX.items()
+}
+
+Filters = Mapping[str, Sequence]
+
+
+def _import_pyarrow(module: str = "pyarrow"):
+    try:
+        return importlib.import_module(module)
+    except ImportError as error:
+        message = "pyarrow is required to use 'parquet' or 'feather' storage."
+        raise ImportError(message) from error
+
+
+def _import_pyarrow_dataset():
+    return _import_pyarrow("pyarrow.dataset")
+
+
+def get_filepath(
+    directory: Path, filename: str, storage: StorageFormat = "csv"
+) -> Path:
+    return directory / f"{filename}{FORMAT_TO_SUFFIX[storage]}"
+
+
+def find_filepath(
+    directory: Path, filename: str, storage: StorageFormat = "csv"
+) -> Path | None:
+    """
+    Find `filename` in `directory` in any format.
+
+    `storage` is tried first, so inputs that were not created by this
+    project (e.g. real matches as csv) can still be found.
+
+    ----
+    Returns:
+        Path | None
+            None if no file exists.
+    """
+    other_formats = [other for other in FORMAT_TO_SUFFIX if other != storage]
+
+    for storage_format in [storage, *other_formats]:
+        filepath = get_filepath(directory, filename, storage_format)
+        if filepath.exists():
+            return filepath
+
+    return None
+
+
+def write_df(df: pd.DataFrame, filepath: Path) -> None:
+    """
+    Save `df` to `filepath`. Format is inferred from the suffix.
+
+    For binary formats, the index is saved as regular columns.
+    """
+    storage = SUFFIX_TO_FORMAT[filepath.suffix]
+
+    if storage == "csv":
+        df.to_csv(filepath)
+        return
+
+    _import_pyarrow_dataset()
+    flat_df = _flatten_df(df)
+
+    if storage == "parquet":
+        flat_df.to_parquet(filepath, index=False)
+    else:
+        flat_df.to_feather(filepath)
+
+
+def _flatten_df(df: pd.DataFrame) -> pd.DataFrame:
+    index_names = [name for name in df.index.names if name is not None]
+    return df.reset_index(index_names).reset_index(drop=True)
+
+
+def _filter_df(df: pd.DataFrame, filters: Filters) -> pd.DataFrame:
+    mask = pd.Series(True, index=df.index)
+    for column, values in filters.items():
+        mask &= df[column].isin(values)
+
+    return df[mask]
+
+
+def read_df(
+    filepath: Path,
+    columns: Sequence[str] | None = None,
+    filters: Filters | None = None,
+) -> pd.DataFrame:
+    """
+    Read a dataframe saved with `write_df`. Format is inferred from the suffix.
+
+    ----
+    Parameters:
+        filepath: Path
+            File to be read.
+
+        columns: Sequence[str] | None = None
+            Only read these columns (index columns included, e.g. "id").
+
+            If None, all columns are read.
+
+        filters: Mapping[str, Sequence] | None = None
+            Only read rows whose `column` value is in `values`.
+                Example: {"id": [...]} to read only some tournaments.
+
+            For binary formats, they are pushed down to the reader (row groups
+            that do not match are skipped).
+
+    ----
+    Returns:
+        pd.DataFrame
+            Flat dataframe (no index).
+    """
+    storage = SUFFIX_TO_FORMAT[filepath.suffix]
+
+    if storage == "csv":
+        df = pd.read_csv(filepath, usecols=columns)
+        return df if not filters else _filter_df(df, filters).reset_index(drop=True)
+
+    dataset = _import_pyarrow_dataset()
+
+    expression = None
+    for column, values in (filters or {}).items():
+        condition = dataset.field(column).isin(list(values))
+        expression = condition if expression is None else expression & condition
+
+    arrow_format = "parquet" if storage == "parquet" else "ipc"
+    table = dataset.dataset(filepath, format=arrow_format).to_table(
+        columns=None if columns is None else list(columns), filter=expression
+    )
+    return table.to_pandas()
+
+
+def iter_df_chunks(
+    filepath: Path,
+    chunk_size: int,
+    columns: Sequence[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Same as `read_df(filepath, columns)`, but read (and yielded) at most
+    `chunk_size` rows at a time, so the entire file is never in memory.
+
+    For binary formats, chunks are record batches and may be smaller than
+    `chunk_size` (they never span two row groups).
+    """
+    storage = SUFFIX_TO_FORMAT[filepath.suffix]
+
+    if storage == "csv":
+        with pd.read_csv(filepath, usecols=columns, chunksize=chunk_size) as reader:
+            yield from reader
+        return
+
+    dataset = _import_pyarrow_dataset()
+
+    arrow_format = "parquet" if storage == "parquet" else "ipc"
+    batches = dataset.dataset(filepath, format=arrow_format).to_batches(
+        columns=None if columns is None else list(columns), batch_size=chunk_size
+    )
+    for batch in batches:
+        yield batch.to_pandas()
+
+
+class DfAppender:
+    """
+    Save dataframes to a single file one block at a time (same layout as
+    `write_df` with all blocks concatenated), so they never have to be in
+    memory at the same time.
+
+    Blocks are written to "{filepath}.partial", which only replaces
+    `filepath` when the appender is closed. If an error interrupts the
+    writing (inside a `with` block), blocks that were already appended
+    remain in the partial file, but `filepath` is never left incomplete.
+
+    For binary formats, categorical columns share a single growing
+    dictionary (feather files cannot replace it between blocks).
+
+    Example:
+        with DfAppender(filepath) as appender:
+            for df in dfs:
+                appender.append(df)
+    """
+
+    def __init__(self, filepath: Path) -> None:
+        self.filepath = filepath
+        self.storage = SUFFIX_TO_FORMAT[filepath.suffix]
+        self.partial_path = filepath.with_name(f"{filepath.name}.partial")
+
+        self._writer = None
+        self._schema = None
+        self._categories: dict[str, pd.Index] = {}
+        self._num_blocks = 0
+
+    def __enter__(self) -> DfAppender:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def append(self, df: pd.DataFrame) -> None:
+        if self.storage == "csv":
+            is_first = self._num_blocks == 0
+            df.to_csv(self.partial_path, mode="w" if is_first else "a", header=is_first)
+        else:
+            self._append_binary(_flatten_df(df))
+
+        self._num_blocks += 1
+
+    def _extend_categories(self, flat_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Categories of every block start with the categories of the
+        previous ones (dictionaries only grow).
+        """
+        for column in flat_df.columns:
+            if not isinstance(flat_df[column].dtype, pd.CategoricalDtype):
+                continue
+
+            previous = self._categories.get(column, pd.Index([]))
+            current = flat_df[column].cat.categories
+            categories = previous.append(current.difference(previous, sort=False))
+
+            self._categories[column] = categories
+            flat_df[column] = flat_df[column].cat.set_categories(categories)
+
+        return flat_df
+
+    def _append_binary(self, flat_df: pd.DataFrame) -> None:
+        pa = _import_pyarrow()
+        table = pa.Table.from_pandas(
+            self._extend_categories(flat_df.copy()), preserve_index=False
+        )
+
+        if self._writer is None:
+            fields = [
+                (
+                    pa.field(
+                        field.name, pa.dictionary(pa.int32(), field.type.value_type)
+                    )
+                    if pa.types.is_dictionary(field.type)
+                    else field
+                )
+                for field in table.schema
+            ]
+            self._schema = pa.schema(fields, metadata=table.schema.metadata)
+            self._writer = self._open_writer(self._schema)
+
+        self._writer.write_table(table.cast(self._schema))
+
+    def _open_writer(self, schema):
+        if self.storage == "parquet":
+            parquet = _import_pyarrow("pyarrow.parquet")
+            return parquet.ParquetWriter(self.partial_path, schema)
+
+        ipc = _import_pyarrow("pyarrow.ipc")
+        options = ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        return ipc.new_file(self.partial_path, schema, options=options)
+
+    def close(self) -> None:
+        """
+        Finish writing. Nothing is saved if no block was appended.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        if self._num_blocks > 0:
+            self.partial_path.replace(self.filepath)
+
+    def abort(self) -> None:
+        """
+        Stop writing and keep the blocks written so far in the partial file
+        (which is still a valid file), without replacing `filepath`.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        self._num_blocks = 0
+
+    def discard(self) -> None:
+        """
+        Stop writing and remove everything written so far.
+        """
+        self.abort()
+        self.partial_path.unlink(missing_ok=True)
@@ -1,4 +1,6 @@
-from typing import Literal, Mapping, TypedDict
+from typing import Literal, Mapping, NotRequired, TypedDict
+
+from .storage import StorageFormat
 
 Sports = list[str]
 
@@ -37,11 +39,19 @@ class TurningPointParameters(TypedDict):
     num_iteration_simulation: list[int]
     winner_type = Literal["winner", "result"]
     winner_to_points = Mapping[str, tuple[float, float]]
+    engine = Literal["window", "incremental"] (optional key)
+    error_tolerance = float | None (optional key)
+    streaming = bool (optional key)
+    point_systems = Mapping[str, Mapping[str, tuple[float, float]]] (optional key)
     """
 
     num_iteration_simulation: list[int]
     winner_type: Literal["winner", "result"]
     winner_to_points: Mapping[str, tuple[float, float]]
+    engine: NotRequired[Literal["window", "incremental"]]
+    error_tolerance: NotRequired[float | None]
+    streaming: NotRequired[bool]
+    point_systems: NotRequired[Mapping[str, Mapping[str, tuple[float, float]]]]
 
 
 class TurningPointConfig(TypedDict):
@@ -158,8 +168,25 @@ class BradleyTerryConfig(TypedDict):
     turning_point: TurningPointConfig
 
 
+class ExecutionConfig(TypedDict, total=False):
+    """
+    Every key is optional.
+
+    num_workers: int
+    storage: Literal["csv", "parquet", "feather"]
+    use_cache: bool
+    chunk_size: int
+    """
+
+    num_workers: int
+    storage: StorageFormat
+    use_cache: bool
+    chunk_size: int
+
+
 class ConfigurationType(TypedDict):
     """
+    EXECUTION: ExecutionConfig (optional key)
     REAL_MATCHES: RealConfig
     PERMUTED_MATCHES: PermutedConfig
     OPTIMAL_SCHEDULE: OptimalConfig
@@ -167,6 +194,7 @@ class ConfigurationType(TypedDict):
     DIFFERENT_QUANTILE: RealConfig
     """
 
+    EXECUTION: NotRequired[ExecutionConfig]
     REAL_MATCHES: RealConfig
     PERMUTED_MATCHES: PermutedConfig
     OPTIMAL_SCHEDULE: OptimalConfig
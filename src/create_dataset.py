@@ -18,6 +18,11 @@ def main() -> None:
     opt_cfg = configuration["OPTIMAL_SCHEDULE"]
     diff_cfg = configuration["DIFFERENT_POINT_SYSTEM"]
     bt_cfg = configuration["BRADLEY_TERRY"]
+    execution_cfg = configuration.get("EXECUTION", {})
+    num_workers = execution_cfg.get("num_workers", 1)
+    storage = execution_cfg.get("storage", "csv")
+    use_cache = execution_cfg.get("use_cache", False)
+    chunk_size = execution_cfg.get("chunk_size", parser.metrics.CHUNK_SIZE)
 
     # SYNTHETIC MATCHES
     #   Permutation Matches
@@ -25,6 +30,8 @@ def main() -> None:
         config=perm_cfg,
         read_directory=path.MATCHES_PATH,
         save_directory=path.PERMUTED_MATCHES_PATH,
+        storage=storage,
+        use_cache=use_cache,
     )
 
     #   Optimal Schedule
@@ -32,12 +39,16 @@ def main() -> None:
         config=opt_cfg,
         read_directory=path.MATCHES_PATH,
         save_directory=path.OPTIMAL_MATCHES_PATH,
+        storage=storage,
+        use_cache=use_cache,
     )
 
     #   Optimal Schedule Validation
     parser.bradley_terry.create_and_save_bradltey_terry_matches(
         config=bt_cfg,
         save_directory=path.BT_MATCHES_PATH,
+        storage=storage,
+        use_cache=use_cache,
     )
 
     # COEFFICIENTS
@@ -50,7 +61,13 @@ def main() -> None:
         (bt_cfg, path.BT_MATCHES_PATH, path.BT_STATS_PATH),
     ]
     for variance_parameters in var_config_read_dir_save_dir:
-        parser.metrics.calculate_and_save_metric_stats(*variance_parameters)
+        parser.metrics.calculate_and_save_metric_stats(
+            *variance_parameters,
+            num_workers=num_workers,
+            storage=storage,
+            use_cache=use_cache,
+            chunk_size=chunk_size,
+        )
 
     #   Turning Point
     tp_config_read_dir_save_dir = [
@@ -61,7 +78,9 @@ def main() -> None:
         (bt_cfg, path.BT_STATS_PATH, path.BT_TURNING_POINT_PATH),
     ]
     for turning_parameters in tp_config_read_dir_save_dir:
-        parser.turning_point.calculate_and_save_turning_points(*turning_parameters)
+        parser.turning_point.calculate_and_save_turning_points(
+            *turning_parameters, storage=storage, use_cache=use_cache
+        )
 
 
 if __name__ == "__main__":
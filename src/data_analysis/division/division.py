@@ -3,8 +3,10 @@ from typing import Protocol, TypeVar
 
 import pandas as pd
 
+from turning_point.permutation_coefficient import TournamentIdentifiers
+
 REGEX_COLUMNS = ["name", "sport", "country"]
-NAME_SPORT_COUNTRY_REGEX = r"(.+?)@/(.+?)/(.+?)/.+"
+IDENTIFIER_COLUMNS = ["tournament", "sport", "country"]
 
 
 class ContainDF(Protocol):
@@ -76,13 +78,16 @@ class Division:
             id_index = id_index.index
         id_index = id_index.get_level_values("id")
 
-        extracted_names = id_index.str.extract(NAME_SPORT_COUNTRY_REGEX)
-        name_sport_country = extracted_names.set_axis(REGEX_COLUMNS, axis="columns")
-        to_expand_index = pd.MultiIndex.from_frame(name_sport_country)
+        # divisions are looked up once per distinct id
+        identifiers = TournamentIdentifiers.from_index(id_index)
+        name_sport_country = identifiers.parsed[IDENTIFIER_COLUMNS].astype(object)
+        to_expand_index = pd.MultiIndex.from_frame(
+            name_sport_country, names=REGEX_COLUMNS
+        )
 
         expanded_division = self.df.loc[to_expand_index]
-        mask_index = expanded_division["division"].isin(set(division))
-        return id_index[mask_index].unique().to_list()
+        is_division = expanded_division["division"].isin(set(division)).to_numpy()
+        return id_index[is_division[identifiers.codes]].unique().to_list()
 
     def filter_divisions(
         self, sport_to_df: dict[str, pd.DataFrame], division: int | list[int]
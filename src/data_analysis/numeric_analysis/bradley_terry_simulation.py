@@ -58,14 +58,14 @@ def run_bradley_terry_simulations(
         )
         matches = Matches(pd.concat(matches_df_list))
 
+        # both quantiles from the same simulations
         _set_seed(seed_)
-        parameters = {"num_iteration_simulation": (10, 100), "quantile": 0.05}
-        expanding_var = ExpandingMetricStats.from_matches(matches, **parameters)
-        various_stats_lower[num_simulation] = expanding_var.df
+        parameters = {"num_iteration_simulation": (10, 100), "quantile": [0.05, 0.95]}
+        expanding_stats = ExpandingMetricStats.from_matches(matches, **parameters)
 
-        _set_seed(seed_)
-        parameters = {"num_iteration_simulation": (10, 100), "quantile": 0.95}
-        expanding_var = ExpandingMetricStats.from_matches(matches, **parameters)
+        various_stats_lower[num_simulation] = expanding_stats.select_quantile(0.05).df
+
+        expanding_var = expanding_stats.select_quantile(0.95)
         various_stats[num_simulation] = expanding_var.df
 
         turning_point = TurningPoint.from_expanding_var_stats(expanding_var)
@@ -1,13 +1,29 @@
+import numpy as np
 import pandas as pd
 
 from turning_point.normal_coefficient import TurningPoint
+from turning_point.permutation_coefficient import TournamentIdentifiers
 
+# "{label}@result_{result_id}" (id without the permutation)
+RESULT_REGEX = r".+?@result_(.+)"
 
-def _create_result_regex(result_id: str, permutation: str) -> str:
-    return rf".+?@result_{result_id}@{permutation}"
 
+def _get_result_ids(identifiers: TournamentIdentifiers) -> np.ndarray:
+    """
+    Result id of each label ("{label}@result_{result_id}@{permutation}").
+    """
+    base_ids = identifiers.parsed["base id"].astype(str)
+    unique_result_ids = base_ids.str.extract(RESULT_REGEX, expand=False)
+
+    return unique_result_ids.to_numpy()[identifiers.codes]
 
-def _extract_tp_results(df: pd.DataFrame, result_id: str):
+
+def _extract_tp_results(
+    df: pd.DataFrame,
+    result_id: str,
+    identifiers: TournamentIdentifiers,
+    result_ids: np.ndarray,
+):
     """
     ----
     Returns:
@@ -17,18 +33,17 @@ def _extract_tp_results(df: pd.DataFrame, result_id: str):
             pd.DataFrame,  # result for optimal recursive schedule
         ]
     """
+    is_result = result_ids == result_id
 
-    def _filter_specific_result(df: pd.DataFrame, regex: str) -> pd.DataFrame:
-        return df[df.index.get_level_values("id").str.fullmatch(regex)]
-
-    permutations_regex = _create_result_regex(result_id, permutation="\d+")
-    permutations_tp = _filter_specific_result(df, permutations_regex)
+    permutations = identifiers.parsed["permutation"].astype(str)
+    is_random = permutations.str.fullmatch(r"\d+").to_numpy()[identifiers.codes]
+    permutations_tp = df[is_result & is_random]
 
-    graph_regex = _create_result_regex(result_id, permutation="graph_optimal")
-    graph_optimal_tp = _filter_specific_result(df, graph_regex)
+    is_graph = identifiers.isin("permutation", ["graph_optimal"])
+    graph_optimal_tp = df[is_result & is_graph]
 
-    recursive_regex = _create_result_regex(result_id, permutation="recusive_optimal")
-    recursive_optimal_tp = _filter_specific_result(df, recursive_regex)
+    is_recursive = identifiers.isin("permutation", ["recusive_optimal"])
+    recursive_optimal_tp = df[is_result & is_recursive]
 
     return permutations_tp, graph_optimal_tp, recursive_optimal_tp
 
@@ -59,14 +74,16 @@ def _optimal_tp_diff_stats(series: pd.Series, key: str) -> dict[str, float]:
 
 def _get_validation_summary_one_file(df: pd.DataFrame, tp_column: str) -> pd.DataFrame:
 
-    extract_results_regex = _create_result_regex(result_id="(.+?)", permutation=".+")
-    unique_values = df.index.str.extract(extract_results_regex, expand=False).unique()
+    identifiers = TournamentIdentifiers.from_index(df)
+    result_ids = _get_result_ids(identifiers)
 
     all_results = []
 
-    for result_id in unique_values:
+    for result_id in pd.unique(result_ids[pd.notna(result_ids)]):
 
-        permutations, graph_opt, recursive_opt = _extract_tp_results(df, result_id)
+        permutations, graph_opt, recursive_opt = _extract_tp_results(
+            df, result_id, identifiers, result_ids
+        )
 
         bt_df = pd.concat(
             {
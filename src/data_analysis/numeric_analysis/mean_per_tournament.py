@@ -1,6 +1,7 @@
 import pandas as pd
 
-NAME_COUNTRY_REGEX = r"(.+?)@/.+?/(.+?)/.+"
+from turning_point.permutation_coefficient import TournamentIdentifiers
+
 NAME_COUNTRY = ["name", "country"]
 
 
@@ -19,8 +20,12 @@ def get_mean_per_tournament(
     for sport, comparison in sport_to_comparison.items():
         tps = comparison[desired_columns]
 
-        name_country = tps.index.str.extract(NAME_COUNTRY_REGEX)
-        new_index = pd.MultiIndex.from_frame(name_country, names=NAME_COUNTRY)
+        name_country = TournamentIdentifiers.from_index(tps.index).to_frame(
+            ["tournament", "country"]
+        )
+        new_index = pd.MultiIndex.from_frame(
+            name_country.astype(object), names=NAME_COUNTRY
+        )
 
         with pd.option_context("mode.use_inf_as_na", True):
             mean_per_tournament = (
@@ -4,6 +4,8 @@ import numpy as np
 import pandas as pd
 from scipy.stats import linregress, theilslopes
 
+from turning_point.permutation_coefficient import TournamentIdentifiers
+
 
 def _get_linear_regression_slope(y: pd.Series) -> float:
     return linregress(np.arange(len(y)), y).slope
@@ -14,8 +16,20 @@ def _get_theil_slope(y: pd.Series) -> float:
 
 
 def _calculate_tendecy_all_tournaments(turning_point: pd.Series) -> pd.DataFrame:
-    regex_tournament_id = r"(.+?@/.+?/.+?/).+"
-    tournament_id = turning_point.index.str.extract(regex_tournament_id, expand=False)
+    identifiers = TournamentIdentifiers.from_index(turning_point.index)
+    tournament_levels = identifiers.parsed[["tournament", "sport", "country"]]
+
+    # "{current_name}@/{sport}/{country}/" of each distinct id
+    name, sport, country = (
+        tournament_levels[col].astype(str) for col in tournament_levels
+    )
+    unique_tournament_ids = (name + "@/" + sport + "/" + country + "/").where(
+        tournament_levels.notna().all(axis="columns")
+    )
+    tournament_id = pd.Index(
+        unique_tournament_ids.to_numpy()[identifiers.codes],
+        name=turning_point.index.name,
+    )
 
     tendency = pd.concat(
         [
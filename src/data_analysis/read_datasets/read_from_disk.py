@@ -8,6 +8,7 @@ import turning_point.metric_stats as ms
 import turning_point.normal_coefficient as nc
 import turning_point.permutation_coefficient as pc
 from config import path
+from config import storage as st
 
 Sport = Literal["basketball", "soccer", "handball", "volleyball"] | str
 
@@ -61,6 +62,9 @@ def read_as_dicts(
     dataset_keys: Key | Sequence[Key] | None = None,
     quantile: float = 0.95,
     metric: str = "variance",
+    storage: st.StorageFormat = "parquet",
+    columns: Sequence[str] | None = None,
+    filters: st.Filters | None = None,
 ) -> dict[Key, dict[Sport, ContainDF]]:
     """
     Read desired dataset information from disk.
@@ -99,6 +103,22 @@ def read_as_dicts(
 
         metric: str = "variance"
             Desired metric.
+
+        storage: StorageFormat = "parquet"
+            Preferred file format ("csv", "parquet" or "feather"). Files in
+            other formats are used if there is no file in the preferred one.
+
+        columns: Sequence[str] | None = None
+            Only read these columns. Index columns ("id", "date number",
+            "final date") must be included.
+
+            If None, all columns are read.
+
+        filters: Mapping[str, Sequence] | None = None
+            Only read rows whose `column` value is in `values`.
+                Example: {"id": [...]} to read only some tournaments.
+
+            For parquet/feather, they are pushed down to the reader.
     ----
     Returns:
         dict[Key, dict[Sport, <Desired Data>]]
@@ -123,9 +143,9 @@ def read_as_dicts(
         sport_to_data = {}
 
         for sport in sports:
-            path = dir_ / f"{sport}.csv"
-            if path.exists():
-                sport_to_data[sport] = class_(pd.read_csv(path))
+            path = st.find_filepath(dir_, sport, storage)
+            if path is not None:
+                sport_to_data[sport] = class_(st.read_df(path, columns, filters))
 
         key_to_sport_to_data[key] = sport_to_data
 
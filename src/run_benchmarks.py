@@ -0,0 +1,94 @@
+import argparse
+import fnmatch
+import logging
+import sys
+from pathlib import Path
+
+import benchmarks as bm
+from logs import turning_logger
+
+LOG_LEVEL = logging.WARNING
+
+RESULTS_PATH = Path("../benchmark_results")
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time the turning point pipeline hot paths.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--num-teams", type=int, default=20)
+    parser.add_argument("--number-of-drr", type=int, default=1)
+    parser.add_argument("--num-permutations", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--num-iteration-simulation", type=int, nargs=2, default=[1, 100]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--filter", default="*", help="Only run benchmarks matching this pattern."
+    )
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH / "latest.json")
+    parser.add_argument("--baseline", type=Path, default=RESULTS_PATH / "baseline.json")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Also save results as the new baseline.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown (median) considered a regression.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    turning_logger.setLevel(LOG_LEVEL)
+    args = _parse_arguments()
+
+    dataset = bm.BenchmarkDataset(
+        num_teams=args.num_teams,
+        number_of_drr=args.number_of_drr,
+        num_permutations=args.num_permutations,
+        seed=args.seed,
+    )
+    num_iteration_simulation = tuple(args.num_iteration_simulation)
+
+    results: dict[str, bm.Timing] = {}
+    for name, fn in bm.iterate_cases(dataset, num_iteration_simulation):
+        if not fnmatch.fnmatch(name, args.filter):
+            continue
+
+        results[name] = bm.time_fn(fn, repeat=args.repeat)
+        print(f"{name:<40} {results[name].median:.4f}s", file=sys.stderr)
+
+    metadata = {
+        "dataset": dataset.to_dict(),
+        "num_iteration_simulation": list(num_iteration_simulation),
+        "environment": bm.get_environment(),
+    }
+    bm.save_results(args.output, results, metadata)
+
+    if not args.baseline.exists():
+        print(f"No baseline: {args.baseline}")
+        if args.save_baseline:
+            bm.save_results(args.baseline, results, metadata)
+        return 0
+
+    baseline, baseline_metadata = bm.load_results(args.baseline)
+    if baseline_metadata.get("dataset") != metadata["dataset"]:
+        print("Warning: baseline was created with a different dataset.")
+
+    comparisons = bm.compare_results(results, baseline, args.threshold)
+    print(bm.format_report(comparisons))
+
+    if args.save_baseline:
+        bm.save_results(args.baseline, results, metadata)
+
+    return 1 if bm.has_regression(comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
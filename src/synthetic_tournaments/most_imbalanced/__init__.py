@@ -1,9 +1,11 @@
 from .most_imbalanced_tournament import (
+    TeamRanks,
     build_most_imbalanced_tournament,
     build_most_imbalanced_tournament_one_id,
 )
 
 __all__ = [
+    "TeamRanks",
     "build_most_imbalanced_tournament_one_id",
     "build_most_imbalanced_tournament",
 ]
@@ -1,41 +1,78 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
 import numpy as np
 import pandas as pd
 
 import tournament_simulations.data_structures as ds
 
 
-def build_most_imbalanced_tournament_one_id(ppm_df: pd.DataFrame) -> pd.DataFrame:
-    def _get_indexes_team(_team):
+@dataclass
+class TeamRanks:
+    """
+    Rank of each team inside its tournament (id), in the order used to build
+    the most imbalanced tournament: ascending number of matches, ties broken
+    by team order.
+
+        ids: pd.Index
+            All tournaments (sorted).
+
+        id_codes: np.ndarray[int] (number of rows,)
+            Position of each row's tournament in `ids`.
+
+        ranks: np.ndarray[int] (number of rows,)
+            Rank (0, ..., number of teams - 1) of each row's team.
+
+        num_teams: np.ndarray[int] (number of ids,)
+            Number of teams in each tournament.
+
+    Rows are in the same order as PointsPerMatch (each match is a pair of rows:
+    home team and then away team).
+    """
+
+    ids: pd.Index
+    id_codes: np.ndarray
+    ranks: np.ndarray
+    num_teams: np.ndarray
+
+    @property
+    def opponent_ranks(self) -> np.ndarray:
         """
-        Get indexes (integers) where df['team'] == team.
+        Rank of the adversary in each row.
         """
-        return np.nonzero((ppm_df["team"] == _team).to_numpy())[0]
+        return self.ranks.reshape(-1, 2)[:, ::-1].reshape(-1)
 
-    def _set_match_results(_indexes):
-        """
-        3: in the indexes for `team`
-        0: in the indexes for the adversary
-            team_index + 1 for even team_index
-            team_index - 1 for odd team_index
+    @classmethod
+    def from_points_per_match(cls, ppm: pd.DataFrame | ds.PointsPerMatch) -> TeamRanks:
+        if isinstance(ppm, ds.PointsPerMatch):
+            ppm = ppm.df
 
-        """
-        points[_indexes] = 3
+        id_codes, ids = pd.factorize(ppm.index.get_level_values("id"), sort=True)
+        team_codes = pd.Categorical(ppm["team"]).codes.astype(np.int64)
 
-        _even_indexes = _indexes[_indexes % 2 == 0]
-        points[_even_indexes + 1] = 0
+        # Slot: (id, team) pair
+        num_team_codes = team_codes.max(initial=0) + 1
+        slot_keys = id_codes.astype(np.int64) * num_team_codes + team_codes
+        unique_slot_keys, row_slots = np.unique(slot_keys, return_inverse=True)
+        slot_id_codes = unique_slot_keys // num_team_codes
 
-        _odd_indexes = _indexes[_indexes % 2 != 0]
-        points[_odd_indexes - 1] = 0
+        num_matches = np.bincount(row_slots, minlength=len(unique_slot_keys))
+        slot_order = np.lexsort((unique_slot_keys, num_matches, slot_id_codes))
 
-    points = np.zeros_like(ppm_df["team"])
-    teams = ppm_df.groupby("team", observed=True).size().sort_values()
+        num_teams = np.bincount(slot_id_codes, minlength=len(ids))
+        first_slot = np.cumsum(num_teams) - num_teams
 
-    for team in teams.index:
-        indexes = _get_indexes_team(team)
-        _set_match_results(indexes)
+        slot_ranks = np.empty(len(slot_order), dtype=np.int64)
+        slot_ranks[slot_order] = (
+            np.arange(len(slot_order)) - first_slot[slot_id_codes[slot_order]]
+        )
 
-    data = {"team": ppm_df["team"], "point": points}
-    return pd.DataFrame(data, index=ppm_df.index)
+        return cls(ids, id_codes, slot_ranks[row_slots.reshape(-1)], num_teams)
+
+
+def build_most_imbalanced_tournament_one_id(ppm_df: pd.DataFrame) -> pd.DataFrame:
+    return build_most_imbalanced_tournament(ppm_df)
 
 
 def build_most_imbalanced_tournament(
@@ -46,10 +83,16 @@ def build_most_imbalanced_tournament(
         Team that played the most amount of matches: win all matches
         Team that played the second most amount of matches: win all matches (except for the previous team)
         ...
+
+    That is, each match is won (3 points) by the team with the highest rank
+    (see `TeamRanks`), so all tournaments are built at once.
     """
     df = ppm
     if isinstance(ppm, ds.PointsPerMatch):
         df = ppm.df
 
-    build_one_id_fn = build_most_imbalanced_tournament_one_id
-    return df.groupby("id", observed=True).apply(build_one_id_fn)
+    team_ranks = TeamRanks.from_points_per_match(df)
+    points = np.where(team_ranks.ranks > team_ranks.opponent_ranks, 3, 0)
+
+    data = {"team": df["team"], "point": points}
+    return pd.DataFrame(data, index=df.index)
@@ -3,6 +3,11 @@ from .recursive_optimal_schedule import (
     generate_optimal_schedule_between_groups,
     generate_recursive_optimal_schedule,
 )
+from .template_cache import (
+    ScheduleTemplate,
+    get_schedule_template,
+    with_template_cache,
+)
 from .types import OptimalFn
 
 __all__ = [
@@ -10,4 +15,7 @@ __all__ = [
     "generate_recursive_optimal_schedule",
     "generate_optimal_schedule_between_groups",
     "OptimalFn",
+    "ScheduleTemplate",
+    "get_schedule_template",
+    "with_template_cache",
 ]
@@ -1,31 +1,31 @@
 from itertools import combinations
 from typing import Callable, Iterable, Sequence
 
-import networkx as nx
+import numpy as np
 
+from .max_weight_matching import max_weight_matching
 from .utils import Round
 
 
-def _create_weighted_graph(
+def _create_weight_matrix(
     strengths: Iterable[float], skill_diff_fn: Callable[[float, float], float]
-) -> nx.Graph:
+) -> np.ndarray:
     """
     Weights: skill discrepancy between the teams.
+
+    weights[i, j] = weights[j, i] = skill_diff_fn(strengths[i], strengths[j]), i < j
     """
-    team_ids = list(range(len(strengths)))
+    num_teams = len(strengths)
+    weights = np.zeros((num_teams, num_teams))
 
-    matches = combinations(team_ids, r=2)
-    matches_and_skill_diff = (
-        (home, away, skill_diff_fn(strengths[home], strengths[away]))
-        for home, away in matches
-    )
+    for home, away in combinations(range(num_teams), r=2):
+        skill_diff = skill_diff_fn(strengths[home], strengths[away])
+        weights[home, away] = weights[away, home] = skill_diff
 
-    graph = nx.Graph()
-    graph.add_weighted_edges_from(matches_and_skill_diff)
-    return graph
+    return weights
 
 
-def _sort_round(graph: nx.Graph, matches: Round):
+def _sort_round(weights: np.ndarray, matches: Round):
     """
     Sort priority:
         - Largest skill discrepancy
@@ -33,7 +33,7 @@ def _sort_round(graph: nx.Graph, matches: Round):
     """
 
     def _extract_weight(edge: tuple[int, int]) -> float:
-        return graph.get_edge_data(*edge)["weight"]
+        return weights[edge]
 
     best_as_home = (tuple(sorted(match)) for match in matches)
     sorted_by_best = sorted(best_as_home, key=lambda match: match[0])
@@ -82,14 +82,18 @@ def generate_optimal_graph_schedule(
         return [tuple()]
 
     strengths = sorted(strengths, reverse=True)
-    graph = _create_weighted_graph(strengths, skill_diff_fn)
+    weights = _create_weight_matrix(strengths, skill_diff_fn)
+
+    # remaining matches (complete graph without self-loops)
+    is_edge = ~np.eye(len(strengths), dtype=bool)
 
     schedule = []
 
-    while graph.edges:
-        next_round = nx.matching.max_weight_matching(graph)
-        schedule.append(_sort_round(graph, next_round))
+    while is_edge.any():
+        next_round = max_weight_matching(weights, is_edge)
+        schedule.append(_sort_round(weights, next_round))
 
-        graph.remove_edges_from(next_round)
+        for home, away in next_round:
+            is_edge[home, away] = is_edge[away, home] = False
 
     return schedule
@@ -0,0 +1,553 @@
+"""
+Maximum weight matching of a dense graph (weight matrix).
+
+Port of `networkx.max_weight_matching` (Edmonds' blossom algorithm, by
+Joris van Rantwijk; networkx is BSD-3-Clause licensed) where the graph is a
+symmetric weight matrix and a boolean edge mask instead of an `nx.Graph`.
+
+Vertices and neighbors are visited in the same order as in an `nx.Graph` whose
+edges were added in ascending order (e.g. `combinations(range(n), r=2)`), so the
+returned matching is the same.
+"""
+
+from __future__ import annotations
+
+from itertools import repeat
+
+import numpy as np
+
+
+class _NoNode:
+    """Dummy value which is different from any node."""
+
+
+class _Blossom:
+    """
+    Representation of a non-trivial blossom or sub-blossom.
+
+        childs: list[int | _Blossom]
+            Ordered list of sub-blossoms, starting with the base and going
+            round the blossom.
+
+        edges: list[tuple[int, int]]
+            edges[i] = (v, w) where v is a vertex in childs[i]
+            and w is a vertex in childs[i + 1].
+
+        mybestedges: list[tuple[int, int]] | None
+            Least-slack edges to neighboring S-blossoms (or None).
+    """
+
+    __slots__ = ["childs", "edges", "mybestedges"]
+
+    def leaves(self):
+        stack = [*self.childs]
+        while stack:
+            t = stack.pop()
+            if isinstance(t, _Blossom):
+                stack.extend(t.childs)
+            else:
+                yield t
+
+
+def max_weight_matching(
+    weights: np.ndarray, is_edge: np.ndarray
+) -> set[tuple[int, int]]:
+    """
+    Same as `nx.max_weight_matching(graph)` (maxcardinality=False), where
+    `graph` has vertices 0, ..., n - 1 and edges (i, j) with is_edge[i, j].
+
+    ----
+    Parameters:
+        weights: np.ndarray[float] (n, n)
+            Symmetric matrix with the weight of each edge.
+
+        is_edge: np.ndarray[bool] (n, n)
+            Symmetric matrix: whether each edge exists (diagonal is ignored).
+
+    ----
+    Returns:
+        set[tuple[int, int]]
+            Matched pairs (each pair appears only once).
+    """
+    num_vertices = len(weights)
+    gnodes = range(num_vertices)
+
+    if num_vertices == 0:
+        return set()
+
+    is_edge = is_edge & ~np.eye(num_vertices, dtype=bool)
+    neighbors = [np.flatnonzero(row).tolist() for row in is_edge]
+    weight = weights.astype(float).tolist()
+
+    edge_weights = weights[is_edge]
+    maxweight = max(0.0, float(edge_weights.max(initial=0)))
+
+    # mate[v] is the vertex to which v is matched (if any)
+    mate: dict[int, int] = {}
+
+    # label[b]: 1 (S-vertex/blossom), 2 (T-vertex/blossom) or None (unlabeled)
+    label: dict = {}
+
+    # labeledge[b] = (v, w): edge through which b obtained its label
+    labeledge: dict = {}
+
+    # inblossom[v]: top-level blossom to which vertex v belongs
+    inblossom: list = list(gnodes)
+
+    # blossomparent[b]: immediate sub-blossom of which b is a child (or None)
+    blossomparent: dict = dict(zip(gnodes, repeat(None)))
+
+    # blossombase[b]: base vertex of blossom b
+    blossombase: dict = dict(zip(gnodes, gnodes))
+
+    # bestedge[b]: least-slack edge to a different S-blossom (or None)
+    bestedge: dict = {}
+
+    # dualvar[v] = 2 * u(v): dual variable of each vertex
+    dualvar = [maxweight] * num_vertices
+
+    # blossomdual[b] = z(b): dual variable of each non-trivial blossom
+    blossomdual: dict = {}
+
+    # allowedge[(v, w)]: (v, w) is known to have zero slack
+    allowedge: dict = {}
+
+    # S-vertices to be scanned
+    queue: list[int] = []
+
+    def slack(v: int, w: int) -> float:
+        return dualvar[v] + dualvar[w] - 2 * weight[v][w]
+
+    def assign_label(w: int, t: int, v: int | None) -> None:
+        b = inblossom[w]
+        label[w] = label[b] = t
+
+        if v is not None:
+            labeledge[w] = labeledge[b] = (v, w)
+        else:
+            labeledge[w] = labeledge[b] = None
+
+        bestedge[w] = bestedge[b] = None
+
+        if t == 1:
+            if isinstance(b, _Blossom):
+                queue.extend(b.leaves())
+            else:
+                queue.append(b)
+        elif t == 2:
+            base = blossombase[b]
+            assign_label(mate[base], 1, base)
+
+    def scan_blossom(v, w):
+        """
+        Trace back from v and w to discover either a new blossom or an
+        augmenting path. Returns the base vertex of the new blossom or _NoNode.
+        """
+        path = []
+        base = _NoNode
+
+        while v is not _NoNode:
+            b = inblossom[v]
+            if label[b] & 4:
+                base = blossombase[b]
+                break
+
+            path.append(b)
+            label[b] = 5
+
+            if labeledge[b] is None:
+                v = _NoNode
+            else:
+                v = labeledge[b][0]
+                b = inblossom[v]
+                v = labeledge[b][0]
+
+            if w is not _NoNode:
+                v, w = w, v
+
+        for b in path:
+            label[b] = 1
+
+        return base
+
+    def add_blossom(base: int, v: int, w: int) -> None:
+        """
+        Construct a new blossom with given base, through S-vertices v and w.
+        """
+        bb = inblossom[base]
+        bv = inblossom[v]
+        bw = inblossom[w]
+
+        b = _Blossom()
+        blossombase[b] = base
+        blossomparent[b] = None
+        blossomparent[bb] = b
+
+        b.childs = path = []
+        b.edges = edgs = [(v, w)]
+
+        while bv != bb:
+            blossomparent[bv] = b
+            path.append(bv)
+            edgs.append(labeledge[bv])
+            v = labeledge[bv][0]
+            bv = inblossom[v]
+
+        path.append(bb)
+        path.reverse()
+        edgs.reverse()
+
+        while bw != bb:
+            blossomparent[bw] = b
+            path.append(bw)
+            edgs.append((labeledge[bw][1], labeledge[bw][0]))
+            w = labeledge[bw][0]
+            bw = inblossom[w]
+
+        label[b] = 1
+        labeledge[b] = labeledge[bb]
+        blossomdual[b] = 0
+
+        for v in b.leaves():
+            if label[inblossom[v]] == 2:
+                queue.append(v)
+            inblossom[v] = b
+
+        bestedgeto: dict = {}
+        for bv in path:
+            if isinstance(bv, _Blossom):
+                if bv.mybestedges is not None:
+                    nblist = bv.mybestedges
+                    bv.mybestedges = None
+                else:
+                    nblist = [(v, w) for v in bv.leaves() for w in neighbors[v]]
+            else:
+                nblist = [(bv, w) for w in neighbors[bv]]
+
+            for k in nblist:
+                i, j = k
+                if inblossom[j] == b:
+                    i, j = j, i
+
+                bj = inblossom[j]
+                if (
+                    bj != b
+                    and label.get(bj) == 1
+                    and ((bj not in bestedgeto) or slack(i, j) < slack(*bestedgeto[bj]))
+                ):
+                    bestedgeto[bj] = k
+
+            bestedge[bv] = None
+
+        b.mybestedges = list(bestedgeto.values())
+
+        mybestedge = None
+        mybestslack = None
+        bestedge[b] = None
+        for k in b.mybestedges:
+            kslack = slack(*k)
+            if mybestedge is None or kslack < mybestslack:
+                mybestedge = k
+                mybestslack = kslack
+
+        bestedge[b] = mybestedge
+
+    def expand_blossom(b: _Blossom, endstage: bool) -> None:
+        """
+        Expand the given top-level blossom.
+        """
+
+        def _recurse(b: _Blossom, endstage: bool):
+            for s in b.childs:
+                blossomparent[s] = None
+                if isinstance(s, _Blossom):
+                    if endstage and blossomdual[s] == 0:
+                        yield s
+                    else:
+                        for v in s.leaves():
+                            inblossom[v] = s
+                else:
+                    inblossom[s] = s
+
+            if (not endstage) and label.get(b) == 2:
+                entrychild = inblossom[labeledge[b][1]]
+                j = b.childs.index(entrychild)
+                if j & 1:
+                    j -= len(b.childs)
+                    jstep = 1
+                else:
+                    jstep = -1
+
+                v, w = labeledge[b]
+                while j != 0:
+                    if jstep == 1:
+                        p, q = b.edges[j]
+                    else:
+                        q, p = b.edges[j - 1]
+
+                    label[w] = None
+                    label[q] = None
+                    assign_label(w, 2, v)
+
+                    allowedge[(p, q)] = allowedge[(q, p)] = True
+                    j += jstep
+
+                    if jstep == 1:
+                        v, w = b.edges[j]
+                    else:
+                        w, v = b.edges[j - 1]
+
+                    allowedge[(v, w)] = allowedge[(w, v)] = True
+                    j += jstep
+
+                bw = b.childs[j]
+                label[w] = label[bw] = 2
+                labeledge[w] = labeledge[bw] = (v, w)
+                bestedge[bw] = None
+
+                j += jstep
+                while b.childs[j] != entrychild:
+                    bv = b.childs[j]
+                    if label.get(bv) == 1:
+                        j += jstep
+                        continue
+
+                    if isinstance(bv, _Blossom):
+                        for v in bv.leaves():
+                            if label.get(v):
+                                break
+                    else:
+                        v = bv
+
+                    if label.get(v):
+                        label[v] = None
+                        label[mate[blossombase[bv]]] = None
+                        assign_label(v, 2, labeledge[v][0])
+
+                    j += jstep
+
+            label.pop(b, None)
+            labeledge.pop(b, None)
+            bestedge.pop(b, None)
+            del blossomparent[b]
+            del blossombase[b]
+            del blossomdual[b]
+
+        stack = [_recurse(b, endstage)]
+        while stack:
+            top = stack[-1]
+            for s in top:
+                stack.append(_recurse(s, endstage))
+                break
+            else:
+                stack.pop()
+
+    def augment_blossom(b: _Blossom, v: int) -> None:
+        """
+        Swap matched/unmatched edges over an alternating path through
+        blossom b between vertex v and the base vertex.
+        """
+
+        def _recurse(b: _Blossom, v: int):
+            t = v
+            while blossomparent[t] != b:
+                t = blossomparent[t]
+
+            if isinstance(t, _Blossom):
+                yield (t, v)
+
+            i = j = b.childs.index(t)
+            if i & 1:
+                j -= len(b.childs)
+                jstep = 1
+            else:
+                jstep = -1
+
+            while j != 0:
+                j += jstep
+                t = b.childs[j]
+                if jstep == 1:
+                    w, x = b.edges[j]
+                else:
+                    x, w = b.edges[j - 1]
+
+                if isinstance(t, _Blossom):
+                    yield (t, w)
+
+                j += jstep
+                t = b.childs[j]
+                if isinstance(t, _Blossom):
+                    yield (t, x)
+
+                mate[w] = x
+                mate[x] = w
+
+            b.childs = b.childs[i:] + b.childs[:i]
+            b.edges = b.edges[i:] + b.edges[:i]
+            blossombase[b] = blossombase[b.childs[0]]
+
+        stack = [_recurse(b, v)]
+        while stack:
+            top = stack[-1]
+            for args in top:
+                stack.append(_recurse(*args))
+                break
+            else:
+                stack.pop()
+
+    def augment_matching(v: int, w: int) -> None:
+        """
+        Swap matched/unmatched edges over an alternating path between two
+        single vertices. The augmenting path runs through S-vertices v and w.
+        """
+        for s, j in ((v, w), (w, v)):
+            while True:
+                bs = inblossom[s]
+                if isinstance(bs, _Blossom):
+                    augment_blossom(bs, s)
+
+                mate[s] = j
+
+                if labeledge[bs] is None:
+                    break
+
+                t = labeledge[bs][0]
+                bt = inblossom[t]
+                s, j = labeledge[bt]
+
+                if isinstance(bt, _Blossom):
+                    augment_blossom(bt, j)
+
+                mate[j] = s
+
+    # Main loop: continue until no further improvement is possible.
+    while True:
+        # Each iteration of this loop is a "stage".
+        label.clear()
+        labeledge.clear()
+        bestedge.clear()
+        for b in blossomdual:
+            b.mybestedges = None
+        allowedge.clear()
+        queue[:] = []
+
+        for v in gnodes:
+            if (v not in mate) and label.get(inblossom[v]) is None:
+                assign_label(v, 1, None)
+
+        augmented = False
+        while True:
+            # Each iteration of this loop is a "substage".
+            while queue and not augmented:
+                v = queue.pop()
+
+                for w in neighbors[v]:
+                    bv = inblossom[v]
+                    bw = inblossom[w]
+
+                    if bv == bw:
+                        continue
+
+                    if (v, w) not in allowedge:
+                        kslack = slack(v, w)
+                        if kslack <= 0:
+                            allowedge[(v, w)] = allowedge[(w, v)] = True
+
+                    if (v, w) in allowedge:
+                        if label.get(bw) is None:
+                            assign_label(w, 2, v)
+                        elif label.get(bw) == 1:
+                            base = scan_blossom(v, w)
+                            if base is not _NoNode:
+                                add_blossom(base, v, w)
+                            else:
+                                augment_matching(v, w)
+                                augmented = True
+                                break
+                        elif label.get(w) is None:
+                            label[w] = 2
+                            labeledge[w] = (v, w)
+                    elif label.get(bw) == 1:
+                        if bestedge.get(bv) is None or kslack < slack(*bestedge[bv]):
+                            bestedge[bv] = (v, w)
+                    elif label.get(w) is None:
+                        if bestedge.get(w) is None or kslack < slack(*bestedge[w]):
+                            bestedge[w] = (v, w)
+
+            if augmented:
+                break
+
+            # No augmenting path: update the dual variables.
+            deltatype = 1
+            delta = min(dualvar)
+            deltaedge = deltablossom = None
+
+            for v in gnodes:
+                if label.get(inblossom[v]) is None and bestedge.get(v) is not None:
+                    d = slack(*bestedge[v])
+                    if d < delta:
+                        delta = d
+                        deltatype = 2
+                        deltaedge = bestedge[v]
+
+            for b in blossomparent:
+                if (
+                    blossomparent[b] is None
+                    and label.get(b) == 1
+                    and bestedge.get(b) is not None
+                ):
+                    d = slack(*bestedge[b]) / 2.0
+                    if d < delta:
+                        delta = d
+                        deltatype = 3
+                        deltaedge = bestedge[b]
+
+            for b in blossomdual:
+                if (
+                    blossomparent[b] is None
+                    and label.get(b) == 2
+                    and blossomdual[b] < delta
+                ):
+                    delta = blossomdual[b]
+                    deltatype = 4
+                    deltablossom = b
+
+            for v in gnodes:
+                if label.get(inblossom[v]) == 1:
+                    dualvar[v] -= delta
+                elif label.get(inblossom[v]) == 2:
+                    dualvar[v] += delta
+
+            for b in blossomdual:
+                if blossomparent[b] is None:
+                    if label.get(b) == 1:
+                        blossomdual[b] += delta
+                    elif label.get(b) == 2:
+                        blossomdual[b] -= delta
+
+            if deltatype == 1:
+                # No further improvement possible; optimum reached.
+                break
+            elif deltatype == 2:
+                v, w = deltaedge
+                allowedge[(v, w)] = allowedge[(w, v)] = True
+                queue.append(v)
+            elif deltatype == 3:
+                v, w = deltaedge
+                allowedge[(v, w)] = allowedge[(w, v)] = True
+                queue.append(v)
+            elif deltatype == 4:
+                expand_blossom(deltablossom, False)
+
+        if not augmented:
+            break
+
+        # End of a stage: expand all S-blossoms which have zero dual.
+        for b in list(blossomdual.keys()):
+            if b not in blossomdual:
+                continue  # already expanded
+
+            if blossomparent[b] is None and label.get(b) == 1 and blossomdual[b] == 0:
+                expand_blossom(b, True)
+
+    return {(v, w) for v, w in mate.items() if v < w}
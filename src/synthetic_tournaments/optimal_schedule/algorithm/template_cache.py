@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Sequence
+
+import numpy as np
+
+from .types import OptimalFn
+from .utils import Round
+
+
+@dataclass(frozen=True)
+class ScheduleTemplate:
+    """
+    Single round-robin schedule of teams 0, ..., n - 1 stored as integer arrays.
+
+        matches: np.ndarray[int] (number of matches, 2)
+            (home, away) team identifiers of every match, round after round.
+
+        round_offsets: np.ndarray[int] (number of rounds + 1,)
+            Position of the first match of each round (and the total number
+            of matches): the i-th round is matches[offsets[i] : offsets[i + 1]].
+    """
+
+    matches: np.ndarray
+    round_offsets: np.ndarray
+
+    @classmethod
+    def from_schedule(cls, schedule: list[Round]) -> ScheduleTemplate:
+        round_sizes = [len(round_) for round_ in schedule]
+        round_offsets = np.concatenate([[0], np.cumsum(round_sizes)]).astype(np.int64)
+
+        matches = np.array(
+            [match for round_ in schedule for match in round_], dtype=np.int64
+        ).reshape(-1, 2)
+
+        return cls(matches, round_offsets)
+
+    def to_schedule(self) -> list[Round]:
+        matches = [tuple(match) for match in self.matches.tolist()]
+        offsets = self.round_offsets.tolist()
+
+        return [tuple(matches[start:end]) for start, end in zip(offsets, offsets[1:])]
+
+
+@lru_cache(maxsize=None)
+def get_schedule_template(optimal_fn: OptimalFn, num_teams: int) -> ScheduleTemplate:
+    """
+    `optimal_fn(num_teams)` computed only once per process.
+
+    With default strengths (only the number of teams), optimal schedules
+    only depend on the number of teams, so every tournament with the same
+    number of teams (any sport or season) reuses the same template.
+    """
+    return ScheduleTemplate.from_schedule(optimal_fn(num_teams))
+
+
+def with_template_cache(optimal_fn: OptimalFn) -> OptimalFn:
+    """
+    Same as `optimal_fn`, but schedules for a number of teams (int) are
+    read from the template cache (see `get_schedule_template`).
+
+    Team strengths (Sequence[float]) are not cached.
+    """
+
+    @wraps(optimal_fn)
+    def _cached_optimal_fn(strengths: int | Sequence[float], *args, **kwargs):
+        if args or kwargs or not isinstance(strengths, int):
+            return optimal_fn(strengths, *args, **kwargs)
+
+        return get_schedule_template(optimal_fn, strengths).to_schedule()
+
+    return _cached_optimal_fn
@@ -7,7 +7,11 @@ from typing import Sequence
 import tournament_simulations.schedules.round_robin as rr
 from tournament_simulations.schedules import Round
 
-from ..algorithm import OptimalFn, generate_recursive_optimal_schedule
+from ..algorithm import (
+    OptimalFn,
+    generate_recursive_optimal_schedule,
+    with_template_cache,
+)
 
 
 def create_double_rr(
@@ -20,7 +24,9 @@ def create_double_rr(
     Symmetric schedule: second portion is the first one with
     (home, away) matches as (away, home).
     """
-    drr = rr.DoubleRoundRobin.from_team_names(team_names, optimal_fn)
+    drr = rr.DoubleRoundRobin.from_team_names(
+        team_names, with_template_cache(optimal_fn)
+    )
     return list(drr.get_full_schedule(num_schedules, None, second_portion))
 
 
@@ -36,6 +42,8 @@ def create_random_double_rr(
 
     Randomizes which team play as home/away.
     """
-    drr = rr.DoubleRoundRobin.from_team_names(team_names, optimal_fn)
+    drr = rr.DoubleRoundRobin.from_team_names(
+        team_names, with_template_cache(optimal_fn)
+    )
     to_randomize = ["home_away", "matches"]
     return list(drr.get_full_schedule(num_schedules, to_randomize, second_portion))
@@ -8,7 +8,11 @@ import tournament_simulations.schedules.round_robin as rr
 from tournament_simulations.schedules import Round
 from tournament_simulations.schedules.utils.reversed_schedule import reverse_schedule
 
-from ..algorithm import OptimalFn, generate_recursive_optimal_schedule
+from ..algorithm import (
+    OptimalFn,
+    generate_recursive_optimal_schedule,
+    with_template_cache,
+)
 
 
 def create_double_rr(
@@ -21,7 +25,9 @@ def create_double_rr(
     Symmetric schedule: second portion is the first one with
     (home, away) matches as (away, home).
     """
-    drr = rr.DoubleRoundRobin.from_team_names(team_names, optimal_fn)
+    drr = rr.DoubleRoundRobin.from_team_names(
+        team_names, with_template_cache(optimal_fn)
+    )
     drr.first_schedule = reverse_schedule(drr.first_schedule)
     drr.second_schedule = reverse_schedule(drr.second_schedule)
     return list(drr.get_full_schedule(num_schedules, None, second_portion))
@@ -39,7 +45,9 @@ def create_random_double_rr(
 
     Randomizes which team play as home/away.
     """
-    drr = rr.DoubleRoundRobin.from_team_names(team_names, optimal_fn)
+    drr = rr.DoubleRoundRobin.from_team_names(
+        team_names, with_template_cache(optimal_fn)
+    )
     drr.first_schedule = reverse_schedule(drr.first_schedule)
     drr.second_schedule = reverse_schedule(drr.second_schedule)
     to_randomize = ["home_away", "matches"]
@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+
+import benchmarks.report as report
+from benchmarks.timing import Timing, time_fn
+
+
+def _timing(median: float) -> Timing:
+    return Timing(min=median, median=median, mean=median, repeat=1)
+
+
+def test_time_fn():
+    calls = []
+    timing = time_fn(lambda: calls.append(1), repeat=3, warmup=2)
+
+    assert len(calls) == 5
+    assert timing.repeat == 3
+    assert 0 <= timing.min <= timing.median
+
+
+def test_compare_results():
+    current = {"a": _timing(1.0), "b": _timing(1.5), "c": _timing(0.5), "d": _timing(1)}
+    baseline = {
+        "a": _timing(1.1),
+        "b": _timing(1.0),
+        "c": _timing(1.0),
+        "e": _timing(1),
+    }
+
+    comparisons = report.compare_results(current, baseline, threshold=0.2)
+    name_to_status = {comparison.name: comparison.status for comparison in comparisons}
+
+    assert name_to_status == {
+        "a": "unchanged",
+        "b": "regression",
+        "c": "improvement",
+        "d": "new",
+        "e": "missing",
+    }
+    assert comparisons[1].ratio == pytest.approx(1.5)
+    assert report.has_regression(comparisons)
+    assert not report.has_regression(comparisons[:1])
+
+
+def test_save_and_load_results(tmp_path: Path):
+    results = {"metric/variance": _timing(0.25)}
+    metadata = {"dataset": {"num_teams": 4}}
+
+    filepath = tmp_path / "results" / "latest.json"
+    report.save_results(filepath, results, metadata)
+
+    assert report.load_results(filepath) == (results, metadata)
+
+
+def test_format_report():
+    comparisons = report.compare_results({"a": _timing(2)}, {"a": _timing(1)}, 0.2)
+    lines = report.format_report(comparisons).splitlines()
+
+    assert len(lines) == 3
+    assert lines[2].split() == ["a", "1.0000s", "2.0000s", "2.00x", "regression"]
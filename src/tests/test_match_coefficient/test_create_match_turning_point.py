@@ -4,6 +4,7 @@ import pytest
 
 import turning_point.match_coefficient.create_match_turning_point as cmtp
 from tournament_simulations.data_structures import Matches
+from turning_point.metric_stats.get_matches_in_window import MatchesWindowIndex
 from turning_point.normal_coefficient import TurningPoint
 
 
@@ -83,3 +84,49 @@ def test_get_kwargs_from_matches_turning_point(
 
     match_tp = cmtp.get_kwargs_from_matches_turning_point(matches, turning_point)
     assert match_tp["df"].equals(expected)
+
+
+def test_count_matches_before_turning_points_permutations():
+    rng = np.random.default_rng(0)
+
+    ids = [
+        f"1@/sport/country/tourney-{year}/@{perm}"
+        for year in range(3)
+        for perm in range(20)
+    ]
+    num_matches = rng.integers(1, 15, size=len(ids))
+
+    df = pd.DataFrame(
+        {
+            "id": np.repeat(ids, num_matches),
+            "date number": np.concatenate(
+                [np.sort(rng.integers(0, 6, size=num)) for num in num_matches]
+            ),
+        }
+    )
+    df = df.sample(frac=1, random_state=0)  # unsorted rows
+    matches = Matches(df.assign(home="a", away="b", winner="h"))
+
+    turning_points = rng.integers(-1, 9, size=len(ids)).astype(float)
+    turning_points[:3] = [np.inf, np.nan, 0]
+
+    window_index = MatchesWindowIndex.from_matches(matches)
+    num, percent = cmtp.count_matches_before_turning_points(
+        window_index, pd.Index(ids), turning_points
+    )
+
+    for i, id_tp in enumerate(zip(ids, turning_points)):
+        expected = cmtp._count_number_and_percentage_of_matches_in_interval(
+            id_tp, matches
+        )
+        np.testing.assert_equal((num[i], percent[i]), expected)
+
+
+def test_count_matches_before_turning_points_missing_id(matches: Matches):
+
+    window_index = MatchesWindowIndex.from_matches(matches)
+
+    with pytest.raises(KeyError):
+        cmtp.count_matches_before_turning_points(
+            window_index, pd.Index(["1", "4"]), np.array([1, 2])
+        )
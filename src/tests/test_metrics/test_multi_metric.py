@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+import tournament_simulations.data_structures as ds
+from turning_point.metrics import (
+    METRIC_MAP,
+    metrics_from_points_per_match,
+    simulate_metrics_from_points_per_match,
+)
+from turning_point.metrics.multi_metric import calculate_all_per_id
+
+
+def _points_per_match() -> ds.PointsPerMatch:
+    test_cols = {
+        "id": ["1", "1", "1", "1", "1", "1", "2", "2", "2", "2"],
+        "team": ["A", "B", "A", "C", "B", "C", "a", "b", "c", "d"],
+        "points": [3, 0, 3, 0, 1, 1, 1, 1, 0, 3],
+        "date number": [0, 0, 1, 1, 2, 2, 0, 0, 0, 0],
+    }
+    return ds.PointsPerMatch(
+        pd.DataFrame(data=test_cols).set_index(["id", "date number"])
+    )
+
+
+def test_calculate_all_per_id():
+    ppm = _points_per_match()
+    metric_types = {name: METRIC_MAP[name] for name in ("variance", "gini", "iqr")}
+
+    result = calculate_all_per_id(ppm.df, metric_types)
+
+    for name, metric_type in metric_types.items():
+        expected = metric_type.calculate_per_id(ppm.df)
+        pd.testing.assert_frame_equal(result[name], expected)
+
+
+def test_metrics_from_points_per_match():
+    ppm = _points_per_match()
+    metric_types = {
+        name: METRIC_MAP[name] for name in ("variance", "normalized_gini", "fast_ncr")
+    }
+
+    # deterministic simulations: every metric sees the same tournaments
+    id_to_prob = pd.Series(
+        index=["1", "2"],
+        data=[
+            {(3, 0): 0, (1, 1): 0, (0, 3): 1},
+            {(3, 0): 1, (1, 1): 0, (0, 3): 0},
+        ],
+    )
+
+    result = metrics_from_points_per_match(metric_types, ppm, (2, 3), id_to_prob)
+    assert list(result) == list(metric_types)
+
+    for name, metric_type in metric_types.items():
+        expected = metric_type.from_points_per_match(ppm, (2, 3), id_to_prob)
+
+        assert isinstance(result[name], metric_type)
+        pd.testing.assert_frame_equal(result[name].real, expected.real)
+        np.testing.assert_allclose(
+            result[name].simulated.to_numpy(), expected.simulated.to_numpy()
+        )
+
+
+def test_simulate_metrics_from_points_per_match():
+    ppm = _points_per_match()
+    metric_types = {name: METRIC_MAP[name] for name in ("variance", "nhhi", "gini")}
+
+    id_to_prob = pd.Series(
+        index=["1", "2"],
+        data=[
+            {(3, 0): 0, (1, 1): 0, (0, 3): 1},
+            {(3, 0): 1, (1, 1): 0, (0, 3): 0},
+        ],
+    )
+
+    expected = metrics_from_points_per_match(metric_types, ppm, (2, 3), id_to_prob)
+    result = simulate_metrics_from_points_per_match(
+        metric_types, ppm, (2, 3), id_to_prob
+    )
+    assert list(result) == list(metric_types)
+
+    for name, metric_type in metric_types.items():
+        pd.testing.assert_frame_equal(result[name], expected[name].simulated)
+
+        simulated = metric_type.simulate_from_points_per_match(ppm, (2, 3), id_to_prob)
+        np.testing.assert_allclose(
+            simulated.to_numpy(), expected[name].simulated.to_numpy()
+        )
+
+    assert simulate_metrics_from_points_per_match(metric_types, ppm, (0, 0)) is None
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import turning_point.metrics.normalization_bounds as nb
+from synthetic_tournaments.most_imbalanced import (
+    TeamRanks,
+    build_most_imbalanced_tournament,
+)
+from turning_point.metrics.gini_index import (
+    _calculate_gini_index_per_id,
+    _round_robin_gini_upper_bound,
+)
+from turning_point.metrics.normalized_hhi import (
+    _calculate_hhi_per_id,
+    _round_robin_hhi_upper_bound,
+)
+
+
+def _get_ppm(id_to_matches: dict[str, list[tuple[str, str]]]) -> pd.DataFrame:
+    rows = []
+    for id_, matches in id_to_matches.items():
+        for date, (home, away) in enumerate(matches):
+            rows.append((id_, date, home, 0.0))
+            rows.append((id_, date, away, 0.0))
+
+    df = pd.DataFrame(rows, columns=["id", "date number", "team", "points"])
+    df = df.astype({"id": "category", "team": "category"})
+    return df.set_index(["id", "date number"])
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    nb.clear_bounds_cache()
+    yield
+    nb.clear_bounds_cache()
+
+
+def test_layout_signatures_ignore_names_and_match_order():
+    ppm = _get_ppm(
+        {
+            "1": [("A", "B"), ("B", "C"), ("A", "B")],
+            "2": [("y", "x"), ("x", "z"), ("z", "x")],
+        }
+    )
+    signatures = nb.get_layout_signatures(ppm)
+
+    assert signatures.loc["1"] == signatures.loc["2"]
+
+
+def test_layout_signatures_same_number_of_matches():
+    # every team plays 2 matches, but the most imbalanced standings differ
+    ppm = _get_ppm(
+        {
+            "1": [("A", "B"), ("B", "C"), ("C", "D"), ("D", "A")],
+            "2": [("A", "B"), ("A", "B"), ("C", "D"), ("C", "D")],
+        }
+    )
+    signatures = nb.get_layout_signatures(ppm)
+
+    assert signatures.loc["1"] != signatures.loc["2"]
+
+
+def test_most_imbalanced_bound_same_as_building_it():
+    rng = np.random.default_rng(0)
+
+    id_to_matches = {}
+    for id_ in range(20):
+        num_teams, num_matches = rng.integers(2, 20), rng.integers(1, 50)
+        id_to_matches[f"{id_}"] = [
+            tuple(f"T{team}" for team in rng.choice(num_teams, 2, replace=False))
+            for _ in range(num_matches)
+        ]
+    ppm = _get_ppm(id_to_matches)
+
+    for calculate_per_id in (_calculate_hhi_per_id, _calculate_gini_index_per_id):
+        expected = calculate_per_id(build_most_imbalanced_tournament(ppm))
+        result = nb.get_most_imbalanced_bound(ppm, calculate_per_id)
+
+        assert np.allclose(result, expected.to_numpy())
+
+
+def test_most_imbalanced_bound_is_cached(monkeypatch):
+    ppm = _get_ppm({"1": [("A", "B"), ("B", "C")], "2": [("x", "y"), ("y", "z")]})
+
+    calls = []
+
+    def _build(df: pd.DataFrame) -> pd.DataFrame:
+        calls.append(df.index.get_level_values("id").unique().tolist())
+        return build_most_imbalanced_tournament(df)
+
+    monkeypatch.setattr(nb, "build_most_imbalanced_tournament", _build)
+
+    first = nb.get_most_imbalanced_bound(ppm, _calculate_hhi_per_id)
+    second = nb.get_most_imbalanced_bound(ppm, _calculate_hhi_per_id)
+
+    assert np.array_equal(first, second)
+    assert calls == [["1", "2"]]
+
+
+def test_most_imbalanced_bound_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(nb, "MAX_CACHED_BOUNDS", 2)
+
+    # three different layouts (1, 2 and 3 matches)
+    ppm = _get_ppm({f"{i}": [("A", "B")] * i for i in range(1, 4)})
+    expected = _calculate_hhi_per_id(build_most_imbalanced_tournament(ppm))
+
+    result = nb.get_most_imbalanced_bound(ppm, _calculate_hhi_per_id)
+    assert np.allclose(result, expected.to_numpy())
+    assert len(nb._BOUNDS_CACHE) == 2
+
+    # evicted layouts are calculated again
+    result = nb.get_most_imbalanced_bound(ppm, _calculate_hhi_per_id)
+    assert np.allclose(result, expected.to_numpy())
+    assert len(nb._BOUNDS_CACHE) == 2
+
+
+def _get_round_robin(teams: list[str], k: int) -> list[tuple[str, str]]:
+    return [
+        (home, away)
+        for _ in range(k)
+        for i, home in enumerate(teams)
+        for away in teams[i + 1 :]
+    ]
+
+
+def test_complete_round_robin_sizes():
+    ppm = _get_ppm(
+        {
+            "1": _get_round_robin(["A", "B", "C", "D"], k=1),
+            "2": _get_round_robin(["a", "b", "c"], k=2),
+            "3": _get_round_robin(["A", "B", "C"], k=1) + [("A", "B")],
+            "4": [("A", "B"), ("B", "C"), ("C", "D"), ("D", "A")],
+        }
+    )
+    team_ranks = TeamRanks.from_points_per_match(ppm)
+
+    sizes = nb.get_complete_round_robin_sizes(team_ranks)
+
+    assert np.array_equal(sizes, [4, 3, 0, 0])
+
+
+@pytest.mark.parametrize(
+    "calculate_per_id, round_robin_bound",
+    [
+        (_calculate_hhi_per_id, _round_robin_hhi_upper_bound),
+        (_calculate_gini_index_per_id, _round_robin_gini_upper_bound),
+    ],
+)
+def test_round_robin_bound_same_as_building_it(calculate_per_id, round_robin_bound):
+    teams = [f"T{i}" for i in range(10)]
+    ppm = _get_ppm(
+        {
+            f"{num_teams}-{k}": _get_round_robin(teams[:num_teams], k)
+            for num_teams in range(2, 10)
+            for k in (1, 2)
+        }
+        | {"not round robin": [("A", "B"), ("B", "C")]}
+    )
+
+    expected = calculate_per_id(build_most_imbalanced_tournament(ppm))
+    result = nb.get_most_imbalanced_bound(ppm, calculate_per_id, round_robin_bound)
+
+    assert np.allclose(result, expected.to_numpy())
+    assert len(nb._BOUNDS_CACHE) == 1
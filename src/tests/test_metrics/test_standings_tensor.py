@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import turning_point.metrics.gini_index as gini
+import turning_point.metrics.interquartile_range as iqr
+import turning_point.metrics.normalized_hhi as hhi
+import turning_point.metrics.standings_tensor as st
+import turning_point.metrics.top_concentration_ratio as cr
+
+
+def _pairwise_gini(standings: pd.DataFrame) -> pd.Series:
+    values = standings.to_numpy(dtype=float)
+    abs_diff = np.abs(values[:, np.newaxis, :] - values[np.newaxis, :, :])
+    gini = abs_diff.sum(axis=(0, 1)) / (2 * values.mean(axis=0) * len(values) ** 2)
+    return pd.Series(gini, index=standings.columns)
+
+
+def _nlargest_normalized_cr(standings: pd.DataFrame, x: float = 0.25) -> pd.Series:
+    top_x_percent_size = int(len(standings) * x)
+    shares = standings / standings.sum()
+
+    top_x_percent = shares.apply(lambda col: col.nlargest(top_x_percent_size).sum())
+    if top_x_percent_size == 0:
+        return top_x_percent
+
+    return top_x_percent / (top_x_percent_size / len(standings))
+
+
+@pytest.fixture()
+def dataframe():
+    df_cols = {
+        "id": ["1", "1", "1", "1", "2", "2", "2", "2", "2", "2", "2", "2", "3", "3"],
+        "team": ["A", "B", "A", "C", "a", "b", "c", "d", "c", "b", "c", "a", "d", "b"],
+        "points": [3, 0, 3, 0, 1, 1, 1, 1, 1, 1, 1, 1, 0, 3],
+        "s0": [0, 3, 0, 3, 3, 0, 0, 3, 3, 0, 1, 1, 3, 0],
+        "date number": [0, 0, 1, 1, 0, 0, 0, 0, 1, 1, 2, 2, 0, 0],
+    }
+    return pd.DataFrame(data=df_cols).set_index(["id", "date number"])
+
+
+def test_from_points_per_match(dataframe: pd.DataFrame):
+    tensor = st.StandingsTensor.from_points_per_match(dataframe)
+
+    assert tensor.values.shape == (3, 4, 2)
+    assert tensor.ids.equals(pd.Index(["1", "2", "3"]))
+    assert tensor.columns.equals(pd.Index(["points", "s0"]))
+
+    expected_mask = [
+        [True, True, True, False],
+        [True, True, True, True],
+        [True, True, False, False],
+    ]
+    assert np.array_equal(tensor.mask, expected_mask)
+    assert np.array_equal(tensor.num_teams, [[3], [4], [2]])
+
+    # teams: A, B, C / a, b, c, d / b, d (order of first appearance in "team")
+    expected_points = [[6, 0, 0, 0], [2, 2, 3, 1], [3, 0, 0, 0]]
+    assert np.array_equal(tensor.values[:, :, 0], expected_points)
+
+    expected_s0 = [[0, 3, 3, 0], [4, 0, 4, 3], [0, 3, 0, 0]]
+    assert np.array_equal(tensor.values[:, :, 1], expected_s0)
+
+
+def test_from_team_points():
+    points = np.array([[1.0], [2.0], [3.0], [4.0]])
+    id_codes = np.array([2, 0, 2, 2])
+    ids = pd.Index(["x", "y", "z"])
+
+    tensor = st.StandingsTensor.from_team_points(points, id_codes, ids, ["points"])
+
+    assert tensor.ids.equals(pd.Index(["x", "z"]))
+    assert np.array_equal(tensor.mask, [[True, False, False], [True, True, True]])
+    assert np.array_equal(tensor.values[:, :, 0], [[2, 0, 0], [1, 3, 4]])
+
+
+def test_top_k_sum():
+    values = np.array(
+        [
+            [[1, 5], [3, 2], [2, 4], [-np.inf, -np.inf]],
+            [[4, 1], [1, 2], [3, 3], [2, 4]],
+            [[1, 1], [2, 2], [-np.inf, -np.inf], [-np.inf, -np.inf]],
+        ]
+    )
+    k = np.array([2, 3, 0])
+
+    expected = np.array([[5, 9], [9, 9], [0, 0]])
+    assert np.array_equal(st.top_k_sum(values, k), expected)
+
+
+@pytest.mark.parametrize(
+    "kernel, metric",
+    [
+        (st.batched_variance, lambda df: df.var()),
+        (st.batched_interquartile_range, iqr.interquartile_range),
+        (st.batched_herfindahl_hirschman_index, hhi.herfindahl_hirschman_index),
+        (st.batched_gini, gini.gini),
+        (st.batched_gini, _pairwise_gini),
+        (
+            st.batched_normalized_top_x_cr,
+            cr.normalized_top_x_percent_concentration_ratio,
+        ),
+        (st.batched_normalized_top_x_cr, _nlargest_normalized_cr),
+        (
+            st.batched_fast_normalized_top_x_cr,
+            cr.fast_normalized_top_x_percent_concentration_ratio,
+        ),
+    ],
+)
+def test_kernels_same_as_groupby(kernel, metric):
+    rng = np.random.default_rng(0)
+
+    num_teams = [2, 3, 7, 10, 20]
+    df = pd.DataFrame(
+        {
+            "id": np.repeat(["1", "2", "3", "4", "5"], num_teams),
+            "team": np.concatenate([np.arange(n) for n in num_teams]),
+            "points": rng.integers(0, 100, sum(num_teams)),
+            "s0": rng.integers(0, 100, sum(num_teams)),
+            "s1": rng.integers(0, 100, sum(num_teams)),
+        }
+    ).set_index("id")
+
+    expected = df.groupby(["id", "team"]).sum().groupby("id").apply(metric)
+    result = st.apply_per_id(kernel, df)
+
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(dtype=float))
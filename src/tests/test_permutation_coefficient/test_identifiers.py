@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+import turning_point.permutation_coefficient as pc
+
+
+def _get_ids() -> pd.Index:
+    return pd.Index(
+        pd.Categorical(
+            [
+                "current@/one/two/three-2020@0",
+                "current@/one/two/three-2020@0",
+                "current@/one/two/three-2020@1",
+                "other@/one/four/five-2021",
+                "one@two@ok",
+                "one@two",
+            ]
+        ),
+        name="id",
+    )
+
+
+def test_from_index_parses_each_distinct_id_once():
+    identifiers = pc.TournamentIdentifiers.from_index(_get_ids())
+
+    assert len(identifiers.parsed) == 5
+    assert list(identifiers.parsed.columns) == pc.IDENTIFIER_LEVELS
+    assert all(
+        isinstance(dtype, pd.CategoricalDtype) for dtype in identifiers.parsed.dtypes
+    )
+
+
+def test_to_frame():
+    ids = _get_ids()
+    df = pd.DataFrame({"col": range(len(ids))}, index=ids)
+
+    result = pc.TournamentIdentifiers.from_index(df).to_frame()
+
+    expected = pd.DataFrame(
+        {
+            "base id": ["current@/one/two/three-2020"] * 3
+            + ["other@/one/four/five-2021", "one@two", "one@two"],
+            "tournament": ["current"] * 3 + ["other", np.nan, np.nan],
+            "sport": ["one"] * 4 + [np.nan, np.nan],
+            "country": ["two"] * 3 + ["four", np.nan, np.nan],
+            "season": ["three-2020"] * 3 + ["five-2021", np.nan, np.nan],
+            "permutation": ["0", "0", "1", "", "ok", ""],
+        }
+    )
+    pd.testing.assert_frame_equal(result.astype(object), expected.astype(object))
+
+
+def test_isin_and_unique():
+    identifiers = pc.TournamentIdentifiers.from_index(_get_ids())
+
+    is_zero = identifiers.isin("permutation", ["0"])
+    assert is_zero.tolist() == [True, True, False, False, False, False]
+
+    is_one_sport = identifiers.isin("sport", ["one"])
+    assert is_one_sport.tolist() == [True, True, True, True, False, False]
+
+    assert identifiers.unique("permutation") == ["", "0", "1", "ok"]
+    assert identifiers.unique("country") == ["four", "two"]
+
+
+def test_always_permuted():
+    ids = pd.Index(["2@0", "1@ok@3", "a@/b/c/d@x"], name="id")
+
+    identifiers = pc.TournamentIdentifiers.from_index(ids, always_permuted=True)
+    assert identifiers.to_frame(["base id"])["base id"].tolist() == [
+        "2",
+        "1@ok",
+        "a@/b/c/d",
+    ]
+    assert identifiers.get_level("permutation").tolist() == ["0", "3", "x"]
+
+    identifiers = pc.TournamentIdentifiers.from_index(ids)
+    assert identifiers.get_level("permutation").tolist() == ["", "3", "x"]
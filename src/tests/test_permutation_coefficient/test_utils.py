@@ -1,4 +1,5 @@
 import pandas as pd
+import pytest
 
 import turning_point.permutation_coefficient.utils as utils
 
@@ -203,3 +204,109 @@ def test_get_data_wiht_identifier():
 
     expected_index = ["current@/two@2"]
     assert utils.get_data_with_identifier(test, "2").equals(test.loc[expected_index])
+
+
+def test_partition_by_permutation():
+    test = pd.DataFrame(
+        {
+            "id": pd.Categorical(
+                [
+                    "current@/one@0",
+                    "current@/two@1",
+                    "current@/one@1",
+                    "current@/two@0",
+                    "current@/two@2",
+                    "current@/one@0",
+                ]
+            ),
+            "col": list(range(6)),
+        }
+    ).set_index("id")
+
+    result = dict(utils.partition_by_permutation(test))
+
+    assert list(result) == utils.get_permutation_identifiers(test)
+    for identifier, df in result.items():
+        assert df.equals(utils.get_data_with_identifier(test, identifier))
+
+    test = pd.DataFrame(
+        {
+            "id": pd.Categorical(["current@/one/two/three"] * 3),
+            "col": [0, 1, 2],
+        }
+    ).set_index("id")
+
+    identifiers, dfs = zip(*utils.partition_by_permutation(test))
+    assert identifiers == ("",)
+    assert dfs[0].equals(test)
+
+
+def test_get_permutation_sizes():
+    test = pd.DataFrame(
+        {
+            "id": pd.Categorical(
+                ["one@two@0", "one@two@1", "one@two@0", "three@four@10"]
+            ),
+            "col": [0, 1, 2, 3],
+        }
+    ).set_index("id")
+
+    assert utils.get_permutation_sizes(test) == {"0": 2, "1": 1, "10": 1}
+
+
+def test_get_permutation_runs():
+    test = pd.DataFrame(
+        {
+            "id": pd.Categorical(
+                ["one@two@0", "three@four@0", "one@two@1", "one@two@0", "five"]
+            ),
+            "col": [0, 1, 2, 3, 4],
+        }
+    ).set_index("id")
+
+    expected = [("0", 2), ("1", 1), ("0", 1), ("", 1)]
+    assert utils.get_permutation_runs(test) == expected
+    assert utils.get_permutation_runs(test.iloc[:0]) == []
+
+
+def test_partition_chunks_by_permutation():
+    test = pd.DataFrame(
+        {
+            "id": [
+                "current@/one@0",
+                "current@/two@0",
+                "current@/one@1",
+                "current@/two@0",
+                "current@/one@2",
+                "current@/two@1",
+                "current@/two@2",
+            ],
+            "col": list(range(7)),
+        }
+    ).set_index("id")
+    sizes = utils.get_permutation_sizes(test)
+
+    for chunk_size in range(1, len(test) + 1):
+        chunks = (
+            test.iloc[start : start + chunk_size]
+            for start in range(0, len(test), chunk_size)
+        )
+        result = list(utils.partition_chunks_by_permutation(chunks, sizes))
+
+        assert sorted(identifier for identifier, _ in result) == ["0", "1", "2"]
+        for identifier, df in result:
+            assert df.equals(utils.get_data_with_identifier(test, identifier))
+
+    # "0" is complete after the 4th entry, "1" and "2" after the last one
+    chunks = [test.iloc[:4], test.iloc[4:]]
+    result = utils.partition_chunks_by_permutation(chunks, sizes)
+    assert [identifier for identifier, _ in result] == ["0", "1", "2"]
+
+    with pytest.raises(ValueError):
+        list(utils.partition_chunks_by_permutation([test.iloc[:4]], sizes))
+
+    # other permutations are ignored
+    chunks = [test.iloc[:4], test.iloc[4:]]
+    result = list(utils.partition_chunks_by_permutation(chunks, {"1": 2}))
+    assert [identifier for identifier, _ in result] == ["1"]
+    assert result[0][1].equals(utils.get_data_with_identifier(test, "1"))
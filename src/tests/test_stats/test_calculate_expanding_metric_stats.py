@@ -2,6 +2,7 @@ import pandas as pd
 
 import turning_point.metric_stats.calculate_expanding_metric_stats as cems
 from tournament_simulations.data_structures import Matches
+from turning_point.metric_stats import ExpandingMetricStats
 
 
 def test_expanding_template():
@@ -58,3 +59,33 @@ def test_expanding_template():
         .astype({"final date": int})
         .equals(expected)
     )
+
+
+def test_select_quantile():
+    stats = ExpandingMetricStats(
+        pd.DataFrame(
+            {
+                "id": ["1", "1", "2"],
+                "final date": [0, 1, 0],
+                "real": [1.0, 2.0, 3.0],
+                "mean": [0.5, 1.5, 2.5],
+                "quantile 0.05": [0.1, 0.2, 0.3],
+                "quantile 0.95": [0.9, 1.9, 2.9],
+            }
+        )
+    )
+
+    expected = ExpandingMetricStats(
+        pd.DataFrame(
+            {
+                "id": ["1", "1", "2"],
+                "final date": [0, 1, 0],
+                "real": [1.0, 2.0, 3.0],
+                "mean": [0.5, 1.5, 2.5],
+                "quantile": [0.9, 1.9, 2.9],
+            }
+        )
+    )
+
+    assert stats.select_quantile(0.95).df.equals(expected.df)
+    assert stats.select_quantile(0.05).df["quantile"].to_list() == [0.1, 0.2, 0.3]
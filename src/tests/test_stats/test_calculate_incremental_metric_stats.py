@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import turning_point.metric_stats.calculate_expanding_metric_stats as cems
+import turning_point.metric_stats.calculate_incremental_metric_stats as cims
+from synthetic_tournaments.most_imbalanced import build_most_imbalanced_tournament
+from tournament_simulations.data_structures import Matches
+from turning_point.metric_stats import ExpandingMetricStats
+from turning_point.metrics import METRIC_MAP, Variances
+
+
+def _get_matches_and_probabilities() -> tuple[Matches, pd.Series]:
+    cols = {
+        "id": ["1", "1", "2"],
+        "date number": [0, 1, 0],
+        "home": ["A", "A", "a"],
+        "away": ["B", "C", "b"],
+        "winner": ["a", "h", "d"],
+    }
+    matches = Matches(pd.DataFrame(cols))
+
+    id_to_probabilities = pd.Series(
+        {
+            "1": {(3, 0): 0, (1, 1): 0, (0, 3): 1},
+            "2": {(3, 0): 0, (1, 1): 1, (0, 3): 0},
+        }
+    )
+    return matches, id_to_probabilities
+
+
+def test_cumulative_probabilities():
+    _, id_to_probabilities = _get_matches_and_probabilities()
+    point_pairs = [(0, 3), (1, 1), (3, 0)]
+
+    cumulative = cims._get_cumulative_probabilities(
+        id_to_probabilities, pd.Index(["1", "2", "3"]), point_pairs
+    )
+    expected = np.array([[1, 1, 1], [0, 1, 1], [0, 0, 0]], dtype=float)
+
+    assert np.array_equal(cumulative, expected)
+
+
+def test_sample_point_pairs():
+    cumulative = np.array([[1, 1, 1], [0, 1, 1], [0, 0, 1]], dtype=float)
+
+    sampled = cims._sample_point_pairs(cumulative, (2, 3))
+    expected = np.array([[0] * 6, [1] * 6, [2] * 6])
+
+    assert np.array_equal(sampled, expected)
+
+
+def test_get_most_imbalanced_points():
+    # A-B twice, B-C, C-D, A-D: matches A: 3, B: 3, C: 2, D: 2
+    home_slots = np.array([0, 1, 1, 2, 3])
+    away_slots = np.array([1, 0, 2, 3, 0])
+
+    match_pairs, pair_slots = cims._get_match_pairs(home_slots, away_slots, 4)
+    pair_counts = np.bincount(match_pairs, minlength=len(pair_slots))
+    slot_matches = np.bincount(np.concatenate([home_slots, away_slots]))
+
+    result = cims._get_most_imbalanced_points(pair_slots, pair_counts, slot_matches)
+
+    # each match is a pair of rows: home team and then away team
+    teams = np.array(["A", "B", "C", "D"])
+    ppm_df = pd.DataFrame(
+        {
+            "id": "1",
+            "date number": np.repeat(np.arange(len(home_slots)), 2),
+            "team": np.stack([teams[home_slots], teams[away_slots]], axis=1).ravel(),
+        }
+    ).set_index(["id", "date number"])
+    most_imbalanced = build_most_imbalanced_tournament(ppm_df)
+    expected = most_imbalanced.groupby("team")["point"].sum().to_numpy()
+
+    assert np.array_equal(result, expected)
+
+
+def test_get_kwargs_incremental_from_matches():
+    matches, id_to_probabilities = _get_matches_and_probabilities()
+
+    # date 0: id "1" -> A: 0, B: 3 (var 4.5); id "2" -> a: 1, b: 1 (var 0)
+    # date 1: id "1" -> A: 3, B: 3, C: 0 (var 3); simulated A: 0, B: 3, C: 3 (var 3)
+    expected = pd.DataFrame(
+        {
+            "id": pd.Categorical(["1", "1", "2"]),
+            "final date": np.array([0, 1, 0], dtype=np.int16),
+            "real": [4.5, 3, 0],
+            "mean": [4.5, 3, 0],
+            "quantile": [4.5, 3, 0],
+        }
+    )
+
+    result = cims.get_kwargs_incremental_from_matches(
+        matches,
+        num_iteration_simulation=(2, 3),
+        id_to_probabilities=id_to_probabilities,
+        metric_type=Variances,
+    )
+
+    assert ExpandingMetricStats(**result).df.equals(ExpandingMetricStats(expected).df)
+
+
+def test_incremental_same_as_window_engine():
+    matches, id_to_probabilities = _get_matches_and_probabilities()
+
+    kwargs = {
+        "num_iteration_simulation": (2, 3),
+        "id_to_probabilities": id_to_probabilities,
+        "metric_type": Variances,
+    }
+    window = cems.get_kwargs_expanding_from_matches(matches, **kwargs)
+    incremental = cims.get_kwargs_incremental_from_matches(matches, **kwargs)
+
+    assert ExpandingMetricStats(**incremental).df.equals(
+        ExpandingMetricStats(**window).df
+    )
+
+
+@pytest.mark.parametrize("name", ["nhhi", "naive_nhhi", "hicb", "normalized_gini"])
+def test_incremental_normalized_same_as_window_engine(name: str):
+    matches, id_to_probabilities = _get_matches_and_probabilities()
+
+    kwargs = {
+        "num_iteration_simulation": (2, 3),
+        "id_to_probabilities": id_to_probabilities,
+        "metric_type": METRIC_MAP[name],
+    }
+    window = cems.get_kwargs_expanding_from_matches(matches, **kwargs)
+    incremental = cims.get_kwargs_incremental_from_matches(matches, **kwargs)
+
+    pd.testing.assert_frame_equal(
+        ExpandingMetricStats(**incremental).df, ExpandingMetricStats(**window).df
+    )
+
+
+def test_get_kwargs_incremental_per_metric_from_matches_same_simulations():
+    cols = {
+        "id": ["1", "1", "1", "1", "2", "2", "2"],
+        "date number": [0, 0, 1, 1, 0, 1, 2],
+        "home": ["A", "C", "A", "B", "a", "b", "c"],
+        "away": ["B", "D", "C", "D", "b", "c", "a"],
+        "winner": ["h", "d", "a", "h", "h", "d", "a"],
+    }
+    matches = Matches(pd.DataFrame(cols))
+    metric_types = {name: METRIC_MAP[name] for name in ("variance", "gini", "iqr")}
+
+    np.random.seed(0)
+    result = cims.get_kwargs_incremental_per_metric_from_matches(
+        matches, (2, 5), quantile=[0.05, 0.95], metric_types=metric_types
+    )
+
+    for name, metric_type in metric_types.items():
+        np.random.seed(0)
+        expected = cims.get_kwargs_incremental_from_matches(
+            matches, (2, 5), quantile=[0.05, 0.95], metric_type=metric_type
+        )
+        pd.testing.assert_frame_equal(result[name]["df"], expected["df"])
+
+
+def test_get_outcome_probabilities():
+    matches, _ = _get_matches_and_probabilities()
+
+    result = cims._get_outcome_probabilities(matches.home_away_winner("winner"))
+
+    assert result.loc["1"] == {"a": 0.5, "h": 0.5}
+    assert result.loc["2"] == {"d": 1.0}
+
+
+def test_get_kwargs_incremental_per_point_system_same_simulations():
+    cols = {
+        "id": ["1", "1", "1", "1", "2", "2", "2"],
+        "date number": [0, 0, 1, 1, 0, 1, 2],
+        "home": ["A", "C", "A", "B", "a", "b", "c"],
+        "away": ["B", "D", "C", "D", "b", "c", "a"],
+        "winner": ["h", "d", "a", "h", "h", "d", "a"],
+    }
+    matches = Matches(pd.DataFrame(cols))
+    outcome_probabilities = {"a": 0.2, "d": 0.3, "h": 0.5}
+
+    point_systems = {
+        "3-1-0": {"h": (3, 0), "d": (1, 1), "a": (0, 3)},
+        "2-1-0": {"h": (2, 0), "d": (1, 1), "a": (0, 2)},
+    }
+    metric_types = {name: METRIC_MAP[name] for name in ("variance", "gini")}
+
+    np.random.seed(0)
+    result = cims.get_kwargs_incremental_per_point_system_from_matches(
+        matches,
+        (2, 5),
+        point_systems,
+        id_to_probabilities=pd.Series({"1": outcome_probabilities, "2": {"h": 1}}),
+        metric_types=metric_types,
+    )
+
+    for system, winner_to_points in point_systems.items():
+        # same (sorted) order as outcomes: "a", "d", "h"
+        pair_probabilities = {
+            winner_to_points[outcome]: p for outcome, p in outcome_probabilities.items()
+        }
+        id_to_probabilities = pd.Series(
+            {"1": pair_probabilities, "2": {winner_to_points["h"]: 1}}
+        )
+
+        np.random.seed(0)
+        expected = cims.get_kwargs_incremental_per_metric_from_matches(
+            matches,
+            (2, 5),
+            winner_to_points=winner_to_points,
+            id_to_probabilities=id_to_probabilities,
+            metric_types=metric_types,
+        )
+        for name in metric_types:
+            pd.testing.assert_frame_equal(
+                result[system][name]["df"], expected[name]["df"]
+            )
@@ -85,6 +85,29 @@ def test_calculate_quantile__two():
     assert cms._calculate_mean_quantile(test, 0.95).equals(expected)
 
 
+def test_calculate_quantile__list():
+    test_cols = {
+        "id": pd.Categorical(["1", "1", "2", "2", "2"]),
+        "final date": [0, 1, 0, 1, 2],
+        "s1": [1, 1, 2, 2, 2],
+        "s2": [0, 1, 0, 1, 2],
+        "s3": [1.2, 0.25, 0.1, 0.65, 0.98],
+    }
+    test = pd.DataFrame(test_cols).set_index(["id", "final date"])
+
+    result = cms._calculate_mean_quantile(test, [0.05, 0.95])
+    assert result.columns.to_list() == ["mean", "quantile 0.05", "quantile 0.95"]
+
+    for quantile in (0.05, 0.95):
+        expected = cms._calculate_mean_quantile(test, quantile)
+        pd.testing.assert_series_equal(
+            result[cms.quantile_column(quantile)],
+            expected["quantile"],
+            check_names=False,
+        )
+        pd.testing.assert_series_equal(result["mean"], expected["mean"])
+
+
 def test_get_kwargs_from_variances():
     test_real_cols = {
         "id": pd.Categorical(["1", "2", "3", "4", "5"]),
@@ -310,3 +333,131 @@ def test_get_kwargs_from_matches_bigger_in_to_probabilities_new_points():
         id_to_probabilities=id_to_prob,
     )
     assert result["df"].equals(expected)
+
+
+def test_quantile_confidence_interval():
+    rng = np.random.default_rng(0)
+    simulated = rng.normal(size=(2000, 200))
+    true_quantile = 1.6448536269514722  # 0.95-quantile of N(0, 1)
+
+    lower, upper = cms.quantile_confidence_interval(simulated, 0.95, 0.05)
+    coverage = np.mean((lower <= true_quantile) & (true_quantile <= upper))
+    assert coverage >= 0.93
+
+    # NaN values are ignored and too few samples give an unbounded interval
+    simulated = np.array([[1, 2, 3, np.nan], [1, 2, 3, 4]], dtype=float)
+    lower, upper = cms.quantile_confidence_interval(simulated, 0.5, 0.5)
+    assert np.array_equal(lower, [1, 1]) and np.array_equal(upper, [3, 4])
+
+    lower, upper = cms.quantile_confidence_interval(simulated, 0.95, 0.01)
+    assert np.all(np.isposinf(upper))
+
+
+def test_get_kwargs_adaptive_from_matches_same_as_full():
+    test_cols = {
+        "id": pd.Categorical(["1", "1", "2", "2", "2"]),
+        "date number": [0, 0, 0, 0, 0],
+        "home": pd.Categorical(["A", "A", "a", "b", "a"]),
+        "away": pd.Categorical(["B", "B", "b", "c", "d"]),
+        "winner": ["a", "a", "d", "d", "d"],
+    }
+    test = Matches(pd.DataFrame(test_cols).set_index(["id", "date number"]))
+    kwargs = {
+        "num_iteration_simulation": (3, 2),
+        "winner_type": "winner",
+        "winner_to_points": {"h": (3, 0), "d": (1, 1), "a": (0, 3)},
+    }
+
+    # simulations are deterministic and equal to the real metric: never decided
+    expected = cms.get_kwargs_from_matches(test, **kwargs)["df"]
+    expected["num simulations"] = 6
+    expected["stopped early"] = False
+
+    result = cms.get_kwargs_adaptive_from_matches(test, **kwargs, error_tolerance=0.1)
+    pd.testing.assert_frame_equal(result["df"], expected, check_dtype=False)
+
+
+def test_get_kwargs_adaptive_from_matches_stops_early():
+    test_cols = {
+        "id": pd.Categorical(["1", "1", "2", "2"]),
+        "date number": [0, 1, 0, 1],
+        "home": pd.Categorical(["A", "B", "a", "b"]),
+        "away": pd.Categorical(["B", "A", "b", "a"]),
+        "winner": ["h", "a", "h", "h"],
+    }
+    test = Matches(pd.DataFrame(test_cols).set_index(["id", "date number"]))
+
+    # "1": A always wins (real variance > 0), but simulations always draw
+    # "2": simulations always repeat the real result
+    id_to_probabilities = pd.Series(
+        {"1": {(1, 1): 1.0}, "2": {(3, 0): 1.0}}, name="probabilities"
+    )
+
+    result = cms.get_kwargs_adaptive_from_matches(
+        test,
+        num_iteration_simulation=(10, 50),
+        winner_type="winner",
+        winner_to_points={"h": (3, 0), "d": (1, 1), "a": (0, 3)},
+        id_to_probabilities=id_to_probabilities,
+        quantile=0.95,
+        metric_type=Variances,
+        error_tolerance=0.01,
+    )["df"]
+
+    # each of the 10 checks uses 0.01 / 10:
+    # 0.95 ** n <= 0.0005 only for n >= 149 (third batch)
+    assert result.loc["1", "num simulations"] == 150
+    assert result.loc["1", "stopped early"]
+    assert result.loc["1", "quantile"] == 0
+
+    assert result.loc["2", "num simulations"] == 500
+    assert not result.loc["2", "stopped early"]
+
+
+def test_get_kwargs_streaming_from_matches_same_as_full():
+    test_cols = {
+        "id": pd.Categorical(["1", "1", "2", "2", "2"]),
+        "date number": [0, 0, 0, 0, 0],
+        "home": pd.Categorical(["A", "A", "a", "b", "a"]),
+        "away": pd.Categorical(["B", "B", "b", "c", "d"]),
+        "winner": ["a", "a", "d", "d", "d"],
+    }
+    test = Matches(pd.DataFrame(test_cols).set_index(["id", "date number"]))
+    kwargs = {
+        "num_iteration_simulation": (3, 2),
+        "winner_type": "winner",
+        "winner_to_points": {"h": (3, 0), "d": (1, 1), "a": (0, 3)},
+    }
+
+    # "2": simulations are deterministic (all draws)
+    expected = cms.get_kwargs_from_matches(test, **kwargs)["df"]
+
+    result = cms.get_kwargs_streaming_from_matches(test, **kwargs)
+    pd.testing.assert_frame_equal(result["df"].loc[["2"]], expected.loc[["2"]])
+    assert result["df"].columns.to_list() == ["real", "mean", "quantile"]
+
+
+def test_get_kwargs_streaming_from_matches_list_of_quantiles():
+    test_cols = {
+        "id": pd.Categorical(["1", "1", "2", "2", "2"]),
+        "date number": [0, 0, 0, 0, 0],
+        "home": pd.Categorical(["A", "A", "a", "b", "a"]),
+        "away": pd.Categorical(["B", "B", "b", "c", "d"]),
+        "winner": ["a", "a", "d", "d", "d"],
+    }
+    test = Matches(pd.DataFrame(test_cols).set_index(["id", "date number"]))
+    kwargs = {
+        "num_iteration_simulation": (3, 2),
+        "winner_type": "winner",
+        "winner_to_points": {"h": (3, 0), "d": (1, 1), "a": (0, 3)},
+    }
+
+    kwargs["quantile"] = [0.05, 0.95]
+
+    result = cms.get_kwargs_streaming_from_matches(test, **kwargs)["df"]
+    expected = cms.get_kwargs_from_matches(test, **kwargs)["df"]
+
+    columns = ["real", "mean", "quantile 0.05", "quantile 0.95"]
+    assert result.columns.to_list() == columns
+    # "2": simulations are deterministic (all draws)
+    pd.testing.assert_frame_equal(result.loc[["2"]], expected.loc[["2"]])
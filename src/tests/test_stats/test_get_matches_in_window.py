@@ -17,57 +17,23 @@ def matches_fixture():
     return Matches(pd.DataFrame(data=cols).set_index(["id", "date number"]))
 
 
-def test_get_mask_inside_interval(matches_fixture: Matches):
-    assert np.all(
-        gmiw._get_mask_inside_interval(matches_fixture, 0, 3) == np.array([True] * 14)
-    )
-
-    expected = [True] * 2 + [False] * 2 + [True] * 4 + [False] * 6
-    assert np.all(
-        gmiw._get_mask_inside_interval(matches_fixture, 0, 0) == np.array(expected)
-    )
-
-    expected = [True] * 12 + [False] * 2
-    assert np.all(
-        gmiw._get_mask_inside_interval(matches_fixture, 0, 2) == np.array(expected)
-    )
-
-    expected = [False] * 2 + [True] * 2 + [False] * 4 + [True] * 4 + [False] * 2
-    assert np.all(
-        gmiw._get_mask_inside_interval(matches_fixture, 1, 2) == np.array(expected)
-    )
-
-    expected = [False] * 10 + [True] * 4
-    assert np.all(
-        gmiw._get_mask_inside_interval(matches_fixture, 2, 5) == np.array(expected)
-    )
-
-
-def test_get_mask_tournaments_not_already_finished(matches_fixture: Matches):
-    assert np.all(
-        gmiw._get_mask_tournaments_not_already_finished(matches_fixture, 0)
-        == np.array([True] * 14)
-    )
-
-    assert np.all(
-        gmiw._get_mask_tournaments_not_already_finished(matches_fixture, 1)
-        == np.array([True] * 14)
-    )
-
-    assert np.all(
-        gmiw._get_mask_tournaments_not_already_finished(matches_fixture, 2)
-        == np.array([False] * 4 + [True] * 10)
-    )
-
-    assert np.all(
-        gmiw._get_mask_tournaments_not_already_finished(matches_fixture, 3)
-        == np.array([False] * 4 + [True] * 10)
-    )
-
-    assert np.all(
-        gmiw._get_mask_tournaments_not_already_finished(matches_fixture, 4)
-        == np.array([False] * 14)
-    )
+@pytest.mark.parametrize(
+    "first_date, last_date, expected",
+    [
+        (0, 0, [0, 1, 4, 5, 6, 7]),
+        (0, 1, list(range(10))),
+        (0, 2, list(range(4, 12))),
+        (1, 2, list(range(8, 12))),
+        (0, 3, list(range(4, 14))),
+        (2, 5, []),
+    ],
+)
+def test_matches_window_index_get_rows(
+    matches_fixture: Matches, first_date: int, last_date: int, expected: list[int]
+):
+    window_index = gmiw.MatchesWindowIndex.from_matches(matches_fixture)
+    rows = window_index.get_rows(first_date, last_date)
+    assert rows.tolist() == expected
 
 
 def test_select_matches_inside_window(matches_fixture: Matches):
@@ -122,3 +88,61 @@ def test_select_matches_inside_window(matches_fixture: Matches):
     }
     expected = pd.DataFrame(data=expected_cols).set_index(["id", "date number"])
     assert gmiw.select_matches_inside_window(matches_fixture, 0, 2).df.equals(expected)
+
+
+def _select_with_masks(matches: Matches, first_date: int, last_date: int) -> Matches:
+    ids = matches.df.index.get_level_values("id")
+    dates = matches.df.index.get_level_values("date number").to_numpy()
+
+    id_to_last_date = pd.Series(dates).groupby(np.asarray(ids)).max()
+    is_inside_interval = (first_date <= dates) & (dates <= last_date)
+    has_not_finished = last_date <= id_to_last_date[np.asarray(ids)].to_numpy()
+
+    return Matches(matches.df[is_inside_interval & has_not_finished])
+
+
+def test_matches_window_index_from_matches(matches_fixture: Matches):
+    window_index = gmiw.MatchesWindowIndex.from_matches(matches_fixture)
+
+    assert window_index.num_tournaments == 2
+    assert window_index.order is None
+    assert window_index.ids.tolist() == ["1", "2"]
+    assert np.array_equal(window_index.first_dates, [0, 0])
+    assert np.array_equal(window_index.last_dates, [1, 3])
+
+
+def test_matches_window_index_select_prefixes(matches_fixture: Matches):
+    window_index = gmiw.MatchesWindowIndex.from_matches(matches_fixture)
+
+    result = window_index.select_prefixes(np.array([0, 1]), np.array([0, 2])).df
+    expected = matches_fixture.df.iloc[[0, 1, 4, 5, 6, 7, 8, 9, 10, 11]]
+    assert result.equals(expected)
+
+    result = window_index.select_prefixes(np.array([1]), np.array([1])).df
+    assert result.equals(matches_fixture.df.iloc[4:10])
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_matches_window_index_same_as_masks(shuffle: bool):
+    rng = np.random.default_rng(0)
+
+    num_dates = [1, 4, 7, 10]
+    dates = np.concatenate([np.repeat(np.arange(n), 2) for n in num_dates])
+    cols = {
+        "id": np.repeat(["a", "b", "c", "d"], [2 * n for n in num_dates]),
+        "date number": dates,
+        "home": rng.integers(0, 5, len(dates)).astype(str),
+        "away": rng.integers(0, 5, len(dates)).astype(str),
+    }
+    df = pd.DataFrame(data=cols).set_index(["id", "date number"])
+    if shuffle:
+        df = df.iloc[rng.permutation(len(df))]
+
+    matches = Matches(df)
+    window_index = gmiw.MatchesWindowIndex.from_matches(matches)
+
+    for first_date in range(-1, 11):
+        for last_date in range(first_date, 12):
+            expected = _select_with_masks(matches, first_date, last_date).df
+            result = window_index.select(first_date, last_date).df
+            assert result.equals(expected)
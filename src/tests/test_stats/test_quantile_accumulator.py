@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from turning_point.metric_stats.quantile_accumulator import (
+    MeanQuantileAccumulator,
+    get_tail_size,
+)
+
+
+def test_get_tail_size():
+    # 99 * 0.95 = 94.05 -> positions 94 and 95 (of 0, ..., 99)
+    assert get_tail_size(100, 0.95) == 6
+    assert get_tail_size(1000, 0.95) == 51
+    assert get_tail_size(100, 0.05) == 6  # 99 * 0.05 = 4.95 -> positions 4, 5
+    assert get_tail_size(3, 0.05) == 2
+    assert get_tail_size(1, 0.95) == 1
+
+
+@pytest.mark.parametrize("quantile", [0.95, 0.5, 0.25, 0.05, 1.0, 0.0])
+@pytest.mark.parametrize("num_simulations, batch_size", [(100, 10), (37, 5), (1, 1)])
+def test_mean_quantile_accumulator(
+    quantile: float, num_simulations: int, batch_size: int
+):
+    rng = np.random.default_rng(0)
+
+    ids = pd.CategoricalIndex([f"{i}" for i in range(10)], name="id")
+    simulated = pd.DataFrame(
+        rng.normal(size=(len(ids), num_simulations)),
+        index=ids,
+        columns=[f"s{i}" for i in range(num_simulations)],
+    )
+    simulated = simulated.mask(rng.random(simulated.shape) < 0.2)
+    simulated.iloc[0] = np.nan  # without any simulation
+    simulated.iloc[1] = simulated.iloc[1].round()  # repeated values
+
+    accumulator = MeanQuantileAccumulator.from_num_simulations(
+        num_simulations, quantile
+    )
+    for first in range(0, num_simulations, batch_size):
+        accumulator.update(simulated.iloc[:, first : first + batch_size])
+        assert accumulator.tail.shape[1] <= accumulator.tail_size
+
+    result = accumulator.to_frame()
+    expected = pd.concat(
+        [
+            simulated.mean(axis=1).rename("mean"),
+            simulated.quantile(quantile, axis=1).rename("quantile"),
+        ],
+        axis=1,
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_mean_quantile_accumulator_aligns_ids():
+    accumulator = MeanQuantileAccumulator.from_num_simulations(4)
+
+    first = pd.DataFrame({"s0": [1.0, 10.0], "s1": [2.0, 20.0]}, index=["a", "b"])
+    second = pd.DataFrame({"s2": [30.0, 3.0], "s3": [40.0, 4.0]}, index=["b", "a"])
+
+    accumulator.update(first)
+    accumulator.update(second)
+
+    result = accumulator.to_frame()
+    assert result["mean"].to_list() == [2.5, 25]
+    assert result["quantile"].to_list() == pytest.approx([3.85, 38.5])
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from synthetic_tournaments.most_imbalanced import (
+    TeamRanks,
+    build_most_imbalanced_tournament,
+)
+
+
+def _get_ppm() -> pd.DataFrame:
+    # id "1": A (3 matches), B (2), C (1); id "2": x (1), y (1)
+    cols = {
+        "id": ["2", "2", "1", "1", "1", "1", "1", "1"],
+        "date number": [0, 0, 0, 0, 1, 1, 2, 2],
+        "team": ["x", "y", "A", "B", "C", "A", "B", "A"],
+        "points": [0.0] * 8,
+    }
+    return pd.DataFrame(cols).set_index(["id", "date number"])
+
+
+def test_team_ranks():
+    team_ranks = TeamRanks.from_points_per_match(_get_ppm())
+
+    assert team_ranks.ids.tolist() == ["1", "2"]
+    assert np.array_equal(team_ranks.id_codes, [1, 1, 0, 0, 0, 0, 0, 0])
+    assert np.array_equal(team_ranks.ranks, [0, 1, 2, 1, 0, 2, 1, 2])
+    assert np.array_equal(team_ranks.opponent_ranks, [1, 0, 1, 2, 2, 0, 2, 1])
+    assert np.array_equal(team_ranks.num_teams, [3, 2])
+
+
+def test_build_most_imbalanced_tournament():
+    ppm = _get_ppm()
+
+    expected = pd.DataFrame(
+        {"team": ppm["team"], "point": [0, 3, 3, 0, 0, 3, 0, 3]}, index=ppm.index
+    )
+
+    assert build_most_imbalanced_tournament(ppm).equals(expected)
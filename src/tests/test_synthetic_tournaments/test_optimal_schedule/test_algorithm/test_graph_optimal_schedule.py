@@ -1,59 +1,58 @@
 from itertools import permutations
 from typing import Callable
 
-import networkx as nx
 import numpy as np
 
 import synthetic_tournaments.optimal_schedule.algorithm.graph_optimal_schedule as gos
 
 
-def test_create_weighted_graph__empty():
-    empty_result = gos._create_weighted_graph([], lambda x, y: x - y)
-    assert len(empty_result.edges) == 0
+def test_create_weight_matrix__empty():
+    empty_result = gos._create_weight_matrix([], lambda x, y: x - y)
+    assert empty_result.shape == (0, 0)
 
 
-def test_create_weighted_graph():
+def test_create_weight_matrix():
     strengths = [0, 1, 2]
     strengths_to_skill_diff = lambda x, y: abs(x - y) ** 2
-    expected = {
-        (0, 1): {"weight": 1},
-        (0, 2): {"weight": 4},
-        (1, 2): {"weight": 1},
-    }
-
-    result = gos._create_weighted_graph(strengths, strengths_to_skill_diff)
-    result_edges = {
-        tuple(sorted(edge)): result.get_edge_data(*edge) for edge in result.edges
-    }
-    assert result_edges == expected
+    expected = np.array(
+        [
+            [0, 1, 4],
+            [1, 0, 1],
+            [4, 1, 0],
+        ]
+    )
+
+    result = gos._create_weight_matrix(strengths, strengths_to_skill_diff)
+    assert np.array_equal(result, expected)
 
     strengths = [0, 1, 2, 3]
     strengths_to_skill_diff = lambda x, y: abs(x - y)
-    expected = {
-        (0, 1): {"weight": 1},
-        (0, 2): {"weight": 2},
-        (0, 3): {"weight": 3},
-        (1, 2): {"weight": 1},
-        (1, 3): {"weight": 2},
-        (2, 3): {"weight": 1},
-    }
-
-    result = gos._create_weighted_graph(strengths, strengths_to_skill_diff)
-    result_edges = {
-        tuple(sorted(edge)): result.get_edge_data(*edge) for edge in result.edges
-    }
-    assert result_edges == expected
+    expected = np.array(
+        [
+            [0, 1, 2, 3],
+            [1, 0, 1, 2],
+            [2, 1, 0, 1],
+            [3, 2, 1, 0],
+        ]
+    )
+
+    result = gos._create_weight_matrix(strengths, strengths_to_skill_diff)
+    assert np.array_equal(result, expected)
 
 
 def test_sort_round__empty():
-    result = gos._sort_round(nx.Graph(), [])
+    result = gos._sort_round(np.zeros((0, 0)), [])
     assert result == tuple()
 
 
 def test_sort_round():
-    edge_weights = [(0, 1, 4), (0, 2, 3), (1, 2, 3)]
-    graph = nx.Graph()
-    graph.add_weighted_edges_from(edge_weights)
+    weights = np.array(
+        [
+            [0, 4, 3],
+            [4, 0, 3],
+            [3, 3, 0],
+        ]
+    )
 
     all_expected = [
         ((0, 1),),
@@ -63,7 +62,7 @@ def test_sort_round():
     ]
     for expected in all_expected:
         for round_ in permutations(expected, r=len(expected)):
-            assert expected == gos._sort_round(graph, round_)
+            assert expected == gos._sort_round(weights, round_)
 
 
 def generate_optimal_graph_schedule__empty():
@@ -0,0 +1,55 @@
+import networkx as nx
+import numpy as np
+
+from synthetic_tournaments.optimal_schedule.algorithm.max_weight_matching import (
+    max_weight_matching,
+)
+
+
+def _to_graph(weights: np.ndarray, is_edge: np.ndarray) -> nx.Graph:
+    graph = nx.Graph()
+    graph.add_nodes_from(range(len(weights)))
+
+    for i, j in zip(*np.nonzero(np.triu(is_edge, k=1))):
+        graph.add_edge(int(i), int(j), weight=float(weights[i, j]))
+
+    return graph
+
+
+def test_max_weight_matching__empty():
+    assert max_weight_matching(np.zeros((0, 0)), np.zeros((0, 0), dtype=bool)) == set()
+
+
+def test_max_weight_matching():
+    # path 0 - 1 - 2 - 3: matching both outer edges is better than the inner one
+    weights = np.array(
+        [
+            [0, 2, 0, 0],
+            [2, 0, 3, 0],
+            [0, 3, 0, 2],
+            [0, 0, 2, 0],
+        ]
+    )
+    is_edge = weights > 0
+
+    assert max_weight_matching(weights, is_edge) == {(0, 1), (2, 3)}
+
+
+def test_max_weight_matching_same_as_networkx():
+    rng = np.random.default_rng(0)
+
+    for _ in range(300):
+        num_vertices = rng.integers(1, 12)
+        shape = (num_vertices, num_vertices)
+
+        # integer weights have many ties (and negative weights are never matched)
+        weights = np.triu(rng.integers(-2, 5, shape), k=1).astype(float)
+        weights = weights + weights.T
+
+        is_edge = np.triu(rng.random(shape) < rng.random(), k=1)
+        is_edge = is_edge | is_edge.T
+
+        expected = nx.max_weight_matching(_to_graph(weights, is_edge))
+        expected = {tuple(sorted(match)) for match in expected}
+
+        assert max_weight_matching(weights, is_edge) == expected
@@ -0,0 +1,42 @@
+import numpy as np
+
+import synthetic_tournaments.optimal_schedule.algorithm as alg
+
+
+def test_schedule_template_round_trip():
+    schedule = [((0, 3), (1, 2)), ((0, 2),), ()]
+
+    template = alg.ScheduleTemplate.from_schedule(schedule)
+
+    assert np.array_equal(template.matches, [[0, 3], [1, 2], [0, 2]])
+    assert np.array_equal(template.round_offsets, [0, 2, 3, 3])
+    assert template.to_schedule() == schedule
+
+
+def test_with_template_cache_same_schedules():
+    for optimal_fn in (
+        alg.generate_optimal_graph_schedule,
+        alg.generate_recursive_optimal_schedule,
+    ):
+        cached_fn = alg.with_template_cache(optimal_fn)
+
+        for num_teams in range(1, 11):
+            assert cached_fn(num_teams) == optimal_fn(num_teams)
+
+        strengths = [5.0, 1.0, 3.0, 2.0]
+        assert cached_fn(strengths) == optimal_fn(strengths)
+
+
+def test_with_template_cache_computes_once():
+    calls = []
+
+    def _optimal_fn(num_teams: int):
+        calls.append(num_teams)
+        return alg.generate_recursive_optimal_schedule(num_teams)
+
+    cached_fn = alg.with_template_cache(_optimal_fn)
+
+    first, second = cached_fn(6), cached_fn(6)
+
+    assert first == second
+    assert calls == [6]
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+import turning_point.normal_coefficient.calculate_backward_turning_point as cbtp
+from tournament_simulations.data_structures import Matches
+from turning_point.metric_stats import ExpandingMetricStats
+from turning_point.normal_coefficient import TurningPoint
+
+
+def test_turning_point_from_trailing_run():
+    num_windows = np.array([4, 2, 2, 7])
+    trailing_run = np.array([2, 0, 2, 1])
+
+    turning_points, percents = cbtp._turning_point_from_trailing_run(
+        num_windows, trailing_run
+    )
+    assert turning_points == [2, np.inf, 0, 6]
+    assert percents == [3 / 4, np.inf, 1 / 2, 1]
+
+
+def test_get_kwargs_backward_from_matches():
+    test_cols = {
+        "id": ["1", "1", "1", "1", "2", "2", "3", "3"],
+        "date number": [0, 1, 2, 3, 0, 1, 0, 1],
+        "home": ["A", "A", "A", "A", "A", "B", "A", "A"],
+        "away": ["B", "B", "B", "B", "B", "A", "B", "B"],
+        "winner": ["d", "d", "h", "d", "h", "h", "h", "h"],
+    }
+    matches = Matches(pd.DataFrame(test_cols).set_index(["id", "date number"]))
+
+    # simulations are always draws: simulated variance is always 0
+    id_to_probabilities = pd.Series({id_: {(1, 1): 1.0} for id_ in ["1", "2", "3"]})
+    kwargs = {
+        "num_iteration_simulation": (1, 5),
+        "winner_type": "winner",
+        "winner_to_points": {"h": (3, 0), "d": (1, 1), "a": (0, 3)},
+        "id_to_probabilities": id_to_probabilities,
+    }
+
+    result = cbtp.get_kwargs_backward_from_matches(matches, **kwargs)
+
+    expected = TurningPoint.from_expanding_var_stats(
+        ExpandingMetricStats.from_matches(matches, **kwargs)
+    )
+    assert TurningPoint(result["df"]).df.equals(expected.df)
+
+    # "1": windows 3, 2, 1 | "2": window 1 | "3": windows 1, 0
+    evaluated = ExpandingMetricStats(result["expanding_stats"]).df.index
+    assert evaluated.tolist() == [
+        ("1", 1),
+        ("1", 2),
+        ("1", 3),
+        ("2", 1),
+        ("3", 0),
+        ("3", 1),
+    ]
@@ -67,3 +67,63 @@ def test_get_kwargs_from_expanding_variances_stats():
 
     turning_point = ctp.get_kwargs_from_expanding_variances_stats(var_quantile)["df"]
     assert turning_point.equals(expected)
+
+
+def test_find_turning_points():
+    sequences = [
+        [True, True],
+        [True, False, False],
+        [True, False, True, True],
+        [False],
+        [True],
+        [True, False, False, True, False, False, True],
+    ]
+    id_codes = np.repeat(np.arange(len(sequences)), [len(seq) for seq in sequences])
+    is_outside = np.concatenate([np.array(seq, dtype=bool) for seq in sequences])
+
+    starts, turning_point, percent = ctp.find_turning_points(id_codes, is_outside)
+
+    assert starts.tolist() == [0, 2, 5, 9, 10, 11]
+    expected = [ctp._find_turning_point_one_id(seq) for seq in sequences]
+    assert turning_point.tolist() == expected
+    expected = [ctp._find_turning_point_percent_one_id(seq) for seq in sequences]
+    assert percent.tolist() == expected
+
+
+def test_find_turning_points_random():
+    rng = np.random.default_rng(0)
+
+    sizes = rng.integers(1, 10, size=50)
+    id_codes = np.repeat(np.arange(len(sizes)), sizes)
+    is_outside = rng.random(len(id_codes)) < 0.7
+
+    _, turning_point, percent = ctp.find_turning_points(id_codes, is_outside)
+
+    sequences = np.split(is_outside, np.cumsum(sizes)[:-1])
+    expected = [ctp._find_turning_point_one_id(seq) for seq in sequences]
+    assert turning_point.tolist() == expected
+    expected = [ctp._find_turning_point_percent_one_id(seq) for seq in sequences]
+    assert percent.tolist() == expected
+
+
+def test_get_kwargs_from_expanding_variances_stats_comparison():
+    var_quantile = ExpandingMetricStats(
+        pd.DataFrame(
+            {
+                "id": pd.Categorical(["2", "2", "2", "1", "1"]),
+                "final date": [2, 0, 1, 1, 0],
+                "real": [5, 2, 2, 3, 1],
+                "mean": [4, 2, 3, 1, 0],
+                "quantile": [6, 1, 3, 2, 0],
+            }
+        ).set_index(["id", "final date"])
+    )
+
+    lower = ctp.get_kwargs_from_expanding_variances_stats(var_quantile, "lower")["df"]
+    assert lower["turning point"].tolist() == [np.inf, 1]
+    assert lower["%turning point"].tolist() == [np.inf, 2 / 3]
+
+    mean = ctp.get_kwargs_from_expanding_variances_stats(var_quantile, "mean")["df"]
+    assert mean.index.tolist() == ["1", "2"]
+    assert mean["turning point"].tolist() == [0, 2]
+    assert mean["%turning point"].tolist() == [0.5, 1]
@@ -5,6 +5,7 @@ import pandas as pd
 
 from logs import log, turning_logger
 from tournament_simulations.data_structures import Matches
+from turning_point.metric_stats.get_matches_in_window import MatchesWindowIndex
 from turning_point.normal_coefficient import TurningPoint
 
 KwargsMTP = dict[Literal["df"], pd.DataFrame]
@@ -24,6 +25,62 @@ def _count_number_and_percentage_of_matches_in_interval(
     return num_matches, num_matches / len(matches.df.loc[tourney_id])
 
 
+def count_matches_before_turning_points(
+    window_index: MatchesWindowIndex, ids: pd.Index, turning_points: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized `_count_number_and_percentage_of_matches_in_interval`.
+
+    Rows of `window_index` are sorted by (id, date number), so the number of
+    matches of a tournament before a date is the distance between two
+    positions of its sorted keys (found by binary search).
+
+    ----
+    Parameters:
+        window_index: MatchesWindowIndex
+            Index of the tournament matches.
+
+        ids: pd.Index
+            Tournament of each turning point. Permuted tournaments
+            ("{id}@{permutation_id}") are looked up by their full id,
+            as any other tournament.
+
+        turning_points: np.ndarray[float]
+            Turning point of each tournament.
+
+    ----
+    Returns:
+        tuple[np.ndarray[float], np.ndarray[float]]
+            Number and percentage of matches until each turning point.
+            np.inf and np.nan turning points are returned unchanged.
+    """
+    turning_points = np.asarray(turning_points, dtype=float)
+    num_matches = turning_points.copy()
+    percent_matches = turning_points.copy()
+
+    is_finite = np.isfinite(turning_points)
+    id_positions = window_index.ids.get_indexer(ids[is_finite])
+
+    if np.any(id_positions == -1):
+        missing = ids[is_finite][id_positions == -1]
+        raise KeyError(f"Tournaments not found in matches: {list(missing)}")
+
+    stride = window_index.date_stride
+    base = id_positions.astype(np.int64) * stride
+
+    # turning point is the the date after changing
+    last_key = base + np.clip(turning_points[is_finite], 0, stride - 1)
+
+    starts = np.searchsorted(window_index.keys, base, side="left")
+    before = np.searchsorted(window_index.keys, last_key, side="left")
+    ends = np.searchsorted(window_index.keys, base + stride, side="left")
+
+    num_matches[is_finite] = before - starts
+    percent_matches[is_finite] = (before - starts) / (ends - starts)
+
+    return num_matches, percent_matches
+
+
 @log(turning_logger.debug)
 def get_kwargs_from_matches_turning_point(
     matches: Matches, turning_point: TurningPoint
@@ -47,18 +104,20 @@ def get_kwargs_from_matches_turning_point(
     """
 
     tp_col = turning_point.df["turning point"]
-    id_to_tuple_id__turning_point = pd.Series(index=tp_col.index, data=tp_col.items())
 
-    # returns series of tuples -> (number of matches, percentage of matches)
-    num_match_and_percent_tp = id_to_tuple_id__turning_point.apply(
-        _count_number_and_percentage_of_matches_in_interval,
-        matches=matches,
+    num_matches, percent_matches = count_matches_before_turning_points(
+        MatchesWindowIndex.from_matches(matches),
+        tp_col.index,
+        tp_col.to_numpy(dtype=float),
     )
 
+    # integers (same as counting each tournament) if there is no inf or nan
+    if np.isfinite(num_matches).all():
+        num_matches = num_matches.astype(np.int64)
+
     percent_match_tp = pd.DataFrame(
-        num_match_and_percent_tp.to_list(),
-        index=num_match_and_percent_tp.index,
-        columns=["match turning point", "%match turning point"],
+        {"match turning point": num_matches, "%match turning point": percent_matches},
+        index=tp_col.index,
     )
 
     return {"df": percent_match_tp}
@@ -7,7 +7,7 @@ from logs import log, log_iterations, turning_logger
 from tournament_simulations.data_structures import Matches
 from turning_point.metrics import Metric, Variances
 
-from .get_matches_in_window import select_matches_inside_window
+from .get_matches_in_window import MatchesWindowIndex
 from .metric_stats import RESULT_TO_POINTS, SimulationMetricStats
 
 KwargsEW = dict[Literal["df"], pd.DataFrame]
@@ -30,12 +30,11 @@ def _expanding_template(
     all_results: list[pd.DataFrame] = []
 
     last_date = matches.df.index.get_level_values("date number").max()
+    window_index = MatchesWindowIndex.from_matches(matches)
 
     dates = range(last_date + 1)
     for date in log_iterations(dates, turning_logger.info, every_n=10):
-        matches_window = select_matches_inside_window(
-            matches, first_date=0, last_date=date
-        )
+        matches_window = window_index.select(first_date=0, last_date=date)
 
         df = expanding_func(matches_window, *args, **kwargs)
         df["final date"] = np.int16(date)  # save corresponding date
@@ -52,8 +51,10 @@ def get_kwargs_expanding_from_matches(
     winner_type: Literal["winner", "result"] = "winner",
     winner_to_points: Mapping[str, tuple[float, float]] = RESULT_TO_POINTS,
     id_to_probabilities: pd.Series | None = None,
-    quantile: float | None = None,
+    quantile: float | list[float] | None = None,
     metric_type: type[Metric] = Variances,
+    error_tolerance: float | None = None,
+    streaming: bool = False,
 ) -> KwargsEW:
     """
     Iterated dynamic skill coefficient and removed teams for all possible
@@ -103,14 +104,25 @@ def get_kwargs_expanding_from_matches(
 
             If None, they will be estimated directly from 'matches'.
 
-        quantile: float | None = None
+        quantile: float | list[float] | None = None
             Desired quantile value.
 
             If None, defaults to 0.95.
 
+            If it is a list, all quantiles are calculated from the same
+            simulations, each one in its own "quantile {q}" column.
+
         metric_type: type[Metric] = Variances
             Which metric should be used.
 
+        error_tolerance: float | None = None
+            If not None, each window stops being simulated as soon as it is
+            decided (see `SimulationMetricStats.from_matches`).
+
+        streaming: bool = False
+            If True, simulated metrics of each window are reduced to mean and
+            quantile one batch at a time (see `SimulationMetricStats.from_matches`).
+
     -----
     Returns:
         Kwargs parameters required to create and instance of ExpandingCoefAndTeams
@@ -132,6 +144,71 @@ def get_kwargs_expanding_from_matches(
         id_to_probabilities=id_to_probabilities,
         quantile=quantile,
         metric_type=metric_type,
+        error_tolerance=error_tolerance,
+        streaming=streaming,
     )
 
     return {"df": expading_df}
+
+
+@log(turning_logger.debug)
+def get_kwargs_expanding_per_metric_from_matches(
+    matches: Matches,
+    num_iteration_simulation: tuple[int, int],
+    winner_type: Literal["winner", "result"] = "winner",
+    winner_to_points: Mapping[str, tuple[float, float]] = RESULT_TO_POINTS,
+    id_to_probabilities: pd.Series | None = None,
+    quantile: float | list[float] | None = None,
+    metric_types: Mapping[str, type[Metric]] | None = None,
+    streaming: bool = False,
+) -> dict[str, KwargsEW]:
+    """
+    Same as `get_kwargs_expanding_from_matches` for every metric, but each
+    window is simulated only once: every metric is calculated from the same
+    simulated tournaments (see `SimulationMetricStats.from_matches_per_metric`).
+
+    -----
+    Parameters:
+
+        metric_types: Mapping[str, type[Metric]] | None = None
+            Metrics that should be calculated.
+
+            None: {"variance": Variances}
+
+        Others: same as `get_kwargs_expanding_from_matches`.
+
+    -----
+    Returns:
+        dict[str, KwargsEW]
+            Kwargs parameters required to create an instance of
+            ExpandingMetricStats for each metric (same keys as `metric_types`).
+    """
+    if metric_types is None:
+        metric_types = {"variance": Variances}
+
+    all_results: dict[str, list[pd.DataFrame]] = {name: [] for name in metric_types}
+
+    last_date = matches.df.index.get_level_values("date number").max()
+    window_index = MatchesWindowIndex.from_matches(matches)
+
+    dates = range(last_date + 1)
+    for date in log_iterations(dates, turning_logger.info, every_n=10):
+        matches_window = window_index.select(first_date=0, last_date=date)
+
+        name_to_stats = SimulationMetricStats.from_matches_per_metric(
+            matches_window,
+            num_iteration_simulation,
+            winner_type,
+            winner_to_points,
+            id_to_probabilities,
+            quantile,
+            metric_types,
+            streaming,
+        )
+        for name, stats in name_to_stats.items():
+            df = stats.df
+            df["final date"] = np.int16(date)  # save corresponding date
+
+            all_results[name].append(df)
+
+    return {name: {"df": pd.concat(results)} for name, results in all_results.items()}
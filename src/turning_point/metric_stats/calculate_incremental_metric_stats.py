@@ -0,0 +1,581 @@
+from typing import Literal, Mapping
+
+import numpy as np
+import pandas as pd
+
+from logs import log, log_iterations, turning_logger
+from tournament_simulations.data_structures import Matches, PointsPerMatch
+from turning_point.metrics import Metric, StandingsTensor, Variances
+
+from .metric_stats import RESULT_TO_POINTS, SimulationMetricStats
+
+KwargsIEW = dict[Literal["df"], pd.DataFrame]
+
+
+def _get_point_pairs(
+    winner_to_points: Mapping[str, tuple[float, float]]
+) -> list[tuple[float, float]]:
+    return sorted(set(tuple(points) for points in winner_to_points.values()))
+
+
+def _get_cumulative_probabilities(
+    id_to_probabilities: pd.Series,
+    id_categories: pd.Index,
+    point_pairs: list,
+) -> np.ndarray:
+    """
+    ----
+    Parameters:
+        point_pairs: list
+            Keys of the probabilities: point pairs or outcomes (winner/result).
+
+    ----
+    Returns:
+        np.ndarray[float]: (number of ids, number of point pairs)
+            Cumulative probability of each point pair for each tournament.
+
+            Tournaments without probabilities (unobserved categories)
+            are filled with zeros.
+    """
+    probabilities = np.zeros((len(id_categories), len(point_pairs)))
+
+    for code, id_ in enumerate(id_categories):
+        if id_ not in id_to_probabilities.index:
+            continue
+
+        pair_to_probability = id_to_probabilities.loc[id_]
+        probabilities[code] = [pair_to_probability.get(p, 0) for p in point_pairs]
+
+    return np.cumsum(probabilities, axis=1)
+
+
+def _sample_point_pairs(
+    cumulative_probabilities: np.ndarray,
+    num_iteration_simulation: tuple[int, int],
+) -> np.ndarray:
+    """
+    Sample which point pair each match resulted in.
+
+    ----
+    Parameters:
+        cumulative_probabilities: np.ndarray[float]
+            (number of matches, number of point pairs)
+
+        num_iteration_simulation: tuple[int, int]
+            Respectively, number of iterations and number of
+            simulations per iteration (batch size).
+
+    ----
+    Returns:
+        np.ndarray[int]: (number of matches, number of simulations)
+            Index of the sampled point pair.
+    """
+    num_iteration, num_simulation_per_iter = num_iteration_simulation
+    last_pair = cumulative_probabilities.shape[1] - 1
+
+    cumulative = cumulative_probabilities[:, np.newaxis, :]
+
+    all_sampled: list[np.ndarray] = []
+    for _ in range(num_iteration):
+        shape = (len(cumulative_probabilities), num_simulation_per_iter)
+        uniform = np.random.random(shape)[:, :, np.newaxis]
+
+        sampled = (uniform >= cumulative).sum(axis=2)
+        all_sampled.append(np.minimum(sampled, last_pair))
+
+    return np.concatenate(all_sampled, axis=1)
+
+
+def _get_match_pairs(
+    home_slots: np.ndarray, away_slots: np.ndarray, num_slots: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Unordered pair of teams (slots) of each match.
+
+    ----
+    Returns:
+        tuple[np.ndarray[int], np.ndarray[int]]
+            (number of matches,): position of each match's pair.
+
+            (number of pairs, 2): slots of each pair (lower, upper).
+    """
+    lower_slots = np.minimum(home_slots, away_slots).astype(np.int64)
+    upper_slots = np.maximum(home_slots, away_slots).astype(np.int64)
+
+    pair_keys, match_pairs = np.unique(
+        lower_slots * num_slots + upper_slots, return_inverse=True
+    )
+    pair_slots = np.stack([pair_keys // num_slots, pair_keys % num_slots], axis=1)
+    return match_pairs.reshape(-1), pair_slots
+
+
+def _get_most_imbalanced_points(
+    pair_slots: np.ndarray,
+    pair_counts: np.ndarray,
+    slot_matches: np.ndarray,
+) -> np.ndarray:
+    """
+    Same standings as `build_most_imbalanced_tournament`, but calculated from
+    the number of matches between each pair of teams (slots), so they do not
+    depend on how many dates were played.
+
+    Every match is won (3 points) by the team with the most matches, ties
+    broken by team order (slots of each tournament are sorted by team).
+
+    ----
+    Parameters:
+        pair_slots: np.ndarray[int] (number of pairs, 2)
+            Slots of each pair (see `_get_match_pairs`).
+
+        pair_counts: np.ndarray[int] (number of pairs,)
+            Number of matches between each pair.
+
+        slot_matches: np.ndarray[int] (number of slots,)
+            Number of matches of each slot.
+
+    ----
+    Returns:
+        np.ndarray[float] (number of slots,)
+            Points of each slot.
+    """
+    lower, upper = pair_slots[:, 0], pair_slots[:, 1]
+
+    is_lower_winner = slot_matches[lower] > slot_matches[upper]
+    winners = np.where(is_lower_winner, lower, upper)
+
+    return np.bincount(winners, weights=3 * pair_counts, minlength=len(slot_matches))
+
+
+def _normalizes_from_tensor(metric_type: type[Metric]) -> bool:
+    return metric_type.normalize_from_tensor is not Metric.normalize_from_tensor
+
+
+@log(turning_logger.debug)
+def get_kwargs_incremental_from_matches(
+    matches: Matches,
+    num_iteration_simulation: tuple[int, int],
+    winner_type: Literal["winner", "result"] = "winner",
+    winner_to_points: Mapping[str, tuple[float, float]] = RESULT_TO_POINTS,
+    id_to_probabilities: pd.Series | None = None,
+    quantile: float | list[float] | None = None,
+    metric_type: type[Metric] = Variances,
+    error_tolerance: float | None = None,
+    streaming: bool = False,
+) -> KwargsIEW:
+    """
+    Same output as `get_kwargs_expanding_from_matches`, but each date is
+    simulated only once.
+
+    Running point totals (real and simulated) are kept for every team and
+    updated one date at a time. Each expanding window metric is then calculated
+    from the accumulated standings (StandingsTensor), so the cost is linear in
+    the number of dates.
+
+    Remark: Simulations are shared between windows, that is, the window
+    [0, ..., t] of the i-th simulation is a prefix of its window [0, ..., t + 1].
+    For that reason, if `id_to_probabilities` is None, probabilities are estimated
+    from all matches of each tournament (instead of only the window ones).
+
+    -----
+    Parameters:
+
+        matches: Matches
+            Tournament matches.
+
+        num_iteration_simulation: tuple[int, int]
+            Respectively, number of iterations and number of
+            simulations per iteration (batch size).
+
+        winner_type: Literal["winner", "result"] = "winner"
+            What should points be based on.
+                match: winner of the match
+                    home: "h"
+                    draw: "d"
+                    away: "a"
+                result: result of match: f{score home team}-{score away team}"
+
+        winner_to_points: Mapping[str, tuple[float, float]]
+            Mapping winner/result to how many points each team should gain.
+
+            First tuple value is for home-team and the second one for away-team.
+
+        id_to_probabilities: pd.Series | None = None
+            Series mapping each tournament to its estimated probabilities.
+
+            Probabilities:  Mapping[tuple[float, float]: float]
+                Maps each pair (tuple) to its probability (float).
+
+                Pair: ranking points gained respectively by home-team and away-team.
+
+            If None, they will be estimated directly from 'matches'.
+
+        quantile: float | list[float] | None = None
+            Desired quantile value.
+
+            If None, defaults to 0.95.
+
+            If it is a list, all quantiles are calculated from the same
+            simulations, each one in its own "quantile {q}" column.
+
+        metric_type: type[Metric] = Variances
+            Which metric should be used.
+
+        error_tolerance: float | None = None
+            Early stopping is not supported (simulations are shared between
+            windows, so they cannot stop independently). Must be None.
+
+        streaming: bool = False
+            Not supported (running totals of every simulation are needed
+            until the last date). Must be False.
+
+    -----
+    Returns:
+        Kwargs parameters required to create and instance of ExpandingMetricStats
+            "df": Metric stats dataframe for all windows.
+    """
+    if error_tolerance is not None:
+        raise ValueError("Early stopping is only supported by the 'window' engine.")
+
+    parameters = get_kwargs_incremental_per_metric_from_matches(
+        matches,
+        num_iteration_simulation,
+        winner_type,
+        winner_to_points,
+        id_to_probabilities,
+        quantile,
+        {"metric": metric_type},
+        streaming,
+    )
+    return parameters["metric"]
+
+
+@log(turning_logger.debug)
+def get_kwargs_incremental_per_metric_from_matches(
+    matches: Matches,
+    num_iteration_simulation: tuple[int, int],
+    winner_type: Literal["winner", "result"] = "winner",
+    winner_to_points: Mapping[str, tuple[float, float]] = RESULT_TO_POINTS,
+    id_to_probabilities: pd.Series | None = None,
+    quantile: float | list[float] | None = None,
+    metric_types: Mapping[str, type[Metric]] | None = None,
+    streaming: bool = False,
+) -> dict[str, KwargsIEW]:
+    """
+    Same as `get_kwargs_incremental_from_matches` for every metric, but each
+    date is simulated only once for all of them: every metric is calculated
+    from the same standings.
+
+    ----
+    Parameters:
+
+        metric_types: Mapping[str, type[Metric]] | None = None
+            Metrics that should be calculated.
+
+            None: {"variance": Variances}
+
+        Others: same as `get_kwargs_incremental_from_matches`.
+
+    ----
+    Returns:
+        dict[str, KwargsIEW]
+            Kwargs parameters required to create an instance of
+            ExpandingMetricStats for each metric (same keys as `metric_types`).
+    """
+    if streaming:
+        raise ValueError("Streaming is only supported by the 'window' engine.")
+
+    ppm = PointsPerMatch.from_home_away_winner(
+        home_away_winner=matches.home_away_winner(winner_type),
+        result_to_points=winner_to_points,
+    )
+    point_pairs = _get_point_pairs(winner_to_points)
+
+    if id_to_probabilities is None:
+        id_to_probabilities = ppm.probabilities_per_id(point_pairs)
+
+    # each point pair is its own outcome
+    parameters = _incremental_template(
+        {"points": ppm},
+        {"points": np.array(point_pairs, dtype=float)},
+        point_pairs,
+        id_to_probabilities,
+        num_iteration_simulation,
+        quantile,
+        metric_types,
+    )
+    return parameters["points"]
+
+
+def _get_outcome_probabilities(home_away_winner: pd.DataFrame) -> pd.Series:
+    """
+    Same as `PointsPerMatch.probabilities_per_id`, but for outcomes
+    (winner/result) instead of point pairs.
+    """
+    winner = home_away_winner["winner"].astype(str)
+    frequencies = winner.groupby(level="id", observed=True).value_counts(normalize=True)
+
+    return pd.Series(
+        {
+            id_: id_frequencies.droplevel("id").to_dict()
+            for id_, id_frequencies in frequencies.groupby(level="id", observed=True)
+        },
+        dtype=object,
+    )
+
+
+@log(turning_logger.debug)
+def get_kwargs_incremental_per_point_system_from_matches(
+    matches: Matches,
+    num_iteration_simulation: tuple[int, int],
+    point_systems: Mapping[str, Mapping[str, tuple[float, float]]],
+    winner_type: Literal["winner", "result"] = "winner",
+    id_to_probabilities: pd.Series | None = None,
+    quantile: float | list[float] | None = None,
+    metric_types: Mapping[str, type[Metric]] | None = None,
+) -> dict[str, dict[str, KwargsIEW]]:
+    """
+    Same as `get_kwargs_incremental_per_metric_from_matches` for every point
+    system, but outcomes (winner/result) are simulated only once.
+
+    Simulated outcomes are stored as small integer codes (int8), and the
+    points of each point system are derived from them with a lookup table.
+    So point systems are compared on the same simulated tournaments.
+
+    ----
+    Parameters:
+
+        point_systems: Mapping[str, Mapping[str, tuple[float, float]]]
+            Maps each point system name to its `winner_to_points`.
+
+            Every point system must map all outcomes found in `matches`.
+
+        id_to_probabilities: pd.Series | None = None
+            Series mapping each tournament to its estimated probabilities.
+
+            Probabilities:  Mapping[str: float]
+                Maps each outcome (winner/result) to its probability (float).
+
+            If None, they will be estimated directly from 'matches'.
+
+        Others: same as `get_kwargs_incremental_per_metric_from_matches`.
+
+    ----
+    Returns:
+        dict[str, dict[str, KwargsIEW]]
+            Kwargs parameters required to create an instance of
+            ExpandingMetricStats for each point system (same keys as
+            `point_systems`) and metric (same keys as `metric_types`).
+    """
+    home_away_winner = matches.home_away_winner(winner_type)
+    outcomes = sorted(home_away_winner["winner"].astype(str).unique())
+
+    ppms = {
+        name: PointsPerMatch.from_home_away_winner(
+            home_away_winner=home_away_winner, result_to_points=winner_to_points
+        )
+        for name, winner_to_points in point_systems.items()
+    }
+    outcome_points = {
+        name: np.array([winner_to_points[o] for o in outcomes], dtype=float)
+        for name, winner_to_points in point_systems.items()
+    }
+
+    if id_to_probabilities is None:
+        id_to_probabilities = _get_outcome_probabilities(home_away_winner)
+
+    return _incremental_template(
+        ppms,
+        outcome_points,
+        outcomes,
+        id_to_probabilities,
+        num_iteration_simulation,
+        quantile,
+        metric_types,
+    )
+
+
+def _incremental_template(
+    ppms: Mapping[str, PointsPerMatch],
+    outcome_points: Mapping[str, np.ndarray],
+    outcomes: list,
+    id_to_probabilities: pd.Series,
+    num_iteration_simulation: tuple[int, int],
+    quantile: float | list[float] | None = None,
+    metric_types: Mapping[str, type[Metric]] | None = None,
+) -> dict[str, dict[str, KwargsIEW]]:
+    """
+    Incremental engine shared by every point system.
+
+    Each match outcome is simulated once (as an index of `outcomes`) and
+    converted to points of each point system with `outcome_points`.
+
+    ----
+    Parameters:
+        ppms: Mapping[str, PointsPerMatch]
+            Real points of each point system. All of them must come from the
+            same matches (same rows).
+
+        outcome_points: Mapping[str, np.ndarray[float]]
+            (number of outcomes, 2) for each point system: points gained
+            respectively by home-team and away-team in each outcome.
+
+        outcomes: list
+            Keys of the probabilities in `id_to_probabilities`.
+
+        Others: same as `get_kwargs_incremental_per_metric_from_matches`.
+
+    ----
+    Returns:
+        dict[str, dict[str, KwargsIEW]]
+            Kwargs parameters for each point system and metric.
+    """
+    if metric_types is None:
+        metric_types = {"variance": Variances}
+
+    df = next(iter(ppms.values())).df
+
+    # Row information (each match is a pair of rows: home team and then away team)
+    ids = pd.Categorical(df.index.get_level_values("id"))
+    teams = pd.Categorical(df["team"])
+    row_dates = df.index.get_level_values("date number").to_numpy()
+    row_points = {
+        system: ppm.df["points"].to_numpy(dtype=float) for system, ppm in ppms.items()
+    }
+
+    # Slot: (id, team) pair -> position in the running totals
+    num_team_categories = len(teams.categories)
+    slot_keys = ids.codes.astype(np.int64) * num_team_categories + teams.codes
+    unique_slot_keys, row_slots = np.unique(slot_keys, return_inverse=True)
+
+    slot_id_codes = unique_slot_keys // num_team_categories
+    all_ids = pd.CategoricalIndex(ids.categories, categories=ids.categories)
+
+    last_date_per_id = np.full(len(ids.categories), -1)
+    np.maximum.at(last_date_per_id, ids.codes, row_dates)
+
+    # Match information
+    home_rows, away_rows = np.arange(0, len(df), 2), np.arange(1, len(df), 2)
+    match_dates = row_dates[home_rows]
+
+    # Bounds of normalized metrics only depend on who plays whom (running
+    # number of matches between each pair of teams), not on the points
+    match_pairs, pair_slots = _get_match_pairs(
+        row_slots[home_rows], row_slots[away_rows], len(unique_slot_keys)
+    )
+    pair_id_codes = slot_id_codes[pair_slots[:, 0]]
+
+    # metrics whose `normalize` is not supported by `normalize_from_tensor`
+    # are normalized from the real matches inside the window
+    ppm_normalized = [
+        name
+        for name, metric_type in metric_types.items()
+        if metric_type.normalize is not Metric.normalize
+        and not _normalizes_from_tensor(metric_type)
+    ]
+    is_tensor_normalized = any(map(_normalizes_from_tensor, metric_types.values()))
+
+    cumulative_probabilities = _get_cumulative_probabilities(
+        id_to_probabilities, ids.categories, outcomes
+    )[ids.codes[home_rows]]
+
+    int8_max = np.iinfo(np.int8).max
+    code_dtype = np.int8 if len(outcomes) <= int8_max else np.int16
+
+    date_order = np.argsort(match_dates, kind="stable")
+    last_date = int(last_date_per_id.max())
+    date_bounds = np.searchsorted(match_dates[date_order], np.arange(last_date + 2))
+
+    # Running totals (first column: real tournament; others: simulations)
+    num_simulations = num_iteration_simulation[0] * num_iteration_simulation[1]
+    columns = ["real"] + [f"s{i}" for i in range(num_simulations)]
+
+    totals = {
+        system: np.zeros((len(unique_slot_keys), num_simulations + 1))
+        for system in ppms
+    }
+    has_played = np.zeros(len(unique_slot_keys), dtype=bool)
+
+    slot_matches = np.zeros(len(unique_slot_keys), dtype=np.int64)
+    pair_counts = np.zeros(len(pair_slots), dtype=np.int64)
+
+    all_results: dict[str, dict[str, list[pd.DataFrame]]] = {
+        system: {name: [] for name in metric_types} for system in ppms
+    }
+
+    dates = range(last_date + 1)
+    for date in log_iterations(dates, turning_logger.info, every_n=10):
+        date_matches = date_order[date_bounds[date] : date_bounds[date + 1]]
+        home, away = home_rows[date_matches], away_rows[date_matches]
+
+        # outcome codes: (number of matches, number of simulations)
+        sampled = _sample_point_pairs(
+            cumulative_probabilities[date_matches], num_iteration_simulation
+        ).astype(code_dtype)
+
+        np.add.at(pair_counts, match_pairs[date_matches], 1)
+
+        for rows, side in ((home, 0), (away, 1)):
+            has_played[row_slots[rows]] = True
+            np.add.at(slot_matches, row_slots[rows], 1)
+
+            for system, system_totals in totals.items():
+                points = outcome_points[system][:, side]
+
+                np.add.at(
+                    system_totals[:, 0], row_slots[rows], row_points[system][rows]
+                )
+                np.add.at(system_totals[:, 1:], row_slots[rows], points[sampled])
+
+        # same as `select_matches_inside_window`: finished tournaments are removed
+        is_id_active = last_date_per_id >= date
+        slots = np.nonzero(has_played & is_id_active[slot_id_codes])[0]
+
+        if len(slots) == 0:
+            continue
+
+        most_imbalanced = None
+        if is_tensor_normalized:
+            is_pair_active = is_id_active[pair_id_codes]
+            most_imbalanced_points = _get_most_imbalanced_points(
+                pair_slots[is_pair_active], pair_counts[is_pair_active], slot_matches
+            )
+            most_imbalanced = StandingsTensor.from_team_points(
+                most_imbalanced_points[slots, np.newaxis],
+                slot_id_codes[slots],
+                all_ids,
+                ["most imbalanced"],
+            )
+
+        window_ppms = {}
+        if ppm_normalized:
+            is_row_inside = (row_dates <= date) & is_id_active[ids.codes]
+            window_ppms = {
+                system: ppm.df[is_row_inside] for system, ppm in ppms.items()
+            }
+
+        for system, system_totals in totals.items():
+            tensor = StandingsTensor.from_team_points(
+                system_totals[slots], slot_id_codes[slots], all_ids, columns
+            )
+            for name, metric_type in metric_types.items():
+                coef = tensor.to_frame(metric_type.calculate_from_tensor(tensor))
+
+                if _normalizes_from_tensor(metric_type):
+                    coef = metric_type.normalize_from_tensor(coef, most_imbalanced)
+                elif name in ppm_normalized:
+                    coef = metric_type.normalize(coef, window_ppms[system])
+
+                metric = metric_type(real=coef[["real"]], simulated=coef[columns[1:]])
+
+                stats_df = SimulationMetricStats.from_metric(metric, quantile).df
+                stats_df["final date"] = np.int16(date)  # save corresponding date
+
+                all_results[system][name].append(stats_df)
+
+    return {
+        system: {
+            name: {"df": pd.concat(results)}
+            for name, results in name_to_results.items()
+        }
+        for system, name_to_results in all_results.items()
+    }
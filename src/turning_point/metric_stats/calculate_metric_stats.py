@@ -1,26 +1,134 @@
 from typing import Literal, Mapping
 
+import numpy as np
 import pandas as pd
+from scipy.stats import binom
 
 from tournament_simulations.data_structures import Matches, PointsPerMatch
-from turning_point.metrics import Metric, Variances
+from turning_point.metrics import (
+    Metric,
+    Variances,
+    metrics_from_points_per_match,
+    simulate_metrics_from_points_per_match,
+)
+
+from .quantile_accumulator import MeanQuantileAccumulator
 
 KwargsSMS = dict[Literal["df"], pd.DataFrame]
 
 
+def quantile_column(quantile: float) -> str:
+    """
+    Column name of each quantile when a list of quantiles is calculated.
+    """
+    return f"quantile {quantile}"
+
+
+def _create_accumulators(
+    num_iteration_simulation: tuple[int, int], quantile: float | list[float] | None
+) -> list[MeanQuantileAccumulator]:
+    """
+    One accumulator for each quantile (all of them for every simulation).
+    """
+    num_iteration, num_simulation_per_iter = num_iteration_simulation
+    quantiles = quantile if isinstance(quantile, list) else [quantile]
+
+    return [
+        MeanQuantileAccumulator.from_num_simulations(
+            num_iteration * num_simulation_per_iter, q
+        )
+        for q in quantiles
+    ]
+
+
+def _get_accumulated_stats(
+    accumulators: list[MeanQuantileAccumulator], quantile: float | list[float] | None
+) -> pd.DataFrame:
+    """
+    Same columns as `_calculate_mean_quantile` (from `_create_accumulators`).
+    """
+    simulated_stats = accumulators[0].to_frame()
+
+    if not isinstance(quantile, list):
+        return simulated_stats
+
+    return pd.concat(
+        [simulated_stats["mean"]]
+        + [
+            accumulator.to_frame()["quantile"].rename(quantile_column(q))
+            for q, accumulator in zip(quantile, accumulators)
+        ],
+        axis=1,
+    )
+
+
 def _calculate_mean_quantile(
-    simul_var_df: pd.DataFrame, quantile: float | None
+    simul_var_df: pd.DataFrame, quantile: float | list[float] | None
 ) -> pd.DataFrame:
     if quantile is None:
         quantile = 0.95
 
-    quantiles = simul_var_df.quantile(quantile, axis=1).rename("quantile")
     mean = simul_var_df.mean(axis=1).rename("mean")
 
+    if isinstance(quantile, list):
+        quantiles = simul_var_df.quantile(quantile, axis=1).T
+        quantiles.columns = [quantile_column(q) for q in quantile]
+    else:
+        quantiles = simul_var_df.quantile(quantile, axis=1).rename("quantile")
+
     return pd.concat([mean, quantiles], axis=1)
 
 
-def get_kwargs_from_metric(metric: Metric, quantile: float) -> KwargsSMS:
+def quantile_confidence_interval(
+    simulated: np.ndarray, quantile: float, error_tolerance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Distribution-free confidence interval for the `quantile` of each row.
+
+    Bounds are order statistics X_(r) <= X_(s) such that
+        P(X_(r) <= true quantile <= X_(s)) >= 1 - error_tolerance,
+    where the number of samples below the true quantile is Binomial(n, quantile).
+
+    ----
+    Parameters:
+        simulated: np.ndarray[float]: (number of rows, number of simulations)
+            Simulated values. NaN values are ignored (rows can have different
+            number of simulations).
+
+        quantile: float
+            Desired quantile.
+
+        error_tolerance: float
+            Probability of the interval not containing the true quantile.
+
+    ----
+    Returns:
+        tuple[np.ndarray[float], np.ndarray[float]]
+            Lower and upper bounds. If there are not enough simulations,
+            they are -inf and inf respectively.
+    """
+    sorted_values = np.sort(simulated, axis=1)  # NaN are placed last
+    num_samples = (~np.isnan(simulated)).sum(axis=1)
+
+    lower_rank = binom.ppf(error_tolerance / 2, num_samples, quantile).astype(int)
+    upper_rank = binom.ppf(1 - error_tolerance / 2, num_samples, quantile)
+    upper_rank = upper_rank.astype(int) + 1
+
+    rows = np.arange(len(sorted_values))
+    last_column = max(sorted_values.shape[1] - 1, 0)
+
+    lower = sorted_values[rows, np.clip(lower_rank - 1, 0, last_column)]
+    upper = sorted_values[rows, np.clip(upper_rank - 1, 0, last_column)]
+
+    lower = np.where(lower_rank >= 1, lower, -np.inf)
+    upper = np.where(upper_rank <= num_samples, upper, np.inf)
+
+    return lower, upper
+
+
+def get_kwargs_from_metric(
+    metric: Metric, quantile: float | list[float] | None
+) -> KwargsSMS:
     """
     Get Kwargs parameters to create an instance of SimulationMetricStats
 
@@ -30,6 +138,9 @@ def get_kwargs_from_metric(metric: Metric, quantile: float) -> KwargsSMS:
         metrics: Metric
             Metric for real and simulated tournaments.
 
+        quantile: float | list[float] | None
+            Quantile value (see `get_kwargs_from_matches`).
+
     ----
     Returns:
 
@@ -48,7 +159,7 @@ def get_kwargs_from_matches(
     winner_type: Literal["winner", "result"],
     winner_to_points: Mapping[str, tuple[float, float]],
     id_to_probabilities: pd.Series | None = None,
-    quantile: float | None = None,
+    quantile: float | list[float] | None = None,
     metric_type: type[Metric] = Variances,
 ) -> KwargsSMS:
     """
@@ -87,11 +198,15 @@ def get_kwargs_from_matches(
 
             First tuple result is for home-team, while the second one is for away-team.
 
-        quantile: float | None = None
+        quantile: float | list[float] | None = None
             Quantile value.
 
             None: defaults to 0.95
 
+            If it is a list, all quantiles are calculated from the same
+            simulations, each one in its own column (see `quantile_column`)
+            instead of "quantile".
+
         metric_type: type[Metric] = Variances
             Which metric should be used.
     ----
@@ -116,3 +231,275 @@ def get_kwargs_from_matches(
 
     simulated_stats = _calculate_mean_quantile(metric.simulated, quantile)
     return {"df": pd.concat([metric.real, simulated_stats], axis=1)}
+
+
+def get_kwargs_streaming_from_matches(
+    matches: Matches,
+    num_iteration_simulation: tuple[int, int],
+    winner_type: Literal["winner", "result"],
+    winner_to_points: Mapping[str, tuple[float, float]],
+    id_to_probabilities: pd.Series | None = None,
+    quantile: float | list[float] | None = None,
+    metric_type: type[Metric] = Variances,
+) -> KwargsSMS:
+    """
+    Same as `get_kwargs_from_matches`, but simulations are run one iteration
+    (batch) at a time and each batch only updates a `MeanQuantileAccumulator`.
+
+    All simulated metrics are never held at once: memory is one batch plus
+    the tail of the simulations needed for the quantile (about 5% of them
+    for the 0.95-quantile). Mean and quantile are the same as calculating
+    them over all simulations (up to floating point rounding of the mean).
+
+    ----
+    Parameters:
+
+        Same as `get_kwargs_from_matches`.
+
+    ----
+    Returns:
+
+        Kwargs to create an instance of SimulationMetricStats
+            "df": Same as `get_kwargs_from_matches`.
+    """
+    ppm = PointsPerMatch.from_home_away_winner(
+        home_away_winner=matches.home_away_winner(winner_type),
+        result_to_points=winner_to_points,
+    )
+
+    if id_to_probabilities is not None:
+        desired_ids = ppm.df.index.get_level_values("id").unique().sort_values()
+        id_to_probabilities = id_to_probabilities.loc[desired_ids]
+
+    num_iteration, num_simulation_per_iter = num_iteration_simulation
+    batch = (1, num_simulation_per_iter)
+
+    real = metric_type.from_points_per_match(ppm, (0, 0), id_to_probabilities).real
+    accumulators = _create_accumulators(num_iteration_simulation, quantile)
+
+    for _ in range(num_iteration):
+        simulated = metric_type.simulate_from_points_per_match(
+            ppm, batch, id_to_probabilities
+        )
+        if simulated is None:
+            break
+
+        for accumulator in accumulators:
+            accumulator.update(simulated)
+
+    if accumulators[0].ids is None:
+        return {"df": real}
+
+    simulated_stats = _get_accumulated_stats(accumulators, quantile)
+    return {"df": pd.concat([real, simulated_stats], axis=1)}
+
+
+def get_kwargs_per_metric_from_matches(
+    matches: Matches,
+    num_iteration_simulation: tuple[int, int],
+    winner_type: Literal["winner", "result"],
+    winner_to_points: Mapping[str, tuple[float, float]],
+    id_to_probabilities: pd.Series | None = None,
+    quantile: float | list[float] | None = None,
+    metric_types: Mapping[str, type[Metric]] | None = None,
+    streaming: bool = False,
+) -> dict[str, KwargsSMS]:
+    """
+    Same as `get_kwargs_from_matches` (or `get_kwargs_streaming_from_matches`)
+    for every metric, but tournaments are simulated only once and all metrics
+    are calculated from the same simulated tournaments
+    (see `metrics_from_points_per_match`).
+
+    ----
+    Parameters:
+
+        metric_types: Mapping[str, type[Metric]] | None = None
+            Metrics that should be calculated.
+
+            None: {"variance": Variances}
+
+        Others: same as `get_kwargs_from_matches`.
+
+        streaming: bool = False
+            Same as `SimulationMetricStats.from_matches`.
+
+    ----
+    Returns:
+
+        dict[str, KwargsSMS]
+            Kwargs to create an instance of SimulationMetricStats for each
+            metric (same keys as `metric_types`).
+    """
+    if metric_types is None:
+        metric_types = {"variance": Variances}
+
+    ppm = PointsPerMatch.from_home_away_winner(
+        home_away_winner=matches.home_away_winner(winner_type),
+        result_to_points=winner_to_points,
+    )
+
+    if id_to_probabilities is not None:
+        desired_ids = ppm.df.index.get_level_values("id").unique().sort_values()
+        id_to_probabilities = id_to_probabilities.loc[desired_ids]
+
+    if not streaming:
+        name_to_metric = metrics_from_points_per_match(
+            metric_types, ppm, num_iteration_simulation, id_to_probabilities
+        )
+        return {
+            name: get_kwargs_from_metric(metric, quantile)
+            for name, metric in name_to_metric.items()
+        }
+
+    num_iteration, num_simulation_per_iter = num_iteration_simulation
+    batch = (1, num_simulation_per_iter)
+
+    name_to_metric = metrics_from_points_per_match(
+        metric_types, ppm, (0, 0), id_to_probabilities
+    )
+    accumulators = {
+        name: _create_accumulators(num_iteration_simulation, quantile)
+        for name in metric_types
+    }
+
+    for _ in range(num_iteration):
+        name_to_simulated = simulate_metrics_from_points_per_match(
+            metric_types, ppm, batch, id_to_probabilities
+        )
+        if name_to_simulated is None:
+            break
+
+        for name, simulated in name_to_simulated.items():
+            for accumulator in accumulators[name]:
+                accumulator.update(simulated)
+
+    if any(acc[0].ids is None for acc in accumulators.values()):
+        return {name: {"df": metric.real} for name, metric in name_to_metric.items()}
+
+    return {
+        name: {
+            "df": pd.concat(
+                [
+                    name_to_metric[name].real,
+                    _get_accumulated_stats(name_accumulators, quantile),
+                ],
+                axis=1,
+            )
+        }
+        for name, name_accumulators in accumulators.items()
+    }
+
+
+def _filter_ids(ppm: PointsPerMatch, ids: pd.Index) -> PointsPerMatch:
+    mask = ppm.df.index.get_level_values("id").isin(ids)
+    return PointsPerMatch(ppm.df[mask])
+
+
+def get_kwargs_adaptive_from_matches(
+    matches: Matches,
+    num_iteration_simulation: tuple[int, int],
+    winner_type: Literal["winner", "result"],
+    winner_to_points: Mapping[str, tuple[float, float]],
+    id_to_probabilities: pd.Series | None = None,
+    quantile: float | None = None,
+    metric_type: type[Metric] = Variances,
+    error_tolerance: float = 0.01,
+) -> KwargsSMS:
+    """
+    Same as `get_kwargs_from_matches`, but simulations are run one iteration
+    (batch) at a time and a tournament stops being simulated once it is clear
+    whether its real metric is above or below the simulated quantile.
+
+    After each batch, a confidence interval for the quantile is calculated
+    (`quantile_confidence_interval`). If the real metric is outside of it,
+    the tournament is decided and no more simulations are run for it.
+    At most `num_iteration_simulation` simulations are run.
+
+    Since a tournament is checked once per iteration, each check uses
+    `error_tolerance / num_iteration` (Bonferroni correction). This way, the
+    probability of any of them stopping it wrongly is at most `error_tolerance`.
+
+    ----
+    Parameters:
+
+        Same as `get_kwargs_from_matches`.
+
+        error_tolerance: float = 0.01
+            Probability of a tournament stopping early with the wrong decision
+            (across all of its checks).
+
+    ----
+    Returns:
+
+        Kwargs to create an instance of SimulationMetricStats
+            "df": Same as `get_kwargs_from_matches` and also
+                "num simulations": number of simulations run for each tournament.
+                "stopped early": whether the tournament was decided before
+                                 running all simulations.
+    """
+    if quantile is None:
+        quantile = 0.95
+
+    ppm = PointsPerMatch.from_home_away_winner(
+        home_away_winner=matches.home_away_winner(winner_type),
+        result_to_points=winner_to_points,
+    )
+
+    num_iteration, num_simulation_per_iter = num_iteration_simulation
+    batch = (1, num_simulation_per_iter)
+    check_tolerance = error_tolerance / max(num_iteration, 1)
+
+    real = metric_type.from_points_per_match(ppm, (0, 0), id_to_probabilities).real
+    if num_iteration == 0 or num_simulation_per_iter == 0:
+        return {"df": real}
+
+    all_ids = ppm.df.index.get_level_values("id").unique().sort_values()
+    stopped_early = pd.Series(False, index=all_ids, name="stopped early")
+
+    # rows are `all_ids`; each tournament only fills the columns it simulated
+    all_simulated = np.full(
+        (len(all_ids), num_iteration * num_simulation_per_iter), np.nan
+    )
+    active_rows = np.arange(len(all_ids))
+    num_columns = 0
+
+    for _ in range(num_iteration):
+        active_ids = all_ids[active_rows]
+        active_ppm = _filter_ids(ppm, active_ids)
+        active_probabilities = (
+            None if id_to_probabilities is None else id_to_probabilities[active_ids]
+        )
+
+        simulated = metric_type.simulate_from_points_per_match(
+            active_ppm, batch, active_probabilities
+        )
+
+        new_columns = slice(num_columns, num_columns + num_simulation_per_iter)
+        simulated = simulated.loc[active_ids].to_numpy(dtype=float)
+        all_simulated[active_rows, new_columns] = simulated
+        num_columns += num_simulation_per_iter
+
+        lower, upper = quantile_confidence_interval(
+            all_simulated[active_rows, :num_columns], quantile, check_tolerance
+        )
+
+        real_values = real["real"].loc[active_ids].to_numpy()
+        is_decided = (real_values < lower) | (real_values > upper)
+
+        if num_columns < all_simulated.shape[1]:
+            stopped_early.iloc[active_rows[is_decided]] = True
+
+        active_rows = active_rows[~is_decided]
+        if len(active_rows) == 0:
+            break
+
+    simulated = pd.DataFrame(
+        all_simulated[:, :num_columns],
+        index=all_ids,
+        columns=[f"s{i}" for i in range(num_columns)],
+    )
+    num_simulations = simulated.notna().sum(axis=1).rename("num simulations")
+
+    simulated_stats = _calculate_mean_quantile(simulated, quantile)
+    df = pd.concat([real, simulated_stats, num_simulations, stopped_early], axis=1)
+    return {"df": df}
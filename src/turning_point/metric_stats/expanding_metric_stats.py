@@ -8,9 +8,28 @@ import pandas as pd
 from tournament_simulations.data_structures import Matches
 from turning_point.metrics import Metric, Variances
 
-from .calculate_expanding_metric_stats import get_kwargs_expanding_from_matches
+from .calculate_expanding_metric_stats import (
+    get_kwargs_expanding_from_matches,
+    get_kwargs_expanding_per_metric_from_matches,
+)
+from .calculate_incremental_metric_stats import (
+    get_kwargs_incremental_from_matches,
+    get_kwargs_incremental_per_metric_from_matches,
+    get_kwargs_incremental_per_point_system_from_matches,
+)
+from .calculate_metric_stats import quantile_column
 from .metric_stats import RESULT_TO_POINTS
 
+ENGINE_MAP = {
+    "window": get_kwargs_expanding_from_matches,
+    "incremental": get_kwargs_incremental_from_matches,
+}
+
+PER_METRIC_ENGINE_MAP = {
+    "window": get_kwargs_expanding_per_metric_from_matches,
+    "incremental": get_kwargs_incremental_per_metric_from_matches,
+}
+
 
 @dataclass
 class ExpandingMetricStats:
@@ -27,7 +46,9 @@ class ExpandingMetricStats:
             columns=[
                 "real" -> metric for real tournament,\n
                 "mean" -> mean metric over all simulations,\n
-                "quantile"-> quantile metric over all simulations
+                "quantile"-> quantile metric over all simulations,\n
+                "quantile {q}" -> (only if a list of quantiles is used)
+                                  q-quantile instead of "quantile"
             ]
         ]
     """
@@ -51,8 +72,11 @@ class ExpandingMetricStats:
         winner_type: Literal["winner", "result"] = "winner",
         winner_to_points: Mapping[str, tuple[float, float]] = RESULT_TO_POINTS,
         id_to_probabilities: pd.Series | None = None,
-        quantile: float | None = None,
+        quantile: float | list[float] | None = None,
         metric_type: type[Metric] = Variances,
+        engine: Literal["window", "incremental"] = "window",
+        error_tolerance: float | None = None,
+        streaming: bool = False,
     ) -> ExpandingMetricStats:
         """
         Create an instance of ExpandingMetricStats from Matches.
@@ -96,16 +120,42 @@ class ExpandingMetricStats:
 
                 If None, they will be estimated directly from 'matches'.
 
-            quantile: float | None = None
+            quantile: float | list[float] | None = None
                 Desired quantile value.
 
                 If None, defaults to 0.95.
 
+                If it is a list, all quantiles are calculated from the same
+                simulations, each one in its own "quantile {q}" column.
+
             metric_type: type[Metric] = Variances
                 Which metric should be used.
+
+            engine: Literal["window", "incremental"] = "window"
+                How windows should be calculated.
+                    window: each window is simulated from scratch.
+                    incremental: each date is simulated only once and windows
+                        are built from running point totals (much faster, but
+                        simulations are shared between windows).
+
+            error_tolerance: float | None = None
+                Only for the "window" engine.
+
+                If not None, each window stops being simulated once its real
+                metric is clearly above or below the simulated quantile
+                (see `SimulationMetricStats.from_matches`). Columns
+                "num simulations" and "stopped early" are added.
+
+            streaming: bool = False
+                Only for the "window" engine.
+
+                If True, simulations are run one iteration at a time and only
+                a running mean and the tail needed for the quantile are kept
+                (same results using less memory).
         """
 
-        params = get_kwargs_expanding_from_matches(
+        get_kwargs_from_matches = ENGINE_MAP[engine]
+        params = get_kwargs_from_matches(
             matches,
             num_iteration_simulation,
             winner_type,
@@ -113,5 +163,122 @@ class ExpandingMetricStats:
             id_to_probabilities,
             quantile,
             metric_type,
+            error_tolerance=error_tolerance,
+            streaming=streaming,
         )
         return cls(**params)
+
+    @classmethod
+    def from_matches_per_metric(
+        cls,
+        matches: Matches,
+        num_iteration_simulation: tuple[int, int],
+        winner_type: Literal["winner", "result"] = "winner",
+        winner_to_points: Mapping[str, tuple[float, float]] = RESULT_TO_POINTS,
+        id_to_probabilities: pd.Series | None = None,
+        quantile: float | list[float] | None = None,
+        metric_types: Mapping[str, type[Metric]] | None = None,
+        engine: Literal["window", "incremental"] = "window",
+        streaming: bool = False,
+    ) -> dict[str, ExpandingMetricStats]:
+        """
+        Same as `from_matches` for every metric in `metric_types`, but
+        tournaments are simulated only once (for each window or date, depending
+        on `engine`) and every metric is calculated from the same simulated
+        tournaments. So metrics are directly comparable.
+
+        -----
+        Parameters:
+
+            metric_types: Mapping[str, type[Metric]] | None = None
+                Metrics that should be calculated (e.g. METRIC_MAP).
+
+                None: {"variance": Variances}
+
+            Others: same as `from_matches` (early stopping is not supported).
+
+        -----
+        Returns:
+            dict[str, ExpandingMetricStats]
+                Stats for each metric (same keys as `metric_types`).
+        """
+        get_kwargs_per_metric_from_matches = PER_METRIC_ENGINE_MAP[engine]
+        name_to_parameters = get_kwargs_per_metric_from_matches(
+            matches,
+            num_iteration_simulation,
+            winner_type,
+            winner_to_points,
+            id_to_probabilities,
+            quantile,
+            metric_types,
+            streaming=streaming,
+        )
+        return {
+            name: cls(**parameters) for name, parameters in name_to_parameters.items()
+        }
+
+    @classmethod
+    def from_matches_per_point_system(
+        cls,
+        matches: Matches,
+        num_iteration_simulation: tuple[int, int],
+        point_systems: Mapping[str, Mapping[str, tuple[float, float]]],
+        winner_type: Literal["winner", "result"] = "winner",
+        id_to_probabilities: pd.Series | None = None,
+        quantile: float | list[float] | None = None,
+        metric_types: Mapping[str, type[Metric]] | None = None,
+    ) -> dict[str, dict[str, ExpandingMetricStats]]:
+        """
+        Same as `from_matches_per_metric` for every point system, but match
+        outcomes are simulated only once and converted to the points of each
+        point system. So point systems are directly comparable.
+
+        Only the "incremental" engine is supported.
+
+        -----
+        Parameters:
+
+            point_systems: Mapping[str, Mapping[str, tuple[float, float]]]
+                Maps each point system name to its `winner_to_points`.
+
+            id_to_probabilities: pd.Series | None = None
+                Series mapping each tournament to the probability of each
+                outcome (winner/result). If None, they will be estimated
+                directly from 'matches'.
+
+            Others: same as `from_matches_per_metric`.
+
+        -----
+        Returns:
+            dict[str, dict[str, ExpandingMetricStats]]
+                Stats for each point system and metric.
+        """
+        system_to_parameters = get_kwargs_incremental_per_point_system_from_matches(
+            matches,
+            num_iteration_simulation,
+            point_systems,
+            winner_type,
+            id_to_probabilities,
+            quantile,
+            metric_types,
+        )
+        return {
+            system: {name: cls(**params) for name, params in name_to_params.items()}
+            for system, name_to_params in system_to_parameters.items()
+        }
+
+    def select_quantile(self, quantile: float) -> ExpandingMetricStats:
+        """
+        Stats for one of the quantiles (if a list of quantiles was used), with
+        the same columns as if only that quantile had been calculated.
+        """
+        column = quantile_column(quantile)
+
+        other_quantiles = [
+            col
+            for col in self.df.columns
+            if col.startswith("quantile ") and col != column
+        ]
+        df = self.df.drop(columns=other_quantiles).rename(columns={column: "quantile"})
+
+        return ExpandingMetricStats(df)
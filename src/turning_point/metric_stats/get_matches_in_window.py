@@ -1,29 +1,143 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
 import numpy as np
 import pandas as pd
 
 from tournament_simulations.data_structures import Matches
 
 
-def _get_mask_inside_interval(
-    matches: Matches, first_date: int, last_date: int
-) -> np.ndarray:  # np.ndarray[bool]
-    date_number = matches.df.index.get_level_values("date number").to_numpy()
-    return (first_date <= date_number) & (date_number <= last_date)
+@dataclass
+class MatchesWindowIndex:
+    """
+    Precomputed row offsets to select date windows without scanning the
+    whole dataframe every time.
+
+    Rows are (stably) sorted by ("id", "date number"), so each tournament is a
+    contiguous block of rows and, inside it, dates are increasing.
+
+        matches: Matches
+            Matches the windows are selected from.
 
+        order: np.ndarray[int] | None
+            Position (in `matches.df`) of each sorted row.
+            None if `matches.df` is already sorted.
 
-def _get_mask_tournaments_not_already_finished(
-    matches: Matches, last_date: int
-) -> np.ndarray:  # np.ndarray[bool]
-    # apply func
-    def _last_date_one_id(df: pd.DataFrame) -> int:
-        return df.index.get_level_values("date number")[-1]
+        keys: np.ndarray[int]
+            Sorted key of each row: id_position * (last date + 2) + date number.
+            It is increasing, so window boundaries are found with binary search.
 
-    id_to_last_date = matches.df.groupby("id", observed=True).apply(_last_date_one_id)
+        date_stride: int
+            Last date + 2 (multiplier used by `keys`).
 
-    ids = matches.df.index.get_level_values("id")
-    has_already_finished = last_date <= id_to_last_date[ids]
+        ids: pd.Index
+            Tournament of each id_position (order of first appearance).
 
-    return has_already_finished.to_numpy()
+        first_dates: np.ndarray[int]
+            First date of each tournament (in id_position order).
+
+        last_dates: np.ndarray[int]
+            Last date of each tournament (in id_position order).
+    """
+
+    matches: Matches
+    order: np.ndarray | None
+    keys: np.ndarray
+    date_stride: int
+    ids: pd.Index
+    first_dates: np.ndarray
+    last_dates: np.ndarray
+
+    @property
+    def num_tournaments(self) -> int:
+        return len(self.last_dates)
+
+    @classmethod
+    def from_matches(cls, matches: Matches) -> MatchesWindowIndex:
+        id_codes, ids = pd.factorize(matches.df.index.get_level_values("id"))
+        dates = matches.df.index.get_level_values("date number").to_numpy(np.int64)
+
+        date_stride = int(dates.max()) + 2 if len(dates) else 1
+        keys = id_codes.astype(np.int64) * date_stride + dates
+
+        order = None
+        if np.any(keys[1:] < keys[:-1]):
+            order = np.argsort(keys, kind="stable")
+            keys = keys[order]
+
+        first_dates = np.full(len(ids), date_stride)
+        np.minimum.at(first_dates, id_codes, dates)
+
+        last_dates = np.full(len(ids), -1)
+        np.maximum.at(last_dates, id_codes, dates)
+
+        return cls(
+            matches,
+            order,
+            keys,
+            date_stride,
+            pd.Index(ids, name="id"),
+            first_dates,
+            last_dates,
+        )
+
+    def _get_rows(
+        self,
+        id_positions: np.ndarray,
+        first_dates: int | np.ndarray,
+        last_dates: int | np.ndarray,
+    ) -> np.ndarray:
+        """
+        Positions (in `matches.df`) of the rows of each tournament in
+        `id_positions` (increasing) between its first and last dates.
+        """
+        base = id_positions * self.date_stride
+
+        first_keys = base + np.maximum(first_dates, 0)
+        starts = np.searchsorted(self.keys, first_keys, side="left")
+        ends = np.searchsorted(self.keys, base + last_dates, side="right")
+
+        lengths = np.maximum(ends - starts, 0)
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        rows = offsets + np.arange(lengths.sum())
+
+        if self.order is None:
+            return rows
+
+        return np.sort(self.order[rows])
+
+    def _select_rows(self, rows: np.ndarray) -> Matches:
+        # a single contiguous block can be sliced instead of gathered
+        if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+            return Matches(self.matches.df.iloc[rows[0] : rows[-1] + 1])
+
+        return Matches(self.matches.df.iloc[rows])
+
+    def get_rows(self, first_date: int, last_date: int) -> np.ndarray:
+        """
+        Positions (in `matches.df`) of the rows selected by
+        `select_matches_inside_window`, in the same order.
+        """
+        active = np.flatnonzero(last_date <= self.last_dates)
+        return self._get_rows(active, first_date, last_date)
+
+    def select(self, first_date: int, last_date: int) -> Matches:
+        """
+        Same as `select_matches_inside_window(matches, first_date, last_date)`.
+        """
+        return self._select_rows(self.get_rows(first_date, last_date))
+
+    def select_prefixes(
+        self, id_positions: np.ndarray, last_dates: np.ndarray
+    ) -> Matches:
+        """
+        Select, for each tournament, a different expanding window:
+            matches of `ids[id_positions[i]]` from date 0 until `last_dates[i]`.
+
+        `id_positions` must be increasing.
+        """
+        return self._select_rows(self._get_rows(id_positions, 0, last_dates))
 
 
 def select_matches_inside_window(
@@ -56,10 +170,8 @@ def select_matches_inside_window(
     -----
     Returns:
         Copy of df_matches with all undesired matches/tournaments removed.
-    """
-
-    mask_interval = _get_mask_inside_interval(matches, first_date, last_date)
-    mask_not_finished = _get_mask_tournaments_not_already_finished(matches, last_date)
 
-    filtered_matches = matches.df[mask_interval & mask_not_finished]
-    return Matches(filtered_matches)
+    Remark: If many windows are selected from the same matches, create
+            a `MatchesWindowIndex` once and use `.select` instead.
+    """
+    return MatchesWindowIndex.from_matches(matches).select(first_date, last_date)
@@ -8,7 +8,13 @@ import pandas as pd
 from tournament_simulations.data_structures import Matches
 from turning_point.metrics import Metric, Variances
 
-from .calculate_metric_stats import get_kwargs_from_matches, get_kwargs_from_metric
+from .calculate_metric_stats import (
+    get_kwargs_adaptive_from_matches,
+    get_kwargs_from_matches,
+    get_kwargs_from_metric,
+    get_kwargs_per_metric_from_matches,
+    get_kwargs_streaming_from_matches,
+)
 
 RESULT_TO_POINTS = {"h": (3, 0), "d": (1, 1), "a": (0, 3)}
 
@@ -28,7 +34,12 @@ class SimulationMetricStats:
             columns=[
                 "real" -> metric for real tournament,\n
                 "mean" -> mean metric over all simulations,\n
-                "quantile"-> quantile metric over all simulations
+                "quantile"-> quantile metric over all simulations,\n
+                "quantile {q}" -> (only if a list of quantiles is used)
+                                  q-quantile instead of "quantile",\n
+                "num simulations" -> (only if adaptive) simulations run,\n
+                "stopped early" -> (only if adaptive) whether it was decided
+                                   before running all simulations
             ]
         ]
     """
@@ -46,7 +57,7 @@ class SimulationMetricStats:
 
     @classmethod
     def from_metric(
-        cls, metric: Metric, quantile: float = 0.95
+        cls, metric: Metric, quantile: float | list[float] = 0.95
     ) -> SimulationMetricStats:
         """
         Create an instance of SimulationVarStats from variances.
@@ -56,6 +67,9 @@ class SimulationMetricStats:
 
             variances: Variances
                 Ranking-variances for real and simulated tournaments.
+
+            quantile: float | list[float] = 0.95
+                Desired quantile (or quantiles, see `from_matches`).
         """
         parameters = get_kwargs_from_metric(metric, quantile)
         return cls(**parameters)
@@ -68,8 +82,10 @@ class SimulationMetricStats:
         winner_type: Literal["winner", "result"] = "winner",
         winner_to_points: Mapping[str, tuple[float, float]] = RESULT_TO_POINTS,
         id_to_probabilities: pd.Series | None = None,
-        quantile: float = 0.95,
+        quantile: float | list[float] = 0.95,
         metric_type: type[Metric] = Variances,
+        error_tolerance: float | None = None,
+        streaming: bool = False,
     ) -> SimulationMetricStats:
         """
         Create an instance of SimulationMetricStats from Matches.
@@ -112,10 +128,33 @@ class SimulationMetricStats:
 
                 If None, they will be estimated directly from 'matches'.
 
+            quantile: float | list[float] = 0.95
+                Desired quantile.
+
+                If it is a list, all quantiles are calculated from the same
+                simulations, each one in its own "quantile {q}" column.
+
             metric_type: type[Metric] = Variances
                 Which metric should be used.
+
+            error_tolerance: float | None = None
+                If None, all simulations are run.
+
+                Otherwise, simulations are run one iteration at a time and
+                each tournament stops being simulated once a confidence interval
+                for the quantile does not contain its real metric (this is the
+                probability of a wrong early stop, across all checks).
+                See `get_kwargs_adaptive_from_matches`.
+
+            streaming: bool = False
+                If True, simulations are run one iteration at a time and only
+                a running mean and the tail needed for the quantile are kept
+                (same results using less memory).
+                See `get_kwargs_streaming_from_matches`.
+
+                Cannot be used together with `error_tolerance`.
         """
-        parameters = get_kwargs_from_matches(
+        args = (
             matches,
             num_iteration_simulation,
             winner_type,
@@ -124,4 +163,63 @@ class SimulationMetricStats:
             quantile,
             metric_type,
         )
-        return cls(**parameters)
+
+        if error_tolerance is not None and streaming:
+            raise ValueError("Early stopping cannot be used with streaming.")
+
+        if error_tolerance is not None and isinstance(quantile, list):
+            raise ValueError("Early stopping only supports a single quantile.")
+
+        if streaming:
+            return cls(**get_kwargs_streaming_from_matches(*args))
+
+        if error_tolerance is None:
+            return cls(**get_kwargs_from_matches(*args))
+
+        return cls(**get_kwargs_adaptive_from_matches(*args, error_tolerance))
+
+    @classmethod
+    def from_matches_per_metric(
+        cls,
+        matches: Matches,
+        num_iteration_simulation: tuple[int, int],
+        winner_type: Literal["winner", "result"] = "winner",
+        winner_to_points: Mapping[str, tuple[float, float]] = RESULT_TO_POINTS,
+        id_to_probabilities: pd.Series | None = None,
+        quantile: float | list[float] = 0.95,
+        metric_types: Mapping[str, type[Metric]] | None = None,
+        streaming: bool = False,
+    ) -> dict[str, SimulationMetricStats]:
+        """
+        Same as `from_matches` for every metric in `metric_types`, but
+        tournaments are simulated only once and every metric is calculated
+        from the same simulated tournaments.
+
+        -----
+        Parameters:
+
+            metric_types: Mapping[str, type[Metric]] | None = None
+                Metrics that should be calculated (e.g. METRIC_MAP).
+
+                None: {"variance": Variances}
+
+            Others: same as `from_matches` (early stopping is not supported).
+
+        -----
+        Returns:
+            dict[str, SimulationMetricStats]
+                Stats for each metric (same keys as `metric_types`).
+        """
+        name_to_parameters = get_kwargs_per_metric_from_matches(
+            matches,
+            num_iteration_simulation,
+            winner_type,
+            winner_to_points,
+            id_to_probabilities,
+            quantile,
+            metric_types,
+            streaming,
+        )
+        return {
+            name: cls(**parameters) for name, parameters in name_to_parameters.items()
+        }
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+def get_tail_size(num_simulations: int, quantile: float) -> int:
+    """
+    Number of order statistics (from the nearest tail) needed to calculate
+    the `quantile` (linear interpolation) of `num_simulations` values.
+
+    It is also enough for any smaller number of values, so rows with
+    NaN simulations (skipped) are still exact.
+    """
+    lower_position = int(np.floor((num_simulations - 1) * quantile))
+
+    if quantile >= 0.5:
+        return num_simulations - lower_position
+
+    return min(lower_position + 2, num_simulations)
+
+
+@dataclass
+class MeanQuantileAccumulator:
+    """
+    Running mean and exact quantile of simulated metrics, updated one
+    simulation batch at a time.
+
+    Only the `tail_size` largest values (smallest, if quantile < 0.5) of each
+    tournament are kept, instead of all simulations. For the 0.95-quantile,
+    that is about 5% of them.
+
+        quantile: float
+            Desired quantile.
+
+        tail_size: int
+            Number of values kept for each tournament (see `get_tail_size`).
+
+        ids: pd.Index | None
+            Tournament of each row. None until the first update.
+
+        sums: np.ndarray[float]
+            Sum of simulated values (NaN are skipped).
+
+        counts: np.ndarray[int]
+            Number of simulated values (NaN are skipped).
+
+        tail: np.ndarray[float]: (number of ids, at most `tail_size`)
+            Kept values (unordered). Skipped NaN are stored as -inf
+            (or inf if quantile < 0.5), so they are never kept over real values.
+    """
+
+    quantile: float
+    tail_size: int
+    ids: pd.Index | None = None
+    sums: np.ndarray | None = None
+    counts: np.ndarray | None = None
+    tail: np.ndarray | None = None
+
+    @property
+    def keeps_upper_tail(self) -> bool:
+        return self.quantile >= 0.5
+
+    @classmethod
+    def from_num_simulations(
+        cls, num_simulations: int, quantile: float | None = None
+    ) -> MeanQuantileAccumulator:
+        """
+        ----
+        Parameters:
+            num_simulations: int
+                Maximum number of simulations per tournament (over all batches).
+
+            quantile: float | None = None
+                Desired quantile. If None, defaults to 0.95.
+        """
+        if quantile is None:
+            quantile = 0.95
+
+        return cls(quantile, get_tail_size(num_simulations, quantile))
+
+    def update(self, simulated: pd.DataFrame) -> None:
+        """
+        Add a simulation batch (Metric.simulated: one column per simulation).
+
+        Every batch must contain the same tournaments as the first one.
+        """
+        if self.ids is None:
+            self.ids = simulated.index
+            self.sums = np.zeros(len(self.ids))
+            self.counts = np.zeros(len(self.ids), dtype=np.int64)
+            self.tail = np.empty((len(self.ids), 0))
+        else:
+            simulated = simulated.loc[self.ids]
+
+        values = simulated.to_numpy(dtype=float)
+        is_nan = np.isnan(values)
+
+        self.sums += np.where(is_nan, 0, values).sum(axis=1)
+        self.counts += (~is_nan).sum(axis=1)
+
+        skipped = -np.inf if self.keeps_upper_tail else np.inf
+        tail = np.concatenate([self.tail, np.where(is_nan, skipped, values)], axis=1)
+
+        num_columns = tail.shape[1]
+        if num_columns > self.tail_size:
+            if self.keeps_upper_tail:
+                kth = num_columns - self.tail_size
+                tail = np.partition(tail, kth, axis=1)[:, kth:]
+            else:
+                tail = np.partition(tail, self.tail_size - 1, axis=1)
+                tail = tail[:, : self.tail_size]
+
+        self.tail = tail
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Same as `_calculate_mean_quantile` over all simulations added so far.
+
+        ----
+        Returns:
+            pd.DataFrame[
+                index=ids,
+                columns=["mean", "quantile"]
+            ]
+        """
+        if self.ids is None:
+            return pd.DataFrame(columns=["mean", "quantile"], dtype=float)
+
+        counts = self.counts
+        has_values = counts > 0
+
+        # position h = (n - 1) * q in the ascending order of all n values
+        position = (np.maximum(counts, 1) - 1) * self.quantile
+        lower_position = np.floor(position).astype(np.int64)
+        upper_position = np.minimum(lower_position + 1, np.maximum(counts - 1, 0))
+        fraction = position - lower_position
+
+        # ascending position -> position in the (sorted) tail
+        sorted_tail = np.sort(self.tail, axis=1)
+        offset = sorted_tail.shape[1] - counts if self.keeps_upper_tail else 0
+
+        last_column = max(sorted_tail.shape[1] - 1, 0)
+        rows = np.arange(len(sorted_tail))
+
+        # rows without values (only inf placeholders) are replaced by NaN below
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.sums / counts
+
+            if sorted_tail.shape[1] == 0:
+                quantile = np.full(len(rows), np.nan)
+            else:
+                lower_column = np.clip(lower_position + offset, 0, last_column)
+                upper_column = np.clip(upper_position + offset, 0, last_column)
+
+                lower = sorted_tail[rows, lower_column]
+                upper = sorted_tail[rows, upper_column]
+                quantile = lower + fraction * (upper - lower)
+
+        return pd.DataFrame(
+            {
+                "mean": np.where(has_values, mean, np.nan),
+                "quantile": np.where(has_values, quantile, np.nan),
+            },
+            index=self.ids,
+        )
@@ -5,7 +5,12 @@ Module for calculating tournament variances.
 from .gini_index import Gini, NormalizedGini
 from .interquartile_range import IQR
 from .metric import Metric
+from .multi_metric import (
+    metrics_from_points_per_match,
+    simulate_metrics_from_points_per_match,
+)
 from .normalized_hhi import HICB, NaiveNormalizedHHI, NormalizedHHI
+from .standings_tensor import StandingsTensor
 from .top_concentration_ratio import FastNormConcentrationRatio, NormConcentrationRatio
 from .variances import Variances
 
@@ -31,6 +36,9 @@ __all__ = [
     "NormalizedHHI",
     "FastNormConcentrationRatio",
     "NormConcentrationRatio",
+    "StandingsTensor",
     "Variances",
     "METRIC_MAP",
+    "metrics_from_points_per_match",
+    "simulate_metrics_from_points_per_match",
 ]
@@ -71,19 +71,38 @@ def get_kwargs_from_points_per_match(
 
     real_coef = func(ppm.df)
 
-    simulated_coef = None
-    num_iteration, num_simulation_per_iter = num_iteration_simulation
-
-    if num_iteration and num_simulation_per_iter:
-        simul_ppm = SimulatePointsPerMatch(ppm)
-        simulated_coef = simul_ppm.tournament_wide(
-            num_iteration_simulation=num_iteration_simulation,
-            id_to_probabilities=id_to_probabilities,
-            func_after_simulation=func,
-        )
-        simulated_coef = norm_fn(simulated_coef, ppm)
+    simulated_coef = simulate_from_points_per_match(
+        ppm, func, num_iteration_simulation, id_to_probabilities, norm_fn
+    )
 
     return {
         "real": norm_fn(real_coef.rename(columns={"points": "real"}), ppm),
         "simulated": simulated_coef,
     }
+
+
+def simulate_from_points_per_match(
+    ppm: PointsPerMatch,
+    func: Callable[[pd.DataFrame], pd.DataFrame],
+    num_iteration_simulation: tuple[int, int],
+    id_to_probabilities: pd.Series | None = None,
+    norm_fn: Callable[[pd.DataFrame, PointsPerMatch], pd.DataFrame] = lambda c, ppm: c,
+) -> pd.DataFrame | None:
+    """
+    Same as `get_kwargs_from_points_per_match(...)["simulated"]`, but the
+    metric of the real tournaments is not calculated (e.g. when simulations
+    are run one batch at a time and it was already calculated).
+
+    None if there are no simulations.
+    """
+    num_iteration, num_simulation_per_iter = num_iteration_simulation
+    if not (num_iteration and num_simulation_per_iter):
+        return None
+
+    simul_ppm = SimulatePointsPerMatch(ppm)
+    simulated_coef = simul_ppm.tournament_wide(
+        num_iteration_simulation=num_iteration_simulation,
+        id_to_probabilities=id_to_probabilities,
+        func_after_simulation=func,
+    )
+    return norm_fn(simulated_coef, ppm)
@@ -1,16 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterator
 
 import numpy as np
 import pandas as pd
 
-from synthetic_tournaments.most_imbalanced import build_most_imbalanced_tournament
 from tournament_simulations.data_structures import PointsPerMatch
 
-from .calculate_metric import get_kwargs_from_points_per_match
 from .metric import Metric
+from .normalization_bounds import get_most_imbalanced_bound
+from .standings_tensor import StandingsTensor, apply_per_id, batched_gini, sorted_gini
 
 
 def gini(standings: pd.Series | pd.DataFrame) -> float | pd.Series:
@@ -19,25 +18,52 @@ def gini(standings: pd.Series | pd.DataFrame) -> float | pd.Series:
         pd.DataFrame: Returns pd.Series for each column
         pd.Series: Returns float value
     """
+    values = standings.to_numpy(dtype=float).reshape(len(standings), -1)
+    num_teams = np.array([len(standings)])
 
-    def _df_iterator(standings: pd.DataFrame) -> Iterator[pd.Series]:
-        for _, value in standings.iterrows():
-            yield value
+    result = sorted_gini(np.sort(values, axis=0), num_teams)
 
-    num_teams = len(standings)
-    mean = standings.mean()
+    if isinstance(standings, pd.DataFrame):
+        return pd.Series(result, index=standings.columns)
 
-    sum_abs_diff = 0
+    return result[0]
+
+
+def _calculate_gini_index_per_id(df: pd.DataFrame) -> pd.DataFrame:
+    return apply_per_id(batched_gini, df)
+
+
+def _round_robin_gini_upper_bound(num_teams: np.ndarray) -> np.ndarray:
+    """
+    Gini index of standings (0, 1, ..., n - 1) (most imbalanced complete
+    round-robin): (n + 1) / (3n)
+    """
+    return (num_teams + 1) / (3 * num_teams)
+
+
+def _normalize_gini(
+    coef_df: pd.DataFrame, real_ppm: pd.DataFrame | PointsPerMatch
+) -> pd.DataFrame:
+    """
+    Normalizes by the gini index of the most imbalanced tournament.
+    """
+    upper_bound = get_most_imbalanced_bound(
+        real_ppm, _calculate_gini_index_per_id, _round_robin_gini_upper_bound
+    )
+    return _normalize_gini_from_bound(coef_df, upper_bound)
 
-    iterator = standings
-    if isinstance(standings, pd.DataFrame):
-        iterator = _df_iterator(standings)
 
-    for value in iterator:
-        value_abs_diff = (standings - value).abs().sum()
-        sum_abs_diff += value_abs_diff
+def _normalize_gini_from_tensor(
+    coef_df: pd.DataFrame, most_imbalanced: StandingsTensor
+) -> pd.DataFrame:
+    return _normalize_gini_from_bound(coef_df, batched_gini(most_imbalanced))
 
-    return sum_abs_diff / (2 * mean * num_teams**2)
+
+def _normalize_gini_from_bound(
+    coef_df: pd.DataFrame, upper_bound: np.ndarray
+) -> pd.DataFrame:
+    normalized_gini = coef_df / upper_bound
+    return np.clip(normalized_gini, 0, 1)
 
 
 @dataclass
@@ -73,48 +99,8 @@ class Gini(Metric):
     real: pd.DataFrame
     simulated: pd.DataFrame
 
-    @classmethod
-    def from_points_per_match(
-        cls,
-        ppm: PointsPerMatch,
-        num_iteration_simulation: tuple[int, int],
-        id_to_probabilities: pd.Series | None = None,
-    ) -> Gini:
-        """
-        Creates an instance from PointsPerMatch.
-
-        -----
-        Parameters:
-
-            points_per_match: PointsPerMatch
-                Points each team gained in each match they played.
-
-            num_iteration_simulation: tuple[int, int]
-                Respectively, number of iterations and number
-                of simulations per iteration (batch size).
-
-            id_to_probabilities: pd.Series | None = None
-                Series mapping each tournament to its estimated probabilities.
-
-                Probabilities:  Mapping[tuple[float, float]: float]
-                    Maps each pair (tuple) to its probability (float).
-
-                    Pair: ranking points gained respectively by home-team and away-team.
-
-                If None, they will be estimated directly from 'ppm'.
-        """
-
-        def _calculate_gini_index_per_id(df: pd.DataFrame) -> pd.DataFrame:
-            rankings = df.groupby(["id", "team"], observed=True).sum()
-            return rankings.groupby("id", observed=True).apply(gini)
-
-        parameters = get_kwargs_from_points_per_match(
-            ppm,
-            _calculate_gini_index_per_id,
-            num_iteration_simulation,
-            id_to_probabilities,
-        )
-        return cls(**parameters)
+    calculate_per_id = staticmethod(_calculate_gini_index_per_id)
+    calculate_from_tensor = staticmethod(batched_gini)
 
 
 @dataclass
@@ -150,60 +136,7 @@ class NormalizedGini(Metric):
     real: pd.DataFrame
     simulated: pd.DataFrame
 
-    @classmethod
-    def from_points_per_match(
-        cls,
-        ppm: PointsPerMatch,
-        num_iteration_simulation: tuple[int, int],
-        id_to_probabilities: pd.Series | None = None,
-    ) -> NormalizedGini:
-        """
-        Creates an instance from PointsPerMatch.
-
-        -----
-        Parameters:
-
-            points_per_match: PointsPerMatch
-                Points each team gained in each match they played.
-
-            num_iteration_simulation: tuple[int, int]
-                Respectively, number of iterations and number
-                of simulations per iteration (batch size).
-
-            id_to_probabilities: pd.Series | None = None
-                Series mapping each tournament to its estimated probabilities.
-
-                Probabilities:  Mapping[tuple[float, float]: float]
-                    Maps each pair (tuple) to its probability (float).
-
-                    Pair: ranking points gained respectively by home-team and away-team.
-
-                If None, they will be estimated directly from 'ppm'.
-        """
-
-        def _calculate_gini_index_per_id(df: pd.DataFrame) -> pd.DataFrame:
-            rankings = df.groupby(["id", "team"], observed=True).sum()
-            return rankings.groupby("id", observed=True).apply(gini)
-
-        def _normalization_fn(
-            coef_df: pd.DataFrame, real_ppm: PointsPerMatch
-        ) -> pd.DataFrame:
-
-            def _get_upper_bound() -> pd.Series:
-                _df = build_most_imbalanced_tournament(real_ppm.df)
-                _rankings = _df.groupby(["id", "team"], observed=True).sum()
-                return _rankings.groupby("id", observed=True).apply(gini)
-
-            upper_bound = _get_upper_bound().to_numpy().reshape(-1, 1)
-
-            normalized_gini = coef_df / upper_bound
-            return np.clip(normalized_gini, 0, 1)
-
-        parameters = get_kwargs_from_points_per_match(
-            ppm,
-            _calculate_gini_index_per_id,
-            num_iteration_simulation,
-            id_to_probabilities,
-            _normalization_fn,
-        )
-        return cls(**parameters)
+    calculate_per_id = staticmethod(_calculate_gini_index_per_id)
+    calculate_from_tensor = staticmethod(batched_gini)
+    normalize = staticmethod(_normalize_gini)
+    normalize_from_tensor = staticmethod(_normalize_gini_from_tensor)
@@ -4,10 +4,8 @@ from dataclasses import dataclass
 
 import pandas as pd
 
-from tournament_simulations.data_structures import PointsPerMatch
-
-from .calculate_metric import get_kwargs_from_points_per_match
 from .metric import Metric
+from .standings_tensor import apply_per_id, batched_interquartile_range
 
 
 def interquartile_range(standings: pd.Series | pd.DataFrame) -> float | pd.Series:
@@ -20,6 +18,10 @@ def interquartile_range(standings: pd.Series | pd.DataFrame) -> float | pd.Serie
     return quantiles.loc[0.75] - quantiles.loc[0.25]
 
 
+def _calculate_interquartile_range_per_id(df: pd.DataFrame) -> pd.DataFrame:
+    return apply_per_id(batched_interquartile_range, df)
+
+
 @dataclass
 class IQR(Metric):
     """
@@ -53,46 +55,5 @@ class IQR(Metric):
     real: pd.DataFrame
     simulated: pd.DataFrame
 
-    @classmethod
-    def from_points_per_match(
-        cls,
-        ppm: PointsPerMatch,
-        num_iteration_simulation: tuple[int, int],
-        id_to_probabilities: pd.Series | None = None,
-    ) -> IQR:
-        """
-        Creates an instance from PointsPerMatch.
-
-        -----
-        Parameters:
-
-            points_per_match: PointsPerMatch
-                Points each team gained in each match they played.
-
-            num_iteration_simulation: tuple[int, int]
-                Respectively, number of iterations and number
-                of simulations per iteration (batch size).
-
-            id_to_probabilities: pd.Series | None = None
-                Series mapping each tournament to its estimated probabilities.
-
-                Probabilities:  Mapping[tuple[float, float]: float]
-                    Maps each pair (tuple) to its probability (float).
-
-                    Pair: ranking points gained respectively by home-team and away-team.
-
-                If None, they will be estimated directly from 'ppm'.
-        """
-
-        def _calculate_interquartile_range_per_id(df: pd.DataFrame) -> pd.DataFrame:
-            rankings = df.groupby(["id", "team"], observed=True).sum()
-            iqr_fn = interquartile_range
-            return rankings.groupby("id", observed=True).apply(iqr_fn)
-
-        parameters = get_kwargs_from_points_per_match(
-            ppm,
-            _calculate_interquartile_range_per_id,
-            num_iteration_simulation,
-            id_to_probabilities,
-        )
-        return cls(**parameters)
+    calculate_per_id = staticmethod(_calculate_interquartile_range_per_id)
+    calculate_from_tensor = staticmethod(batched_interquartile_range)
@@ -3,10 +3,29 @@ from __future__ import annotations
 from abc import ABCMeta
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
 from tournament_simulations.data_structures import PointsPerMatch
 
+from .calculate_metric import (
+    get_kwargs_from_points_per_match,
+    simulate_from_points_per_match,
+)
+from .standings_tensor import StandingsTensor
+
+
+def set_correct_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Categorical "id" index (sorted), same as `Metric.real` and `Metric.simulated`.
+    """
+    index_cols = ["id"]
+    dtype = {"id": "category"}
+
+    to_reset = [name for name in index_cols if name in df.index.names]
+    df = df.reset_index(to_reset)
+    return df.astype(dtype).set_index(index_cols).sort_index()
+
 
 @dataclass
 class Metric(metaclass=ABCMeta):
@@ -42,18 +61,110 @@ class Metric(metaclass=ABCMeta):
     simulated: pd.DataFrame | None
 
     def __post_init__(self) -> None:
-        def _set_correct_types(_df: pd.DataFrame) -> pd.DataFrame:
-            _to_reset = [name for name in index_cols if name in _df.index.names]
-            _df = _df.reset_index(_to_reset)
-            return _df.astype(dtype).set_index(index_cols).sort_index()
+        self.real = set_correct_types(self.real)
+
+        if self.simulated is not None:
+            self.simulated = set_correct_types(self.simulated)
 
-        index_cols = ["id"]
-        dtype = {"id": "category"}
+    @staticmethod
+    def calculate_per_id(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculates the metric for each tournament.
 
-        self.real = _set_correct_types(self.real)
+        -----
+        Parameters:
 
-        if self.simulated is not None:
-            self.simulated = _set_correct_types(self.simulated)
+            df: pd.DataFrame[
+                index = [
+                    "id" -> pd.Categorical[str]
+                        "{current_name}@/{sport}/{country}/{name-year}/",
+                    ...
+                ]
+                columns = [
+                    "team" -> str
+                        Team name.
+                    ... -> float
+                        Points gained (one column per tournament realization).
+                ]
+            ]
+                Points each team gained in each match (PointsPerMatch.df) or
+                accumulated standings (one row per team).
+
+        -----
+        Returns:
+            pd.DataFrame[
+                index = [
+                    "id" -> pd.Categorical[str]
+                        "{current_name}@/{sport}/{country}/{name-year}/",
+                ]
+                columns = [
+                    ... -> float
+                        Metric value (same columns as `df`, except for "team").
+                ]
+            ]
+        """
+        ...
+
+    @staticmethod
+    def calculate_from_tensor(tensor: StandingsTensor) -> np.ndarray:
+        """
+        Batched version of `calculate_per_id` (no groupby).
+
+        -----
+        Parameters:
+
+            tensor: StandingsTensor
+                Standings of each tournament and realization.
+
+        -----
+        Returns:
+            np.ndarray[float] (number of ids, number of realizations)
+                Metric value (use `tensor.to_frame` to convert it to pd.DataFrame).
+        """
+        ...
+
+    @staticmethod
+    def normalize(
+        coef_df: pd.DataFrame, real_ppm: pd.DataFrame | PointsPerMatch
+    ) -> pd.DataFrame:
+        """
+        Normalizes metric values (default: no normalization).
+
+        -----
+        Parameters:
+
+            coef_df: pd.DataFrame
+                Metric values for each tournament (real or simulated).
+
+            real_ppm: pd.DataFrame | PointsPerMatch
+                PointsPerMatch for the real tournaments.
+        """
+        return coef_df
+
+    @staticmethod
+    def normalize_from_tensor(
+        coef_df: pd.DataFrame, most_imbalanced: StandingsTensor
+    ) -> pd.DataFrame:
+        """
+        Same as `normalize`, but bounds are calculated from the standings of
+        the most imbalanced tournament (see `build_most_imbalanced_tournament`)
+        instead of the real matches, so they can be kept up to date without
+        rebuilding the matches (e.g. incremental engine).
+
+        Metrics that override `normalize` should also override this method.
+        Otherwise, the real matches are used.
+
+        -----
+        Parameters:
+
+            coef_df: pd.DataFrame
+                Metric values for each tournament (real or simulated).
+
+            most_imbalanced: StandingsTensor
+                Standings of the most imbalanced tournament (single column),
+                same ids (and order) as `coef_df`.
+        """
+        return coef_df
 
     @classmethod
     def from_points_per_match(
@@ -85,4 +196,34 @@ class Metric(metaclass=ABCMeta):
 
                 If None, they will be estimated directly from 'ppm'.
         """
-        ...
+        parameters = get_kwargs_from_points_per_match(
+            ppm,
+            cls.calculate_per_id,
+            num_iteration_simulation,
+            id_to_probabilities,
+            cls.normalize,
+        )
+        return cls(**parameters)
+
+    @classmethod
+    def simulate_from_points_per_match(
+        cls,
+        ppm: PointsPerMatch,
+        num_iteration_simulation: tuple[int, int],
+        id_to_probabilities: pd.Series | None = None,
+    ) -> pd.DataFrame | None:
+        """
+        Same as `cls.from_points_per_match(...).simulated`, but the metric of
+        the real tournaments is not calculated (nor normalized).
+
+        Used when simulations are run one batch at a time, so the real metric
+        is only calculated once.
+        """
+        simulated = simulate_from_points_per_match(
+            ppm,
+            cls.calculate_per_id,
+            num_iteration_simulation,
+            id_to_probabilities,
+            cls.normalize,
+        )
+        return None if simulated is None else set_correct_types(simulated)
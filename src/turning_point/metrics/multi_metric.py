@@ -0,0 +1,121 @@
+from typing import Mapping
+
+import pandas as pd
+
+from logs import log, turning_logger
+from tournament_simulations.data_structures import PointsPerMatch
+from tournament_simulations.simulations import SimulatePointsPerMatch
+
+from .metric import Metric, set_correct_types
+from .standings_tensor import StandingsTensor
+
+
+def calculate_all_per_id(
+    df: pd.DataFrame, metric_types: Mapping[str, type[Metric]]
+) -> pd.DataFrame:
+    """
+    Same as `metric_type.calculate_per_id(df)` for every metric, but standings
+    are accumulated only once (a single StandingsTensor for all metrics).
+
+    -----
+    Returns:
+        pd.DataFrame[
+            index = [
+                "id" -> pd.Categorical[str]
+                    "{current_name}@/{sport}/{country}/{name-year}/",
+            ]
+            columns = [  # multi level columns
+                (metric name, column) -> float
+                    Metric value (same columns as `df`, except for "team").
+            ]
+        ]
+    """
+    tensor = StandingsTensor.from_points_per_match(df)
+
+    return pd.concat(
+        {
+            name: tensor.to_frame(metric_type.calculate_from_tensor(tensor))
+            for name, metric_type in metric_types.items()
+        },
+        axis="columns",
+    )
+
+
+@log(turning_logger.debug)
+def metrics_from_points_per_match(
+    metric_types: Mapping[str, type[Metric]],
+    ppm: PointsPerMatch,
+    num_iteration_simulation: tuple[int, int],
+    id_to_probabilities: pd.Series | None = None,
+) -> dict[str, Metric]:
+    """
+    Same as `metric_type.from_points_per_match` for every metric, but
+    tournaments are simulated only once and every metric is calculated
+    from the same simulated tournaments.
+
+    -----
+    Parameters:
+
+        metric_types: Mapping[str, type[Metric]]
+            Metrics that should be calculated (e.g. METRIC_MAP).
+
+        Others: same as `Metric.from_points_per_match`.
+
+    -----
+    Returns:
+        dict[str, Metric]
+            Instance of each metric type (same keys as `metric_types`).
+    """
+
+    real_coef = calculate_all_per_id(ppm.df, metric_types)
+    name_to_simulated = simulate_metrics_from_points_per_match(
+        metric_types, ppm, num_iteration_simulation, id_to_probabilities
+    )
+
+    name_to_metric: dict[str, Metric] = {}
+    for name, metric_type in metric_types.items():
+        real = real_coef[name].rename(columns={"points": "real"})
+
+        simulated = None
+        if name_to_simulated is not None:
+            simulated = name_to_simulated[name]
+
+        name_to_metric[name] = metric_type(
+            real=metric_type.normalize(real, ppm), simulated=simulated
+        )
+
+    return name_to_metric
+
+
+def simulate_metrics_from_points_per_match(
+    metric_types: Mapping[str, type[Metric]],
+    ppm: PointsPerMatch,
+    num_iteration_simulation: tuple[int, int],
+    id_to_probabilities: pd.Series | None = None,
+) -> dict[str, pd.DataFrame] | None:
+    """
+    Same as `metrics_from_points_per_match`, but only the simulated metrics
+    (`Metric.simulated`) are calculated (see
+    `Metric.simulate_from_points_per_match`).
+
+    None if there are no simulations.
+    """
+
+    def _calculate_all(df: pd.DataFrame) -> pd.DataFrame:
+        return calculate_all_per_id(df, metric_types)
+
+    num_iteration, num_simulation_per_iter = num_iteration_simulation
+    if not (num_iteration and num_simulation_per_iter):
+        return None
+
+    simul_ppm = SimulatePointsPerMatch(ppm)
+    simulated_coef = simul_ppm.tournament_wide(
+        num_iteration_simulation=num_iteration_simulation,
+        id_to_probabilities=id_to_probabilities,
+        func_after_simulation=_calculate_all,
+    )
+
+    return {
+        name: set_correct_types(metric_type.normalize(simulated_coef[name], ppm))
+        for name, metric_type in metric_types.items()
+    }
@@ -0,0 +1,200 @@
+import hashlib
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from synthetic_tournaments.most_imbalanced import (
+    TeamRanks,
+    build_most_imbalanced_tournament,
+)
+from tournament_simulations.data_structures import PointsPerMatch
+
+CalculatePerId = Callable[[pd.DataFrame], pd.DataFrame]
+RoundRobinBound = Callable[[np.ndarray], np.ndarray]
+
+# Maximum number of layouts kept (least recently used ones are removed first)
+MAX_CACHED_BOUNDS = 100_000
+
+# (calculate_per_id, layout signature) -> metric of the most imbalanced tournament
+_BOUNDS_CACHE: OrderedDict[tuple[CalculatePerId, bytes], float] = OrderedDict()
+
+
+def clear_bounds_cache() -> None:
+    _BOUNDS_CACHE.clear()
+
+
+def _get_cached_bound(key: tuple[CalculatePerId, bytes]) -> float:
+    """
+    Cached bound of `key` (NaN if it is not cached).
+    """
+    if key not in _BOUNDS_CACHE:
+        return np.nan
+
+    _BOUNDS_CACHE.move_to_end(key)
+    return _BOUNDS_CACHE[key]
+
+
+def _cache_bound(key: tuple[CalculatePerId, bytes], bound: float) -> None:
+    _BOUNDS_CACHE[key] = bound
+    _BOUNDS_CACHE.move_to_end(key)
+
+    while len(_BOUNDS_CACHE) > MAX_CACHED_BOUNDS:
+        _BOUNDS_CACHE.popitem(last=False)
+
+
+def get_layout_signatures(ppm: pd.DataFrame | PointsPerMatch) -> pd.Series:
+    """
+    Canonical signature of each tournament's match layout (who plays whom).
+
+    Teams are ranked in the same order as `build_most_imbalanced_tournament`
+    (number of matches, ties broken by team order) and each match is replaced
+    by its pair of ranks. So tournaments with the same signature have the
+    same most imbalanced standings (up to team names), regardless of team
+    names, dates or match order.
+
+    Remark: The number of matches of each team is not enough. For instance,
+    A-B, B-C, C-D, D-A and A-B, A-B, C-D, C-D both have 2 matches per team,
+    but their most imbalanced standings are (0, 3, 3, 6) and (0, 6, 0, 6).
+
+    ----
+    Returns:
+        pd.Series[
+            index=[
+                "id" -> same order as `StandingsTensor.from_points_per_match`
+            ],
+            values=bytes (digest of the layout)
+        ]
+    """
+    return _get_layout_signatures(TeamRanks.from_points_per_match(ppm))
+
+
+def _get_layout_signatures(team_ranks: TeamRanks) -> pd.Series:
+    match_keys = _get_match_keys(team_ranks)
+
+    match_id_codes = team_ranks.id_codes[0::2]
+    match_order = np.lexsort((match_keys, match_id_codes))
+
+    num_ids = len(team_ranks.ids)
+    match_keys = match_keys[match_order]
+    match_bounds = np.searchsorted(match_id_codes[match_order], np.arange(num_ids + 1))
+
+    signatures = []
+    for code, num_teams in enumerate(team_ranks.num_teams):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(int(num_teams).to_bytes(8, "little"))
+        digest.update(match_keys[match_bounds[code] : match_bounds[code + 1]].tobytes())
+        signatures.append(digest.digest())
+
+    return pd.Series(signatures, index=team_ranks.ids.rename("id"), dtype=object)
+
+
+def _get_match_keys(team_ranks: TeamRanks) -> np.ndarray:
+    """
+    Pair of ranks (lower, upper) of each match encoded as a single integer.
+    """
+    home_ranks, away_ranks = team_ranks.ranks[0::2], team_ranks.ranks[1::2]
+
+    lower_ranks = np.minimum(home_ranks, away_ranks)
+    upper_ranks = np.maximum(home_ranks, away_ranks)
+    return lower_ranks * team_ranks.num_teams.max(initial=0) + upper_ranks
+
+
+def get_complete_round_robin_sizes(team_ranks: TeamRanks) -> np.ndarray:
+    """
+    Number of teams of each tournament that is a complete k-round-robin
+    (every pair of teams plays exactly k times, k >= 1) and 0 for the others.
+
+    In these tournaments every team plays the same number of matches, so the
+    most imbalanced standings are 3k * (0, 1, ..., n - 1) and the bounds
+    have a closed form that only depends on the number of teams (n).
+
+    ----
+    Returns:
+        np.ndarray[int] (number of ids,)
+    """
+    num_ids = len(team_ranks.ids)
+    match_id_codes = team_ranks.id_codes[0::2]
+
+    max_match_key = team_ranks.num_teams.max(initial=0) ** 2
+    pair_keys = match_id_codes * max_match_key + _get_match_keys(team_ranks)
+    unique_pair_keys, pair_counts = np.unique(pair_keys, return_counts=True)
+    pair_id_codes = unique_pair_keys // max_match_key
+
+    num_pairs = np.bincount(pair_id_codes, minlength=num_ids)
+
+    min_count = np.full(num_ids, np.iinfo(np.int64).max)
+    max_count = np.zeros(num_ids, dtype=np.int64)
+    np.minimum.at(min_count, pair_id_codes, pair_counts)
+    np.maximum.at(max_count, pair_id_codes, pair_counts)
+
+    num_teams = team_ranks.num_teams
+    is_round_robin = (
+        (num_teams >= 2)
+        & (num_pairs == num_teams * (num_teams - 1) // 2)
+        & (min_count == max_count)
+    )
+    return np.where(is_round_robin, num_teams, 0)
+
+
+def get_most_imbalanced_bound(
+    real_ppm: pd.DataFrame | PointsPerMatch,
+    calculate_per_id: CalculatePerId,
+    round_robin_bound: RoundRobinBound | None = None,
+) -> np.ndarray:
+    """
+    Same as `calculate_per_id(build_most_imbalanced_tournament(real_ppm))`,
+    but each distinct match layout (see `get_layout_signatures`) is only
+    calculated once per process.
+
+    Windows and permutations that share a team and match layout reuse the
+    cached value. At most `MAX_CACHED_BOUNDS` layouts are kept (least
+    recently used ones are calculated again if needed).
+
+    ----
+    Parameters:
+        round_robin_bound: Callable[[np.ndarray], np.ndarray] | None = None
+            Closed-form bound from the number of teams, used for complete
+            k-round-robins (see `get_complete_round_robin_sizes`).
+            If None, they are treated as any other tournament.
+
+    ----
+    Returns:
+        np.ndarray[float] (number of ids, 1)
+    """
+    if isinstance(real_ppm, PointsPerMatch):
+        real_ppm = real_ppm.df
+
+    team_ranks = TeamRanks.from_points_per_match(real_ppm)
+    bounds = np.full(len(team_ranks.ids), np.nan)
+
+    is_round_robin = np.zeros(len(team_ranks.ids), dtype=bool)
+    if round_robin_bound is not None:
+        num_teams = get_complete_round_robin_sizes(team_ranks)
+        is_round_robin = num_teams > 0
+        bounds[is_round_robin] = round_robin_bound(num_teams[is_round_robin])
+
+    if is_round_robin.all():
+        return bounds.reshape(-1, 1)
+
+    signatures = _get_layout_signatures(team_ranks)[~is_round_robin]
+    keys = [(calculate_per_id, signature) for signature in signatures]
+
+    other_bounds = np.array([_get_cached_bound(key) for key in keys], dtype=float)
+
+    is_missing = np.isnan(other_bounds)
+    if is_missing.any():
+        missing_ids = signatures.index[is_missing]
+        is_row_missing = real_ppm.index.get_level_values("id").isin(missing_ids)
+
+        most_imbalanced = build_most_imbalanced_tournament(real_ppm[is_row_missing])
+        missing_bounds = calculate_per_id(most_imbalanced).iloc[:, 0]
+        missing_bounds = missing_bounds.loc[missing_ids].to_numpy(dtype=float)
+
+        other_bounds[is_missing] = missing_bounds
+        for signature, bound in zip(signatures[is_missing], missing_bounds):
+            _cache_bound((calculate_per_id, signature), bound)
+
+    bounds[~is_round_robin] = other_bounds
+    return bounds.reshape(-1, 1)
@@ -5,11 +5,15 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 
-from synthetic_tournaments.most_imbalanced import build_most_imbalanced_tournament
 from tournament_simulations.data_structures import PointsPerMatch
 
-from .calculate_metric import get_kwargs_from_points_per_match
 from .metric import Metric
+from .normalization_bounds import get_most_imbalanced_bound
+from .standings_tensor import (
+    StandingsTensor,
+    apply_per_id,
+    batched_herfindahl_hirschman_index,
+)
 
 
 def herfindahl_hirschman_index(
@@ -31,6 +35,92 @@ def hhi_lower_bound(standings: pd.Series):
     return 1 / standings.groupby("id", observed=True).size()
 
 
+def _calculate_hhi_per_id(df: pd.DataFrame) -> pd.DataFrame:
+    return apply_per_id(batched_herfindahl_hirschman_index, df)
+
+
+def _get_hhi_lower_bound(real_ppm: pd.DataFrame | PointsPerMatch) -> np.ndarray:
+    if isinstance(real_ppm, PointsPerMatch):
+        real_ppm = real_ppm.df
+
+    rankings = real_ppm.groupby(["id", "team"], observed=True).sum()
+    return hhi_lower_bound(rankings).to_numpy().reshape(-1, 1)
+
+
+def _round_robin_hhi_upper_bound(num_teams: np.ndarray) -> np.ndarray:
+    """
+    HHI of standings (0, 1, ..., n - 1) (most imbalanced complete round-robin):
+        sum_i i^2 / (sum_i i)^2 = 2 * (2n - 1) / (3n * (n - 1))
+    """
+    return 2 * (2 * num_teams - 1) / (3 * num_teams * (num_teams - 1))
+
+
+def _get_hhi_upper_bound(real_ppm: pd.DataFrame | PointsPerMatch) -> np.ndarray:
+    return get_most_imbalanced_bound(
+        real_ppm, _calculate_hhi_per_id, _round_robin_hhi_upper_bound
+    )
+
+
+def _get_tensor_hhi_lower_bound(most_imbalanced: StandingsTensor) -> np.ndarray:
+    return 1 / most_imbalanced.num_teams
+
+
+def _normalize_hhi(
+    coef_df: pd.DataFrame, real_ppm: pd.DataFrame | PointsPerMatch
+) -> pd.DataFrame:
+    lower_bound = _get_hhi_lower_bound(real_ppm)
+    upper_bound = _get_hhi_upper_bound(real_ppm)
+    return _normalize_hhi_from_bounds(coef_df, lower_bound, upper_bound)
+
+
+def _normalize_hhi_from_tensor(
+    coef_df: pd.DataFrame, most_imbalanced: StandingsTensor
+) -> pd.DataFrame:
+    lower_bound = _get_tensor_hhi_lower_bound(most_imbalanced)
+    upper_bound = batched_herfindahl_hirschman_index(most_imbalanced)
+    return _normalize_hhi_from_bounds(coef_df, lower_bound, upper_bound)
+
+
+def _normalize_hhi_from_bounds(
+    coef_df: pd.DataFrame, lower_bound: np.ndarray, upper_bound: np.ndarray
+) -> pd.DataFrame:
+    nhhi = (coef_df - lower_bound) / (upper_bound - lower_bound)
+    return np.clip(nhhi, 0, 1)
+
+
+def _naive_normalize_hhi(
+    coef_df: pd.DataFrame, real_ppm: pd.DataFrame | PointsPerMatch
+) -> pd.DataFrame:
+    return _naive_normalize_hhi_from_bound(coef_df, _get_hhi_lower_bound(real_ppm))
+
+
+def _naive_normalize_hhi_from_tensor(
+    coef_df: pd.DataFrame, most_imbalanced: StandingsTensor
+) -> pd.DataFrame:
+    lower_bound = _get_tensor_hhi_lower_bound(most_imbalanced)
+    return _naive_normalize_hhi_from_bound(coef_df, lower_bound)
+
+
+def _naive_normalize_hhi_from_bound(
+    coef_df: pd.DataFrame, lower_bound: np.ndarray
+) -> pd.DataFrame:
+    nhhi = (coef_df - lower_bound) / (1 - lower_bound)
+    return np.clip(nhhi, 0, 1)
+
+
+def _normalize_hicb(
+    coef_df: pd.DataFrame, real_ppm: pd.DataFrame | PointsPerMatch
+) -> pd.DataFrame:
+    lower_bound = _get_hhi_lower_bound(real_ppm)
+    return coef_df / lower_bound
+
+
+def _normalize_hicb_from_tensor(
+    coef_df: pd.DataFrame, most_imbalanced: StandingsTensor
+) -> pd.DataFrame:
+    return coef_df / _get_tensor_hhi_lower_bound(most_imbalanced)
+
+
 @dataclass
 class NormalizedHHI(Metric):
     """
@@ -64,67 +154,10 @@ class NormalizedHHI(Metric):
     real: pd.DataFrame
     simulated: pd.DataFrame
 
-    @classmethod
-    def from_points_per_match(
-        cls,
-        ppm: PointsPerMatch,
-        num_iteration_simulation: tuple[int, int],
-        id_to_probabilities: pd.Series | None = None,
-    ) -> NormalizedHHI:
-        """
-        Creates an instance from PointsPerMatch.
-
-        -----
-        Parameters:
-
-            points_per_match: PointsPerMatch
-                Points each team gained in each match they played.
-
-            num_iteration_simulation: tuple[int, int]
-                Respectively, number of iterations and number
-                of simulations per iteration (batch size).
-
-            id_to_probabilities: pd.Series | None = None
-                Series mapping each tournament to its estimated probabilities.
-
-                Probabilities:  Mapping[tuple[float, float]: float]
-                    Maps each pair (tuple) to its probability (float).
-
-                    Pair: ranking points gained respectively by home-team and away-team.
-
-                If None, they will be estimated directly from 'ppm'.
-        """
-
-        def _calculate_hhi_per_id(df: pd.DataFrame) -> pd.DataFrame:
-            rankings = df.groupby(["id", "team"], observed=True).sum()
-            return rankings.groupby("id", observed=True).apply(hhi_fn)
-
-        def _normalization_fn(
-            coef_df: pd.DataFrame, real_ppm: PointsPerMatch
-        ) -> pd.DataFrame:
-            def _get_lower_bound():
-                _rankings = real_ppm.df.groupby(["id", "team"], observed=True).sum()
-                return hhi_lower_bound(_rankings)
-
-            def _get_upper_bound() -> pd.Series:
-                _df = build_most_imbalanced_tournament(real_ppm.df)
-                _rankings = _df.groupby(["id", "team"], observed=True).sum()
-                return _rankings.groupby("id", observed=True).apply(hhi_fn)
-
-            lower_bound = _get_lower_bound().to_numpy().reshape(-1, 1)
-            upper_bound = _get_upper_bound().to_numpy().reshape(-1, 1)
-
-            nhhi = (coef_df - lower_bound) / (upper_bound - lower_bound)
-            return np.clip(nhhi, 0, 1)
-
-        parameters = get_kwargs_from_points_per_match(
-            ppm,
-            _calculate_hhi_per_id,
-            num_iteration_simulation,
-            id_to_probabilities,
-            _normalization_fn,
-        )
-        return cls(**parameters)
+    calculate_per_id = staticmethod(_calculate_hhi_per_id)
+    calculate_from_tensor = staticmethod(batched_herfindahl_hirschman_index)
+    normalize = staticmethod(_normalize_hhi)
+    normalize_from_tensor = staticmethod(_normalize_hhi_from_tensor)
 
 
 @dataclass
@@ -160,60 +193,10 @@ class NaiveNormalizedHHI(Metric):
     real: pd.DataFrame
     simulated: pd.DataFrame
 
-    @classmethod
-    def from_points_per_match(
-        cls,
-        ppm: PointsPerMatch,
-        num_iteration_simulation: tuple[int, int],
-        id_to_probabilities: pd.Series | None = None,
-    ) -> NaiveNormalizedHHI:
-        """
-        Creates an instance from PointsPerMatch.
-
-        -----
-        Parameters:
-
-            points_per_match: PointsPerMatch
-                Points each team gained in each match they played.
-
-            num_iteration_simulation: tuple[int, int]
-                Respectively, number of iterations and number
-                of simulations per iteration (batch size).
-
-            id_to_probabilities: pd.Series | None = None
-                Series mapping each tournament to its estimated probabilities.
-
-                Probabilities:  Mapping[tuple[float, float]: float]
-                    Maps each pair (tuple) to its probability (float).
-
-                    Pair: ranking points gained respectively by home-team and away-team.
-
-                If None, they will be estimated directly from 'ppm'.
-        """
-
-        def _calculate_hhi_per_id(df: pd.DataFrame) -> pd.DataFrame:
-            rankings = df.groupby(["id", "team"], observed=True).sum()
-            return rankings.groupby("id", observed=True).apply(hhi_fn)
-
-        def _normalization_fn(
-            coef_df: pd.DataFrame, real_ppm: PointsPerMatch
-        ) -> pd.DataFrame:
-            def _get_lower_bound():
-                _rankings = real_ppm.df.groupby(["id", "team"], observed=True).sum()
-                return hhi_lower_bound(_rankings)
-
-            lower_bound = _get_lower_bound().to_numpy().reshape(-1, 1)
-            nhhi = (coef_df - lower_bound) / (1 - lower_bound)
-            return np.clip(nhhi, 0, 1)
-
-        parameters = get_kwargs_from_points_per_match(
-            ppm,
-            _calculate_hhi_per_id,
-            num_iteration_simulation,
-            id_to_probabilities,
-            _normalization_fn,
-        )
-        return cls(**parameters)
+    calculate_per_id = staticmethod(_calculate_hhi_per_id)
+    calculate_from_tensor = staticmethod(batched_herfindahl_hirschman_index)
+    normalize = staticmethod(_naive_normalize_hhi)
+    normalize_from_tensor = staticmethod(_naive_normalize_hhi_from_tensor)
 
 
 @dataclass
@@ -249,57 +232,7 @@ class HICB(Metric):
     real: pd.DataFrame
     simulated: pd.DataFrame
 
-    @classmethod
-    def from_points_per_match(
-        cls,
-        ppm: PointsPerMatch,
-        num_iteration_simulation: tuple[int, int],
-        id_to_probabilities: pd.Series | None = None,
-    ) -> HICB:
-        """
-        Creates an instance from PointsPerMatch.
-
-        -----
-        Parameters:
-
-            points_per_match: PointsPerMatch
-                Points each team gained in each match they played.
-
-            num_iteration_simulation: tuple[int, int]
-                Respectively, number of iterations and number
-                of simulations per iteration (batch size).
-
-            id_to_probabilities: pd.Series | None = None
-                Series mapping each tournament to its estimated probabilities.
-
-                Probabilities:  Mapping[tuple[float, float]: float]
-                    Maps each pair (tuple) to its probability (float).
-
-                    Pair: ranking points gained respectively by home-team and away-team.
-
-                If None, they will be estimated directly from 'ppm'.
-        """
-
-        def _calculate_hhi_per_id(df: pd.DataFrame) -> pd.DataFrame:
-            rankings = df.groupby(["id", "team"], observed=True).sum()
-            return rankings.groupby("id", observed=True).apply(hhi_fn)
-
-        def _normalization_fn(
-            coef_df: pd.DataFrame, real_ppm: PointsPerMatch
-        ) -> pd.DataFrame:
-            def _get_lower_bound():
-                _rankings = real_ppm.df.groupby(["id", "team"], observed=True).sum()
-                return hhi_lower_bound(_rankings)
-
-            lower_bound = _get_lower_bound().to_numpy().reshape(-1, 1)
-            return coef_df / lower_bound
-
-        parameters = get_kwargs_from_points_per_match(
-            ppm,
-            _calculate_hhi_per_id,
-            num_iteration_simulation,
-            id_to_probabilities,
-            _normalization_fn,
-        )
-
-        return cls(**parameters)
+    calculate_per_id = staticmethod(_calculate_hhi_per_id)
+    calculate_from_tensor = staticmethod(batched_herfindahl_hirschman_index)
+    normalize = staticmethod(_normalize_hicb)
+    normalize_from_tensor = staticmethod(_normalize_hicb_from_tensor)
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+from tournament_simulations.data_structures import PointsPerMatch
+
+
+@dataclass
+class StandingsTensor:
+    """
+    Final standings of many tournaments (and realizations) as a padded array.
+
+        values: np.ndarray[float] (number of ids, max number of teams, number of cols)
+            Points each team accumulated in each column (real or simulated).
+
+            Padded teams have 0 points.
+
+        mask: np.ndarray[bool] (number of ids, max number of teams)
+            Whether each position corresponds to a team (True) or padding (False).
+
+        ids: pd.Index
+            Tournament of each row ("id" index of PointsPerMatch).
+
+        columns: pd.Index
+            Name of each realization (e.g. "points" or f"s{i}").
+    """
+
+    values: np.ndarray
+    mask: np.ndarray
+    ids: pd.Index
+    columns: pd.Index
+
+    @property
+    def num_teams(self) -> np.ndarray:
+        """
+        Returns: np.ndarray[int] (number of ids, 1)
+        """
+        return self.mask.sum(axis=1, keepdims=True)
+
+    def to_frame(self, coefs: np.ndarray) -> pd.DataFrame:
+        """
+        coefs: np.ndarray[float] (number of ids, number of cols)
+            Output of a batched kernel.
+        """
+        return pd.DataFrame(coefs, index=self.ids.rename("id"), columns=self.columns)
+
+    @classmethod
+    def from_team_points(
+        cls,
+        points: np.ndarray,
+        id_codes: np.ndarray,
+        ids: pd.Index,
+        columns: Iterable[str],
+    ) -> StandingsTensor:
+        """
+        Create an instance from standings (one row per team).
+
+        -----
+        Parameters:
+
+            points: np.ndarray[float] (number of teams, number of cols)
+                Points each team accumulated.
+
+            id_codes: np.ndarray[int] (number of teams,)
+                Position of each team's tournament in `ids`.
+
+            ids: pd.Index
+                All tournaments. Only observed ones are kept.
+
+            columns: Iterable[str]
+                Name of each column of `points`.
+        """
+        observed_codes, id_positions = np.unique(id_codes, return_inverse=True)
+        id_positions = id_positions.reshape(-1)
+
+        teams_per_id = np.bincount(id_positions, minlength=len(observed_codes))
+        first_team = np.cumsum(teams_per_id) - teams_per_id
+
+        order = np.argsort(id_positions, kind="stable")
+        team_positions = np.empty_like(order)
+        team_positions[order] = np.arange(len(order)) - first_team[id_positions[order]]
+
+        max_num_teams = teams_per_id.max(initial=0)
+        values = np.zeros((len(observed_codes), max_num_teams, points.shape[1]))
+        values[id_positions, team_positions] = points
+
+        mask = np.zeros((len(observed_codes), max_num_teams), dtype=bool)
+        mask[id_positions, team_positions] = True
+
+        return cls(values, mask, ids[observed_codes], pd.Index(columns))
+
+    @classmethod
+    def from_points_per_match(
+        cls, ppm: pd.DataFrame | PointsPerMatch
+    ) -> StandingsTensor:
+        """
+        Create an instance from PointsPerMatch (points gained in each match).
+
+        Every column other than "team" is considered a realization.
+        """
+        if isinstance(ppm, PointsPerMatch):
+            ppm = ppm.df
+
+        id_codes, ids = pd.factorize(ppm.index.get_level_values("id"), sort=True)
+        team_codes, _ = pd.factorize(ppm["team"])
+
+        slot_keys = id_codes.astype(np.int64) * (team_codes.max() + 1) + team_codes
+        row_order = np.argsort(slot_keys, kind="stable")
+        slot_keys, first_rows = np.unique(slot_keys[row_order], return_index=True)
+
+        columns = ppm.columns.drop("team")
+        points = ppm[columns].to_numpy(dtype=float)[row_order]
+        team_points = np.add.reduceat(points, first_rows, axis=0)
+
+        num_team_codes = team_codes.max() + 1
+        return cls.from_team_points(
+            team_points, slot_keys // num_team_codes, ids, columns
+        )
+
+
+def apply_per_id(
+    kernel: Callable[[StandingsTensor], np.ndarray], ppm: pd.DataFrame | PointsPerMatch
+) -> pd.DataFrame:
+    """
+    Same as `ppm.groupby(["id", "team"]).sum().groupby("id").apply(metric)`.
+    """
+    tensor = StandingsTensor.from_points_per_match(ppm)
+    return tensor.to_frame(kernel(tensor))
+
+
+def _masked_sum(tensor: StandingsTensor, values: np.ndarray) -> np.ndarray:
+    return np.where(tensor.mask[:, :, np.newaxis], values, 0).sum(axis=1)
+
+
+def _lerp(lower: np.ndarray, upper: np.ndarray, weight: np.ndarray) -> np.ndarray:
+    """
+    Same linear interpolation as np.quantile.
+    """
+    with np.errstate(invalid="ignore"):
+        diff = upper - lower
+        return np.where(
+            weight >= 0.5, upper - diff * (1 - weight), lower + diff * weight
+        )
+
+
+def _sort_teams(tensor: StandingsTensor, padding: float) -> np.ndarray:
+    """
+    Sort each standings (ascending). Padded teams are moved to the end.
+    """
+    values = np.where(tensor.mask[:, :, np.newaxis], tensor.values, padding)
+    return np.sort(values, axis=1)
+
+
+def _batched_quantile(
+    sorted_values: np.ndarray, num_teams: np.ndarray, q: float
+) -> np.ndarray:
+    """
+    sorted_values: np.ndarray[float] (number of ids, max number of teams, num cols)
+        Ascending standings (padded teams at the end).
+
+    num_teams: np.ndarray[int] (number of ids, 1)
+    """
+    position = q * (num_teams - 1)
+    lower_position = np.floor(position).astype(int)
+    upper_position = np.minimum(lower_position + 1, num_teams - 1)
+
+    def _take(positions: np.ndarray) -> np.ndarray:
+        index = positions[:, :, np.newaxis]
+        return np.take_along_axis(sorted_values, index, axis=1)[:, 0, :]
+
+    weight = position - lower_position
+    return _lerp(_take(lower_position), _take(upper_position), weight)
+
+
+def batched_variance(tensor: StandingsTensor) -> np.ndarray:
+    """
+    Ranking variance (ddof=1) of each standings.
+
+    Returns: np.ndarray[float] (number of ids, number of cols)
+    """
+    num_teams = tensor.num_teams
+    mean = _masked_sum(tensor, tensor.values) / num_teams
+
+    squared_diff = (tensor.values - mean[:, np.newaxis, :]) ** 2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _masked_sum(tensor, squared_diff) / (num_teams - 1)
+
+
+def batched_interquartile_range(tensor: StandingsTensor) -> np.ndarray:
+    """
+    Interquartile range (linear interpolation) of each standings.
+
+    Returns: np.ndarray[float] (number of ids, number of cols)
+    """
+    sorted_values = _sort_teams(tensor, np.inf)
+    num_teams = tensor.num_teams
+
+    first_quartile = _batched_quantile(sorted_values, num_teams, 0.25)
+    third_quartile = _batched_quantile(sorted_values, num_teams, 0.75)
+    return third_quartile - first_quartile
+
+
+def _normalized_values(tensor: StandingsTensor) -> np.ndarray:
+    """
+    Each team's share of the total points.
+    """
+    total = _masked_sum(tensor, tensor.values)[:, np.newaxis, :]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return tensor.values / total
+
+
+def batched_herfindahl_hirschman_index(tensor: StandingsTensor) -> np.ndarray:
+    """
+    Herfindahl Hirschman Index of each standings.
+
+    Returns: np.ndarray[float] (number of ids, number of cols)
+    """
+    squared_shares = np.nan_to_num(_normalized_values(tensor) ** 2)
+    return _masked_sum(tensor, squared_shares)
+
+
+def sorted_gini(sorted_values: np.ndarray, num_teams: np.ndarray) -> np.ndarray:
+    """
+    Closed-form Gini index of standings already sorted in ascending order:
+
+        G = sum_i (2i - n - 1) * x_(i) / (n * sum_i x_(i)),    i = 1, ..., n
+
+    which is the same as the mean absolute difference over all pairs
+    divided by twice the mean, in O(n) after sorting.
+
+    -----
+    Parameters:
+
+        sorted_values: np.ndarray[float] (..., max number of teams, number of cols)
+            Ascending standings. Positions after `num_teams` (padding) are ignored.
+
+        num_teams: np.ndarray[int] (..., 1)
+            Number of teams in each standings.
+
+    -----
+    Returns:
+        np.ndarray[float] (..., number of cols)
+    """
+    rank = np.arange(1, sorted_values.shape[-2] + 1)[:, np.newaxis]
+    num_teams = num_teams[..., np.newaxis]
+
+    is_team = rank <= num_teams
+    values = np.where(is_team, sorted_values, 0)
+    weights = np.where(is_team, 2 * rank - num_teams - 1, 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weighted_sum = (weights * values).sum(axis=-2)
+        return weighted_sum / (num_teams[..., 0] * values.sum(axis=-2))
+
+
+def batched_gini(tensor: StandingsTensor) -> np.ndarray:
+    """
+    Gini index of each standings (see `sorted_gini`).
+
+    Returns: np.ndarray[float] (number of ids, number of cols)
+    """
+    return sorted_gini(_sort_teams(tensor, np.inf), tensor.num_teams)
+
+
+def top_k_sum(values: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """
+    Sum of the k largest values of each standings, using np.partition
+    (no full sort). Standings with the same k are partitioned together.
+
+    -----
+    Parameters:
+
+        values: np.ndarray[float] (number of standings, max number of teams, cols)
+            Padded teams must be -np.inf.
+
+        k: np.ndarray[int] (number of standings,)
+            How many values should be summed for each standings.
+
+    -----
+    Returns:
+        np.ndarray[float] (number of standings, number of cols)
+    """
+    width = values.shape[1]
+    result = np.zeros((values.shape[0], values.shape[2]))
+
+    for size in np.unique(k):
+        if size == 0:
+            continue
+
+        rows = k == size
+        top_values = np.partition(values[rows], width - size, axis=1)[:, width - size :]
+        result[rows] = top_values.sum(axis=1)
+
+    return result
+
+
+def batched_normalized_top_x_cr(tensor: StandingsTensor, x: float = 0.25) -> np.ndarray:
+    """
+    Normalized top X% concentration ratio of each standings.
+
+    Returns: np.ndarray[float] (number of ids, number of cols)
+    """
+    num_teams = tensor.num_teams
+    top_x_percent_size = (num_teams * x).astype(int)
+
+    shares = np.nan_to_num(_normalized_values(tensor))
+    shares = np.where(tensor.mask[:, :, np.newaxis], shares, -np.inf)
+
+    top_x_percent = top_k_sum(shares, top_x_percent_size[:, 0])
+
+    adjusted_x = top_x_percent_size / num_teams
+    return np.divide(top_x_percent, adjusted_x, out=top_x_percent, where=adjusted_x > 0)
+
+
+def batched_fast_normalized_top_x_cr(
+    tensor: StandingsTensor, x: float = 0.25
+) -> np.ndarray:
+    """
+    Normalized top X% concentration ratio of each standings.
+
+    Same as `fast_normalized_top_x_percent_concentration_ratio`: uses the
+    (1 - x)-quantile to determine which teams are in the top X%.
+
+    Returns: np.ndarray[float] (number of ids, number of cols)
+    """
+    num_teams = tensor.num_teams
+
+    shares = np.where(tensor.mask[:, :, np.newaxis], _normalized_values(tensor), np.nan)
+    sorted_shares = np.where(np.isnan(shares), np.inf, shares)
+    sorted_shares = np.sort(sorted_shares, axis=1)
+
+    x_quantile = _batched_quantile(sorted_shares, num_teams, 1 - x)
+    is_top = tensor.mask[:, :, np.newaxis] & (shares > x_quantile[:, np.newaxis, :])
+
+    normalization = is_top.sum(axis=1) / num_teams
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(is_top, shares, 0).sum(axis=1) / normalization
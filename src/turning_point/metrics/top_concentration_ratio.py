@@ -2,12 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
-from tournament_simulations.data_structures import PointsPerMatch
-
-from .calculate_metric import get_kwargs_from_points_per_match
 from .metric import Metric
+from .standings_tensor import (
+    apply_per_id,
+    batched_fast_normalized_top_x_cr,
+    batched_normalized_top_x_cr,
+    top_k_sum,
+)
 
 
 def top_x_percent_concentration_ratio(
@@ -22,19 +26,17 @@ def top_x_percent_concentration_ratio(
         True: must sort each ranking
         False: rankings are already sorted
     """
-    normalized_standings = standings / standings.sum()
+    values = standings.to_numpy(dtype=float).reshape(len(standings), -1)
+    normalized_standings = np.nan_to_num(values / values.sum(axis=0))
     top_x_percent_size = int(len(normalized_standings) * x)
 
+    top_k = np.array([top_x_percent_size])
+    result = top_k_sum(normalized_standings[np.newaxis], top_k)[0]
+
     if isinstance(standings, pd.Series):
-        return normalized_standings.nlargest(top_x_percent_size).sum()
+        return result[0]
 
-    return pd.Series(
-        [
-            normalized_standings[col].nlargest(top_x_percent_size).sum()
-            for col in normalized_standings
-        ],
-        index=normalized_standings.columns,
-    )
+    return pd.Series(result, index=standings.columns)
 
 
 def normalized_top_x_percent_concentration_ratio(
@@ -76,6 +78,14 @@ def fast_normalized_top_x_percent_concentration_ratio(
     return normalized_standings[top_index].sum() / normalization
 
 
+def _calculate_exact_normalized_top_x_cr_per_id(df: pd.DataFrame) -> pd.DataFrame:
+    return apply_per_id(batched_normalized_top_x_cr, df)
+
+
+def _calculate_normalized_top_x_cr_per_id(df: pd.DataFrame) -> pd.DataFrame:
+    return apply_per_id(batched_fast_normalized_top_x_cr, df)
+
+
 @dataclass
 class NormConcentrationRatio(Metric):
     """
@@ -109,49 +119,8 @@ class NormConcentrationRatio(Metric):
     real: pd.DataFrame
     simulated: pd.DataFrame
 
-    @classmethod
-    def from_points_per_match(
-        cls,
-        ppm: PointsPerMatch,
-        num_iteration_simulation: tuple[int, int],
-        id_to_probabilities: pd.Series | None = None,
-    ) -> NormConcentrationRatio:
-        """
-        Creates an instance from PointsPerMatch.
-
-        -----
-        Parameters:
-
-            points_per_match: PointsPerMatch
-                Points each team gained in each match they played.
-
-            num_iteration_simulation: tuple[int, int]
-                Respectively, number of iterations and number
-                of simulations per iteration (batch size).
-
-            id_to_probabilities: pd.Series | None = None
-                Series mapping each tournament to its estimated probabilities.
-
-                Probabilities:  Mapping[tuple[float, float]: float]
-                    Maps each pair (tuple) to its probability (float).
-
-                    Pair: ranking points gained respectively by home-team and away-team.
-
-                If None, they will be estimated directly from 'ppm'.
-        """
-
-        def _calculate_normalized_top_x_cr_per_id(df: pd.DataFrame) -> pd.DataFrame:
-            rankings = df.groupby(["id", "team"], observed=True).sum()
-            top_x_cr_fn = normalized_top_x_percent_concentration_ratio
-            return rankings.groupby("id", observed=True).apply(top_x_cr_fn)
-
-        parameters = get_kwargs_from_points_per_match(
-            ppm,
-            _calculate_normalized_top_x_cr_per_id,
-            num_iteration_simulation,
-            id_to_probabilities,
-        )
-        return cls(**parameters)
+    calculate_per_id = staticmethod(_calculate_exact_normalized_top_x_cr_per_id)
+    calculate_from_tensor = staticmethod(batched_normalized_top_x_cr)
 
 
 @dataclass
@@ -187,46 +156,5 @@ class FastNormConcentrationRatio(Metric):
     real: pd.DataFrame
     simulated: pd.DataFrame
 
-    @classmethod
-    def from_points_per_match(
-        cls,
-        ppm: PointsPerMatch,
-        num_iteration_simulation: tuple[int, int],
-        id_to_probabilities: pd.Series | None = None,
-    ) -> FastNormConcentrationRatio:
-        """
-        Creates an instance from PointsPerMatch.
-
-        -----
-        Parameters:
-
-            points_per_match: PointsPerMatch
-                Points each team gained in each match they played.
-
-            num_iteration_simulation: tuple[int, int]
-                Respectively, number of iterations and number
-                of simulations per iteration (batch size).
-
-            id_to_probabilities: pd.Series | None = None
-                Series mapping each tournament to its estimated probabilities.
-
-                Probabilities:  Mapping[tuple[float, float]: float]
-                    Maps each pair (tuple) to its probability (float).
-
-                    Pair: ranking points gained respectively by home-team and away-team.
-
-                If None, they will be estimated directly from 'ppm'.
-        """
-
-        def _calculate_normalized_top_x_cr_per_id(df: pd.DataFrame) -> pd.DataFrame:
-            rankings = df.groupby(["id", "team"], observed=True).sum()
-            top_x_cr_fn = fast_normalized_top_x_percent_concentration_ratio
-            return rankings.groupby("id", observed=True).apply(top_x_cr_fn)
-
-        parameters = get_kwargs_from_points_per_match(
-            ppm,
-            _calculate_normalized_top_x_cr_per_id,
-            num_iteration_simulation,
-            id_to_probabilities,
-        )
-        return cls(**parameters)
+    calculate_per_id = staticmethod(_calculate_normalized_top_x_cr_per_id)
+    calculate_from_tensor = staticmethod(batched_fast_normalized_top_x_cr)
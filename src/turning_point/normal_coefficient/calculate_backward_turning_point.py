@@ -0,0 +1,133 @@
+from typing import Literal, Mapping
+
+import numpy as np
+import pandas as pd
+
+from logs import log, turning_logger
+from tournament_simulations.data_structures import Matches
+from turning_point.metric_stats import SimulationMetricStats
+from turning_point.metric_stats.get_matches_in_window import MatchesWindowIndex
+from turning_point.metric_stats.metric_stats import RESULT_TO_POINTS
+from turning_point.metrics import Metric, Variances
+
+from .calculate_turning_point import COMPARISON_MAP, ComparisonType
+
+KwargsBTP = dict[Literal["df", "expanding_stats"], pd.DataFrame]
+
+
+def _turning_point_from_trailing_run(
+    num_windows: np.ndarray, trailing_run: np.ndarray
+) -> tuple[list[float], list[float]]:
+    """
+    Same as `_find_turning_point_one_id` and `_find_turning_point_percent_one_id`,
+    but only the size of the trailing sequence of True (`trailing_run`) is needed.
+    """
+    turning_points: list[float] = []
+    percents: list[float] = []
+
+    for size, run in zip(num_windows.tolist(), trailing_run.tolist()):
+        if run == 0:
+            turning_point = np.inf
+        else:
+            turning_point = size - run
+
+        turning_points.append(turning_point)
+        percents.append((turning_point + 1) / size)
+
+    return turning_points, percents
+
+
+@log(turning_logger.debug)
+def get_kwargs_backward_from_matches(
+    matches: Matches,
+    num_iteration_simulation: tuple[int, int],
+    winner_type: Literal["winner", "result"] = "winner",
+    winner_to_points: Mapping[str, tuple[float, float]] = RESULT_TO_POINTS,
+    id_to_probabilities: pd.Series | None = None,
+    quantile: float | None = None,
+    metric_type: type[Metric] = Variances,
+    error_tolerance: float | None = None,
+    comparison: ComparisonType = "upper",
+) -> KwargsBTP:
+    """
+    Turning point without simulating every expanding window.
+
+    The turning point only depends on the trailing sequence of windows
+    whose real metric is outside of the envelope (above the quantile for the
+    default `comparison`). So windows are evaluated from
+    the last date backwards, and a tournament stops being evaluated at its
+    first window where the real metric is inside the envelope.
+
+    Windows of all tournaments that are still being evaluated are simulated
+    together (one window per tournament at each step).
+
+    Results are the same as calculating `ExpandingMetricStats` (window engine)
+    and then `TurningPoint.from_expanding_var_stats` (up to simulation noise).
+
+    -----
+    Parameters:
+
+        Same as `get_kwargs_expanding_from_matches`.
+
+        comparison: Literal["upper", "lower", "mean"] = "upper"
+            See `get_kwargs_from_expanding_variances_stats`.
+
+    -----
+    Returns:
+        Kwargs parameters:
+            "df": Turning point values for all tournaments (see TurningPoint).
+            "expanding_stats": ExpandingMetricStats dataframe with only the
+                               windows that were evaluated.
+    """
+    window_index = MatchesWindowIndex.from_matches(matches)
+
+    num_windows = window_index.last_dates - window_index.first_dates + 1
+    trailing_run = np.zeros(window_index.num_tournaments, dtype=int)
+
+    all_stats: list[pd.DataFrame] = []
+
+    active = np.arange(window_index.num_tournaments)
+    steps_back = 0
+
+    while len(active) > 0:
+        final_dates = window_index.last_dates[active] - steps_back
+        matches_window = window_index.select_prefixes(active, final_dates)
+
+        stats = SimulationMetricStats.from_matches(
+            matches_window,
+            num_iteration_simulation,
+            winner_type,
+            winner_to_points,
+            id_to_probabilities,
+            quantile,
+            metric_type,
+            error_tolerance,
+        ).df
+
+        active_ids = window_index.ids[active]
+        stats = stats.loc[active_ids]
+        stats["final date"] = final_dates.astype(np.int16)
+        all_stats.append(stats)
+
+        is_outside = COMPARISON_MAP[comparison](stats).to_numpy(dtype=bool)
+        trailing_run[active[is_outside]] += 1
+
+        has_previous_window = final_dates > window_index.first_dates[active]
+        active = active[is_outside & has_previous_window]
+        steps_back += 1
+
+    turning_points, percents = _turning_point_from_trailing_run(
+        num_windows, trailing_run
+    )
+    turning_point = pd.DataFrame(
+        {
+            "id": window_index.ids,
+            "turning point": turning_points,
+            "%turning point": percents,
+        }
+    )
+
+    return {
+        "df": turning_point.set_index("id"),
+        "expanding_stats": pd.concat(all_stats),
+    }
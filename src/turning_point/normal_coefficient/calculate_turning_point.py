@@ -1,4 +1,4 @@
-from typing import Literal, Sequence
+from typing import Callable, Literal, Sequence
 
 import numpy as np
 import pandas as pd
@@ -8,6 +8,15 @@ from turning_point.metric_stats import ExpandingMetricStats
 
 KwargsTP = dict[Literal["df"], pd.DataFrame]
 
+ComparisonType = Literal["upper", "lower", "mean"]
+
+# stats dataframe -> whether the real metric is outside of the envelope
+COMPARISON_MAP: dict[ComparisonType, Callable[[pd.DataFrame], pd.Series]] = {
+    "upper": lambda df: df["real"] > df["quantile"],
+    "lower": lambda df: df["real"] < df["quantile"],
+    "mean": lambda df: df["real"] > df["mean"],
+}
+
 
 def _find_turning_point_one_id(sequence: Sequence[bool]) -> float:
     """
@@ -37,9 +46,48 @@ def _find_turning_point_percent_one_id(sequence: Sequence[bool]) -> float:
     return (_find_turning_point_one_id(sequence) + 1) / len(sequence)
 
 
+def find_turning_points(
+    id_codes: np.ndarray, is_outside: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized `_find_turning_point_one_id` and
+    `_find_turning_point_percent_one_id` for all tournaments at once.
+
+    ----
+    Parameters:
+        id_codes: np.ndarray[int]
+            Tournament of each window. Windows of the same tournament must be
+            contiguous and sorted by final date.
+
+        is_outside: np.ndarray[bool]
+            Whether the real metric is outside of the envelope in each window.
+
+    ----
+    Returns:
+        tuple[np.ndarray[int], np.ndarray[float], np.ndarray[float]]
+            First window of each tournament, turning point and
+            turning point percentage.
+    """
+    if len(id_codes) == 0:
+        empty = np.array([], dtype=float)
+        return np.array([], dtype=int), empty, empty
+
+    starts = np.flatnonzero(np.r_[True, id_codes[1:] != id_codes[:-1]])
+    sizes = np.diff(np.r_[starts, len(id_codes)])
+
+    position = np.arange(len(id_codes)) - np.repeat(starts, sizes)
+    last_false = np.maximum.reduceat(np.where(is_outside, -1, position), starts)
+
+    turning_point = (last_false + 1).astype(float)
+    turning_point[~is_outside[starts + sizes - 1]] = np.inf
+
+    return starts, turning_point, (turning_point + 1) / sizes
+
+
 @log(turning_logger.debug)
 def get_kwargs_from_expanding_variances_stats(
     expanding_var: ExpandingMetricStats,
+    comparison: ComparisonType = "upper",
 ) -> KwargsTP:
     """
     Calculate turning point.
@@ -54,22 +102,35 @@ def get_kwargs_from_expanding_variances_stats(
 
             Each date number window starting at zero has it own value.
 
+        comparison: Literal["upper", "lower", "mean"] = "upper"
+            When the real metric is considered outside of the envelope.
+                upper: real > quantile
+                lower: real < quantile (for a lower quantile, e.g. 0.05)
+                mean: real > mean
+
     ----
     Returns:
         Returns kwargs required to create an instance of TurningPoint:
             "df": Turning point values for all tournaments.
     """
+    stats = expanding_var.df
+    if not stats.index.is_monotonic_increasing:
+        stats = stats.sort_index()
+
+    is_outside = COMPARISON_MAP[comparison](stats).to_numpy(dtype=bool)
+
+    ids = stats.index.get_level_values("id")
+    id_codes = pd.Categorical(ids).codes
 
-    real_var = expanding_var.df["real"]
-    simul_quantile = expanding_var.df["quantile"]
+    starts, turning_point, percent = find_turning_points(id_codes, is_outside)
 
-    real_greater_quantile = real_var > simul_quantile
+    # integers (same as the per-tournament functions) if there is no inf
+    if np.isfinite(turning_point).all():
+        turning_point = turning_point.astype(np.int64)
 
-    turning_point = (  # agg groups together all final dates booleans
-        real_greater_quantile.groupby("id", observed=True)
-        .agg([_find_turning_point_one_id, _find_turning_point_percent_one_id])
-        .set_axis(["turning point", "%turning point"], axis="columns")
-        .sort_index()
+    df = pd.DataFrame(
+        {"turning point": turning_point, "%turning point": percent},
+        index=ids[starts],
     )
 
-    return {"df": turning_point}
+    return {"df": df}
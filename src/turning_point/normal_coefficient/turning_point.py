@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Literal, Mapping
 
 import pandas as pd
 
+from tournament_simulations.data_structures import Matches
 from turning_point.metric_stats import ExpandingMetricStats
+from turning_point.metric_stats.metric_stats import RESULT_TO_POINTS
+from turning_point.metrics import Metric, Variances
 
-from .calculate_turning_point import get_kwargs_from_expanding_variances_stats
+from .calculate_backward_turning_point import get_kwargs_backward_from_matches
+from .calculate_turning_point import (
+    ComparisonType,
+    get_kwargs_from_expanding_variances_stats,
+)
 
 
 @dataclass
 class TurningPoint:
-
     """
     Stores turning point calculated for all tournaments.
 
@@ -40,7 +47,9 @@ class TurningPoint:
 
     @classmethod
     def from_expanding_var_stats(
-        cls, expanding_stats: ExpandingMetricStats
+        cls,
+        expanding_stats: ExpandingMetricStats,
+        comparison: ComparisonType = "upper",
     ) -> TurningPoint:
         """
         Creates an instance of TurningPoint from expanding variances stats.
@@ -54,7 +63,64 @@ class TurningPoint:
                 2) Statistical data (mean and 0.95-quantile) over all simulations.
 
                 Each date number window starting at zero has it own value.
+
+            comparison: Literal["upper", "lower", "mean"] = "upper"
+                When the real metric is considered outside of the envelope.
+                    upper: real > quantile
+                    lower: real < quantile (for a lower quantile, e.g. 0.05)
+                    mean: real > mean
         """
 
-        parameters = get_kwargs_from_expanding_variances_stats(expanding_stats)
+        parameters = get_kwargs_from_expanding_variances_stats(
+            expanding_stats, comparison
+        )
         return cls(**parameters)
+
+    @classmethod
+    def from_matches_backward(
+        cls,
+        matches: Matches,
+        num_iteration_simulation: tuple[int, int],
+        winner_type: Literal["winner", "result"] = "winner",
+        winner_to_points: Mapping[str, tuple[float, float]] = RESULT_TO_POINTS,
+        id_to_probabilities: pd.Series | None = None,
+        quantile: float | None = None,
+        metric_type: type[Metric] = Variances,
+        error_tolerance: float | None = None,
+        comparison: ComparisonType = "upper",
+    ) -> tuple[TurningPoint, ExpandingMetricStats]:
+        """
+        Creates an instance of TurningPoint directly from Matches.
+
+        Windows are evaluated from the last date backwards and each tournament
+        stops at its first window with the real metric inside the envelope,
+        so most windows before the turning point are never simulated.
+
+        -----
+        Parameters:
+
+            Same as `ExpandingMetricStats.from_matches` (window engine)
+            and `comparison` as in `from_expanding_var_stats`.
+
+        -----
+        Returns:
+            tuple[TurningPoint, ExpandingMetricStats]
+                Turning point and the stats of the windows that were evaluated.
+
+                Remark: The stats are sparse (only the last windows of each
+                tournament), so `TurningPoint.from_expanding_var_stats` should
+                not be used with them.
+        """
+        parameters = get_kwargs_backward_from_matches(
+            matches,
+            num_iteration_simulation,
+            winner_type,
+            winner_to_points,
+            id_to_probabilities,
+            quantile,
+            metric_type,
+            error_tolerance,
+            comparison,
+        )
+        expanding_stats = ExpandingMetricStats(parameters["expanding_stats"])
+        return cls(parameters["df"]), expanding_stats
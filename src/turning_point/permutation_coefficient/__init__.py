@@ -2,13 +2,27 @@
 Module for storing turning points for permutation of real tournaments' schedules.
 """
 
+from .identifiers import IDENTIFIER_LEVELS, TournamentIdentifiers
 from .permutation_turning_point import PermutationTurningPoint
 from .turning_point_comparison import get_turning_point_comparison
-from .utils import get_data_with_identifier, get_permutation_identifiers
+from .utils import (
+    get_data_with_identifier,
+    get_permutation_identifiers,
+    get_permutation_runs,
+    get_permutation_sizes,
+    partition_by_permutation,
+    partition_chunks_by_permutation,
+)
 
 __all__ = [
+    "IDENTIFIER_LEVELS",
+    "TournamentIdentifiers",
     "PermutationTurningPoint",
     "get_turning_point_comparison",
     "get_data_with_identifier",
     "get_permutation_identifiers",
+    "get_permutation_runs",
+    "get_permutation_sizes",
+    "partition_by_permutation",
+    "partition_chunks_by_permutation",
 ]
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+IDENTIFIER_LEVELS = [
+    "base id",
+    "tournament",
+    "sport",
+    "country",
+    "season",
+    "permutation",
+]
+
+# "{base id}@{permutation}": greedy, so the permutation is after the last "@"
+PERMUTATION_REGEX = r"(?P<base>.+@.+)@(?P<permutation>.+)"
+ANY_PERMUTATION_REGEX = r"(?P<base>.+)@(?P<permutation>.+)"
+
+# "{current_name}@/{sport}/{country}/{name-year}"
+TOURNAMENT_REGEX = (
+    r"(?P<tournament>.+?)@/(?P<sport>.+?)/(?P<country>.+?)/(?P<season>.+)"
+)
+
+IdIndex = pd.Index | pd.MultiIndex | pd.Series | pd.DataFrame
+
+
+def _get_id_values(id_index: IdIndex) -> pd.Index:
+    if not isinstance(id_index, pd.Index):
+        id_index = id_index.index
+
+    if isinstance(id_index, pd.MultiIndex) or id_index.name == "id":
+        return id_index.get_level_values("id")
+
+    return id_index
+
+
+def _parse_ids(ids: pd.Index, always_permuted: bool) -> pd.DataFrame:
+    """
+    Parse each (unique) id once. Columns are the same as `IDENTIFIER_LEVELS`.
+    """
+    str_ids = ids.astype(str)
+
+    regex = ANY_PERMUTATION_REGEX if always_permuted else PERMUTATION_REGEX
+    permutation_parts = str_ids.str.extract(regex)
+
+    is_permuted = permutation_parts["permutation"].notna().to_numpy()
+    base_ids = np.where(is_permuted, permutation_parts["base"], str_ids)
+    permutations = permutation_parts["permutation"].fillna("")
+
+    tournament_parts = pd.Index(base_ids).str.extract(TOURNAMENT_REGEX)
+
+    parsed = pd.concat(
+        [pd.Series(base_ids, name="base id"), tournament_parts, permutations],
+        axis="columns",
+    )
+    parsed.index = ids.rename("id")
+
+    return parsed.astype("category")
+
+
+@dataclass
+class TournamentIdentifiers:
+    """
+    Structured view of tournament ids:
+        "{current_name}@/{sport}/{country}/{name-year}"
+        "{current_name}@/{sport}/{country}/{name-year}@{permutation_id}"
+
+    Each distinct id is parsed only once, so filtering and grouping by one
+    of its levels are integer code operations on every label.
+
+        parsed: pd.DataFrame[
+            index=[
+                "id" -> distinct ids
+            ],
+            columns=[
+                "base id"     -> id without the permutation,\n
+                "tournament"  -> current_name,\n
+                "sport"       -> sport,\n
+                "country"     -> country,\n
+                "season"      -> name-year,\n
+                "permutation" -> permutation_id ("" if there is none),\n
+            ]
+        ]
+            Every column is categorical. Ids that are not in the format
+            above have missing tournament, sport, country and season.
+
+        codes: np.ndarray[int] (number of labels,)
+            Row of `parsed` corresponding to each label.
+    """
+
+    parsed: pd.DataFrame
+    codes: np.ndarray
+
+    @classmethod
+    def from_index(
+        cls, id_index: IdIndex, always_permuted: bool = False
+    ) -> TournamentIdentifiers:
+        """
+        ----
+        Parameters:
+            id_index: pd.Index | pd.MultiIndex | pd.Series | pd.DataFrame
+                Ids (or an index with an "id" level).
+
+            always_permuted: bool = False
+                If False, ids only have a permutation if they have at least
+                two "@" (the first one is part of every tournament id).
+
+                If True, the permutation is whatever follows the last "@"
+                (e.g. for ids that are already known to be permuted).
+        """
+        id_values = _get_id_values(id_index)
+
+        if isinstance(id_values.dtype, pd.CategoricalDtype):
+            ids = id_values.categories
+            codes = np.asarray(id_values.codes, dtype=np.int64)
+        else:
+            codes, ids = pd.factorize(id_values)
+
+        return cls(_parse_ids(pd.Index(ids), always_permuted), codes)
+
+    def get_level(self, level: str) -> pd.Categorical:
+        """
+        `level` (one of `IDENTIFIER_LEVELS`) of each label.
+        """
+        column = self.parsed[level]
+        level_codes = column.cat.codes.to_numpy()[self.codes]
+
+        return pd.Categorical.from_codes(level_codes, dtype=column.dtype)
+
+    def isin(self, level: str, values: Iterable[str]) -> np.ndarray:
+        """
+        Boolean mask of labels whose `level` is in `values`.
+        """
+        return self.parsed[level].isin(list(values)).to_numpy()[self.codes]
+
+    def unique(self, level: str) -> list[str]:
+        """
+        Sorted distinct values of `level` (missing values are ignored).
+        """
+        return sorted(self.parsed[level].dropna().unique())
+
+    def to_frame(self, levels: Iterable[str] = IDENTIFIER_LEVELS) -> pd.DataFrame:
+        """
+        `levels` of each label (categorical columns).
+        """
+        return pd.DataFrame({level: self.get_level(level) for level in levels})
@@ -4,6 +4,8 @@ import pandas as pd
 
 from turning_point.normal_coefficient import TurningPoint
 
+from .identifiers import TournamentIdentifiers
+
 
 @dataclass
 class PermutationTurningPoint(TurningPoint):
@@ -49,10 +51,10 @@ class PermutationTurningPoint(TurningPoint):
             ]
 
         """
-        # (.+?@.+?)@(.+)
-        #   tournament id: (greedy) first group
-        #   permutation id: second group
-        new_index_df = self.df.index.str.extract("(.+)@(.+)")
+        identifiers = TournamentIdentifiers.from_index(self.df, always_permuted=True)
+
+        new_index_df = identifiers.to_frame(["base id", "permutation"])
+        new_index_df = new_index_df.astype(str)
         new_index = pd.MultiIndex.from_frame(new_index_df, names=["id", "type"])
 
         return self.df.set_index(new_index).unstack("type")  # type: ignore
@@ -86,16 +88,13 @@ class PermutationTurningPoint(TurningPoint):
                         "f{p}%" -> percentiles: p in 'percentiles'
             ]
         """
-
-        # rename mapper function
-        def _rename(id_: str) -> str:
-            *original_id, _ = id_.split("@")
-            return "@".join(original_id)
+        identifiers = TournamentIdentifiers.from_index(self.df, always_permuted=True)
+        original_ids = pd.CategoricalIndex(identifiers.get_level("base id"), name="id")
 
         desired_measures = ["mean", "std"] + [f"{p}%" for p in sorted(percentiles)]
 
         return (
-            self.df.rename(index=_rename)
+            self.df.set_index(original_ids)
             .groupby("id", observed=True)
             .describe(percentiles=[p / 100 for p in percentiles])
             .loc(axis=1)[:, desired_measures]
@@ -1,6 +1,11 @@
+from collections import defaultdict
+from typing import Iterable, Iterator, Mapping
+
 import numpy as np
 import pandas as pd
 
+from .identifiers import TournamentIdentifiers
+
 
 def add_second_level_to_column_names(df: pd.DataFrame, name: str) -> pd.DataFrame:
     """
@@ -49,13 +54,7 @@ def get_permutation_identifiers(df: pd.DataFrame) -> list[str]:
         list[str]:
             List of permutation identifiers.
     """
-
-    unique_ids: pd.Index = df.index.get_level_values("id").unique()
-
-    pattern = r".+@.+@(.+)"
-    all_permutation_numbers: pd.DataFrame = unique_ids.str.extract(pattern).fillna("")
-
-    return list(np.unique(all_permutation_numbers.to_numpy().flatten()))
+    return TournamentIdentifiers.from_index(df).unique("permutation")
 
 
 def get_data_with_identifier(
@@ -84,7 +83,138 @@ def get_data_with_identifier(
     if permutation_idenfier == "":
         return df
 
-    pattern = rf".+@.+@{permutation_idenfier}"
-    filtered_index = df.index.get_level_values("id").str.fullmatch(pattern)
+    identifiers = TournamentIdentifiers.from_index(df)
+    return df[identifiers.isin("permutation", [permutation_idenfier])]
+
 
-    return df[filtered_index]
+def partition_by_permutation(df: pd.DataFrame) -> Iterator[tuple[str, pd.DataFrame]]:
+    """
+    Split a dataframe into its permutations in a single pass.
+
+    Same as `get_data_with_identifier(df, identifier)` for each identifier in
+    `get_permutation_identifiers(df)` (same order), except that entries
+    without a permutation identifier are only yielded with "" (instead of
+    the entire dataframe).
+
+    ----
+    Parameters:
+        df: pd.DataFrame
+            DataFrame with "id" index level containing strings like:
+                "{current_name}@/{sport}/{country}/{name-year}/"
+
+                "{current_name}@/{sport}/{country}/{name-year}/@{identifier}"
+
+    -----
+    Yields:
+        tuple[str, pd.DataFrame]:
+            Permutation identifier and all entries with that identifier
+            (in the same order as in `df`).
+    """
+    identifiers = TournamentIdentifiers.from_index(df)
+    permutations = identifiers.parsed["permutation"].cat
+
+    row_codes = permutations.codes.to_numpy()[identifiers.codes]
+    row_order = np.argsort(row_codes, kind="stable")
+    bounds = np.searchsorted(
+        row_codes[row_order], np.arange(len(permutations.categories) + 1)
+    )
+
+    for code, permutation_identifier in enumerate(permutations.categories):
+        rows = row_order[bounds[code] : bounds[code + 1]]
+
+        if len(rows) > 0:
+            yield permutation_identifier, df.iloc[rows]
+
+
+def get_permutation_sizes(df: pd.DataFrame) -> dict[str, int]:
+    """
+    Number of entries of each permutation identifier (same order as
+    `get_permutation_identifiers`).
+    """
+    identifiers = TournamentIdentifiers.from_index(df)
+    permutations = identifiers.parsed["permutation"].cat
+
+    row_codes = permutations.codes.to_numpy()[identifiers.codes]
+    sizes = np.bincount(row_codes, minlength=len(permutations.categories))
+
+    return {
+        permutation_identifier: int(size)
+        for permutation_identifier, size in zip(permutations.categories, sizes)
+        if size > 0
+    }
+
+
+def get_permutation_runs(df: pd.DataFrame) -> list[tuple[str, int]]:
+    """
+    Permutation identifier and number of entries of each run of consecutive
+    entries with the same identifier (in the same order as in `df`).
+
+    Example:
+        ids: ["a@b@0", "a@b@0", "a@b@1", "c@d@0"]
+        Returns: [("0", 2), ("1", 1), ("0", 1)]
+    """
+    identifiers = TournamentIdentifiers.from_index(df)
+    permutations = identifiers.parsed["permutation"].cat
+
+    row_codes = permutations.codes.to_numpy()[identifiers.codes]
+    if len(row_codes) == 0:
+        return []
+
+    starts = np.flatnonzero(np.diff(row_codes, prepend=-1))
+    sizes = np.diff(starts, append=len(row_codes))
+
+    return [
+        (permutations.categories[row_codes[start]], int(size))
+        for start, size in zip(starts, sizes)
+    ]
+
+
+def partition_chunks_by_permutation(
+    chunks: Iterable[pd.DataFrame], permutation_sizes: Mapping[str, int]
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """
+    Same as `partition_by_permutation`, but for a dataframe split into
+    consecutive chunks (e.g. read from disk a few rows at a time).
+
+    Each permutation is yielded as soon as all of its entries were read,
+    so only incomplete permutations are kept in memory (at most one if the
+    entries of each permutation are contiguous).
+
+    ----
+    Parameters:
+        chunks: Iterable[pd.DataFrame]
+            Same format as `partition_by_permutation`.
+
+        permutation_sizes: Mapping[str, int]
+            Number of entries of each permutation in all chunks
+            (see `get_permutation_sizes`).
+
+            Entries of other permutations are ignored (e.g. to read only
+            a few permutations of a file).
+
+    -----
+    Yields:
+        tuple[str, pd.DataFrame]:
+            Permutation identifier and all its entries (in the same order as
+            in the chunks). Permutations are in the order they are completed.
+    """
+    pending: defaultdict[str, list[pd.DataFrame]] = defaultdict(list)
+    num_pending_rows: defaultdict[str, int] = defaultdict(int)
+
+    for chunk in chunks:
+        for permutation_identifier, df in partition_by_permutation(chunk):
+            if permutation_identifier not in permutation_sizes:
+                continue
+
+            pending[permutation_identifier].append(df)
+            num_pending_rows[permutation_identifier] += len(df)
+
+            size = permutation_sizes[permutation_identifier]
+            if num_pending_rows[permutation_identifier] == size:
+                del num_pending_rows[permutation_identifier]
+                yield permutation_identifier, pd.concat(
+                    pending.pop(permutation_identifier)
+                )
+
+    if pending:
+        raise ValueError(f"Incomplete permutations: {sorted(pending)}")